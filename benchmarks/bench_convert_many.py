@@ -0,0 +1,57 @@
+"""
+Benchmark convert_many scaling from 1 to N worker processes.
+
+Usage:
+    python benchmarks/bench_convert_many.py [--points N] [--chunksize N] [--max-workers N]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from terrapyconvert import convert_many, warmup
+
+
+def _worker_counts(max_workers):
+    counts = []
+    workers = 1
+    while workers < max_workers:
+        counts.append(workers)
+        workers *= 2
+    counts.append(max_workers)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--points', type=int, default=2000000)
+    parser.add_argument('--chunksize', type=int, default=65536)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    
+    rng = np.random.default_rng(args.seed)
+    points = np.column_stack([
+        np.degrees(np.arcsin(rng.uniform(-1, 1, args.points))),
+        rng.uniform(-180, 180, args.points),
+    ])
+    warmup()
+    
+    print(f"{args.points:,} points, chunksize {args.chunksize:,}, {os.cpu_count()} CPUs")
+    print(f"{'workers':>8} {'seconds':>9} {'points/s':>12} {'speedup':>8}")
+    
+    baseline = None
+    for workers in _worker_counts(args.max_workers):
+        start = time.perf_counter()
+        convert_many(points, 'from_geo', workers=workers, chunksize=args.chunksize)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{workers:>8} {elapsed:>9.3f} {args.points / elapsed:>12,.0f} {baseline / elapsed:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
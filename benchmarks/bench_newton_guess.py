@@ -0,0 +1,75 @@
+"""
+Benchmark the conformal Newton solve with and without the inverse grid guess.
+
+Points are sampled uniformly over the whole sphere. Accuracy is measured in
+blocks against a reference solved to full convergence.
+
+Usage:
+    python benchmarks/bench_newton_guess.py [--points N] [--scalar-points N]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from terrapyconvert import NewtonStats, from_geo, from_geo_array, warmup
+from terrapyconvert import _base_projection
+
+
+def _run(projection, lats, lons, scalar_points):
+    stats = NewtonStats()
+    projection.newton_stats = stats
+    try:
+        start = time.perf_counter()
+        xs, zs = from_geo_array(lats, lons)
+        batch = time.perf_counter() - start
+    finally:
+        projection.newton_stats = None
+    
+    start = time.perf_counter()
+    for lat, lon in zip(lats[:scalar_points].tolist(), lons[:scalar_points].tolist()):
+        from_geo(lat, lon)
+    scalar = time.perf_counter() - start
+    return np.column_stack((xs, zs)), batch, scalar, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--points', type=int, default=1000000)
+    parser.add_argument('--scalar-points', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    
+    rng = np.random.default_rng(args.seed)
+    lats = np.degrees(np.arcsin(rng.uniform(-1, 1, args.points)))
+    lons = rng.uniform(-180, 180, args.points)
+    warmup()
+    projection = _base_projection()
+    
+    # Reference: naive start, no tolerance and enough iterations to converge fully
+    projection.inverse_guess = False
+    projection.conformal_tolerance = 0.0
+    projection.conformal_newton = 30
+    reference = np.column_stack(from_geo_array(lats, lons))
+    projection.conformal_tolerance = 1e-12
+    projection.conformal_newton = 5
+    
+    print(f"{args.points:,} points ({args.scalar_points:,} for the scalar path)")
+    print(f"{'start':>8} {'max err':>10} {'batch/s':>12} {'scalar/s':>10}  iterations")
+    for guess in (False, True):
+        projection.inverse_guess = guess
+        result, batch, scalar, stats = _run(projection, lats, lons, args.scalar_points)
+        error = np.nanmax(np.abs(result - reference))
+        histogram = stats.histograms['conformal']
+        total = sum(histogram.values())
+        spread = ', '.join(f"{k}: {100 * v / total:.2f}%" for k, v in sorted(histogram.items()))
+        print(f"{'grid' if guess else 'naive':>8} {error:>10.2e} {args.points / batch:>12,.0f} "
+              f"{args.scalar_points / scalar:>10,.0f}  {spread}")
+
+
+if __name__ == '__main__':
+    main()
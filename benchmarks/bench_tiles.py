@@ -0,0 +1,69 @@
+"""
+Benchmark tile reprojection against converting every block of the tile.
+
+Tiles are 512x512 regions at random places on the map. The batch path
+converts every block of a tile with to_geo_array; the scalar path calls
+to_geo per block on a sample of the blocks and is scaled up to the tile.
+
+Usage:
+    python benchmarks/bench_tiles.py [--tiles N] [--size N] [--scalar-points N]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from terrapyconvert import reproject_tile, to_geo, to_geo_array, warmup
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tiles', type=int, default=20)
+    parser.add_argument('--size', type=int, default=512)
+    parser.add_argument('--scalar-points', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    
+    rng = np.random.default_rng(args.seed)
+    corners = np.column_stack((rng.integers(-20000000, 20000000, args.tiles),
+                               rng.integers(-12000000, 10000000, args.tiles)))
+    blocks = args.size * args.size
+    warmup()
+    
+    tile_time = batch_time = 0.0
+    evaluations = 0
+    max_error = 0.0
+    for min_x, min_z in corners.tolist():
+        start = time.perf_counter()
+        tile = reproject_tile(min_x, min_z, args.size, args.size)
+        tile_time += time.perf_counter() - start
+        evaluations += tile.evaluations
+        max_error = max(max_error, tile.max_error)
+        
+        x, z = np.meshgrid(min_x + np.arange(args.size, dtype=np.float64),
+                           min_z + np.arange(args.size, dtype=np.float64))
+        start = time.perf_counter()
+        to_geo_array(x, z)
+        batch_time += time.perf_counter() - start
+    
+    x0, z0 = corners[0].tolist()
+    start = time.perf_counter()
+    for i in range(args.scalar_points):
+        to_geo(x0 + i % args.size, z0 + i // args.size)
+    scalar_time = (time.perf_counter() - start) / args.scalar_points * blocks * args.tiles
+    
+    print(f"{args.tiles} tiles of {args.size}x{args.size} blocks")
+    print(f"{'method':>14} {'s/tile':>10} {'blocks/s':>14}")
+    for name, seconds in (('reproject_tile', tile_time), ('to_geo_array', batch_time),
+                          ('to_geo (est.)', scalar_time)):
+        print(f"{name:>14} {seconds / args.tiles:>10.4f} {blocks * args.tiles / seconds:>14,.0f}")
+    print(f"exact conversions: {evaluations / (blocks * args.tiles):.2%} of the blocks, "
+          f"max measured error {max_error:.2e} blocks")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Shared point sets and projections for the pytest-benchmark suite.
+
+Every point set is drawn from a fixed seed, so runs on different commits
+measure the same work and can be compared with --benchmark-compare.
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import terrapyconvert
+from terrapyconvert.projection import Airocean, ModifiedAirocean
+
+# Points per batch call, and per round of the scalar loops
+BATCH_POINTS = 10000
+SCALAR_POINTS = 200
+
+REGIONS = {
+    # Uniform over the sphere
+    'global': None,
+    # Europe, (lat_min, lat_max, lon_min, lon_max)
+    'regional': (35.0, 60.0, -10.0, 30.0),
+}
+
+
+class PointSet:
+    """Seeded geographic points and their block coordinates."""
+    
+    def __init__(self, name: str, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        box = REGIONS[name]
+        if box is None:
+            lats = np.degrees(np.arcsin(rng.uniform(-1, 1, BATCH_POINTS)))
+            lons = rng.uniform(-180, 180, BATCH_POINTS)
+        else:
+            lats = rng.uniform(box[0], box[1], BATCH_POINTS)
+            lons = rng.uniform(box[2], box[3], BATCH_POINTS)
+        
+        xs, zs = terrapyconvert.from_geo_array(lats, lons)
+        on_map = ~np.isnan(xs)
+        self.name = name
+        self.lats, self.lons = lats[on_map], lons[on_map]
+        self.xs, self.zs = xs[on_map], zs[on_map]
+    
+    def face_points(self, projection: Airocean):
+        """Get the points rotated into their icosahedron faces, the input of _triangle_transform."""
+        lon_rad = np.radians(self.lons)
+        lat_rad = np.radians(90 - self.lats)
+        xyz = np.stack((np.cos(lon_rad) * np.sin(lat_rad), np.sin(lon_rad) * np.sin(lat_rad), np.cos(lat_rad)))
+        face = projection._find_triangle_array(*xyz)
+        rotated = np.einsum('nij,jn->in', projection._rotation_array[face], xyz)
+        return rotated[0], rotated[1], rotated[2]
+    
+    def scalar(self, *arrays):
+        """Get the first SCALAR_POINTS entries of arrays as lists, for the scalar loops."""
+        return [array[:SCALAR_POINTS].tolist() for array in arrays]
+
+
+@pytest.fixture(scope='session', params=sorted(REGIONS))
+def points(request) -> PointSet:
+    return PointSet(request.param)
+
+
+@pytest.fixture(scope='session')
+def airocean() -> Airocean:
+    return Airocean()
+
+
+@pytest.fixture(scope='session')
+def modified_airocean() -> ModifiedAirocean:
+    return terrapyconvert._base_projection()
@@ -0,0 +1,41 @@
+"""
+Benchmark the public conversion API, scalar and batch paths.
+
+Run with pytest-benchmark installed:
+    pytest benchmarks/test_bench_api.py
+"""
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+import terrapyconvert
+
+
+def _loop(function, *columns):
+    for args in zip(*columns):
+        function(*args)
+
+
+@pytest.mark.benchmark(group='api-scalar')
+def test_from_geo(benchmark, points):
+    benchmark(_loop, terrapyconvert.from_geo, *points.scalar(points.lats, points.lons))
+
+
+@pytest.mark.benchmark(group='api-scalar')
+def test_to_geo(benchmark, points):
+    benchmark(_loop, terrapyconvert.to_geo, *points.scalar(points.xs, points.zs))
+
+
+@pytest.mark.benchmark(group='api-scalar')
+def test_from_geo_object(benchmark, points):
+    benchmark(_loop, terrapyconvert.from_geo_object, *points.scalar(points.lats, points.lons))
+
+
+@pytest.mark.benchmark(group='api-batch')
+def test_from_geo_array(benchmark, points):
+    benchmark(terrapyconvert.from_geo_array, points.lats, points.lons)
+
+
+@pytest.mark.benchmark(group='api-batch')
+def test_to_geo_array(benchmark, points):
+    benchmark(terrapyconvert.to_geo_array, points.xs, points.zs)
@@ -0,0 +1,96 @@
+"""
+Benchmark each layer of the projection on its own, scalar and batch paths.
+
+Run with pytest-benchmark installed:
+    pytest benchmarks/test_bench_layers.py
+"""
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from terrapyconvert.projection import Airocean
+
+
+def _loop(function, *columns):
+    for args in zip(*columns):
+        function(*args)
+
+
+@pytest.mark.benchmark(group='airocean')
+def test_airocean_from_geo(benchmark, airocean, points):
+    benchmark(_loop, airocean.from_geo, *points.scalar(points.lons, points.lats))
+
+
+@pytest.mark.benchmark(group='airocean')
+def test_airocean_from_geo_array(benchmark, airocean, points):
+    benchmark(airocean.from_geo_array, points.lons, points.lats)
+
+
+@pytest.mark.benchmark(group='airocean')
+def test_airocean_to_geo(benchmark, airocean, points):
+    x, y = airocean.from_geo_array(points.lons, points.lats)
+    benchmark(_loop, airocean.to_geo, *points.scalar(x, y))
+
+
+@pytest.mark.benchmark(group='airocean')
+def test_airocean_to_geo_array(benchmark, airocean, points):
+    x, y = airocean.from_geo_array(points.lons, points.lats)
+    benchmark(airocean.to_geo_array, x, y)
+
+
+@pytest.mark.benchmark(group='conformal')
+def test_triangle_transform(benchmark, modified_airocean, points):
+    face_points = points.face_points(modified_airocean)
+    benchmark(_loop, modified_airocean._triangle_transform, *points.scalar(*face_points))
+
+
+@pytest.mark.benchmark(group='conformal')
+def test_triangle_transform_array(benchmark, modified_airocean, points):
+    benchmark(modified_airocean._triangle_transform_array, *points.face_points(modified_airocean))
+
+
+def _newton_inputs(projection, points):
+    """Get the targets and start points of the conformal Newton solves for a point set."""
+    f, g = Airocean._triangle_transform_array(projection, *points.face_points(projection))
+    x, y = projection.inverse.get_initial_guess_array(f, g)
+    return f, g, x, y
+
+
+@pytest.mark.benchmark(group='newton')
+def test_apply_newtons_method(benchmark, modified_airocean, points):
+    field = modified_airocean.inverse
+    f, g, x, y = points.scalar(*_newton_inputs(modified_airocean, points))
+    iterations, tolerance = modified_airocean.conformal_newton, modified_airocean.conformal_tolerance
+    
+    def solve():
+        for args in zip(f, g, x, y):
+            field.apply_newtons_method(*args, iterations, tolerance)
+    benchmark(solve)
+
+
+@pytest.mark.benchmark(group='newton')
+def test_apply_newtons_method_array(benchmark, modified_airocean, points):
+    benchmark(modified_airocean.inverse.apply_newtons_method_array, *_newton_inputs(modified_airocean, points),
+              modified_airocean.conformal_newton, modified_airocean.conformal_tolerance)
+
+
+@pytest.mark.benchmark(group='modified-airocean')
+def test_modified_airocean_from_geo(benchmark, modified_airocean, points):
+    benchmark(_loop, modified_airocean.from_geo, *points.scalar(points.lons, points.lats))
+
+
+@pytest.mark.benchmark(group='modified-airocean')
+def test_modified_airocean_from_geo_array(benchmark, modified_airocean, points):
+    benchmark(modified_airocean.from_geo_array, points.lons, points.lats)
+
+
+@pytest.mark.benchmark(group='modified-airocean')
+def test_modified_airocean_to_geo(benchmark, modified_airocean, points):
+    x, y = modified_airocean.from_geo_array(points.lons, points.lats)
+    benchmark(_loop, modified_airocean.to_geo, *points.scalar(x, y))
+
+
+@pytest.mark.benchmark(group='modified-airocean')
+def test_modified_airocean_to_geo_array(benchmark, modified_airocean, points):
+    x, y = modified_airocean.from_geo_array(points.lons, points.lats)
+    benchmark(modified_airocean.to_geo_array, x, y)
@@ -0,0 +1,50 @@
+"""
+Benchmark import time, conformal data loading and projection construction.
+
+Run with pytest-benchmark installed:
+    pytest benchmarks/test_bench_startup.py
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+import terrapyconvert
+from terrapyconvert.projection import ConformalEstimate
+from terrapyconvert.projection.data.conformal import load_conformal_grid
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+
+
+@pytest.mark.benchmark(group='startup')
+def test_import_time(benchmark):
+    """Import terrapyconvert in a fresh interpreter."""
+    command = [sys.executable, '-c', 'import terrapyconvert']
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    benchmark.pedantic(subprocess.run, args=(command,), kwargs={'check': True, 'env': env},
+                       rounds=5, iterations=1)
+
+
+@pytest.mark.benchmark(group='startup')
+def test_load_conformal_json(benchmark):
+    """Parse conformal.txt, as on a first run without the binary cache."""
+    benchmark.pedantic(load_conformal_grid, args=(ConformalEstimate.VECTOR_SCALE_FACTOR,),
+                       kwargs={'use_cache': False}, rounds=3, iterations=1)
+
+
+@pytest.mark.benchmark(group='startup')
+def test_load_conformal_cache(benchmark, tmp_path):
+    """Memory-map the binary conformal cache, as on later runs."""
+    scale = ConformalEstimate.VECTOR_SCALE_FACTOR
+    load_conformal_grid(scale, cache_dir=str(tmp_path))
+    benchmark(load_conformal_grid, scale, cache_dir=str(tmp_path))
+
+
+@pytest.mark.benchmark(group='startup')
+def test_build_projection(benchmark):
+    """Build the projection pipeline on conformal data already in memory."""
+    grid = terrapyconvert._base_projection().inverse.values
+    benchmark.pedantic(terrapyconvert._build_projection, args=(grid,), rounds=5, iterations=1)
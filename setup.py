@@ -26,5 +26,8 @@ setup(
     install_requires=[
         "numpy>=1.20.0",
     ],
+    entry_points={
+        "console_scripts": ["terrapyconvert=terrapyconvert.cli:main"],
+    },
     keywords=["buildtheearth", "bte", "convert", "coordinates", "minecraft"],
 )
@@ -4,10 +4,17 @@ TerrapyConvert: Python library for converting geographic coordinates to Minecraf
 This library provides functions to convert between real-world latitude/longitude coordinates
 and Minecraft BuildTheEarth (BTE) project coordinates.
 """
-from typing import Tuple, Dict
+import logging
+import threading
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
 
 from .projection import (
+    GeographicProjection,
     ModifiedAirocean,
+    NewtonStats,
+    ProjectionTransform,
     ScaleProjection,
     Orientation,
     UprightOrientation,
@@ -17,6 +24,8 @@ from .projection import (
 __version__ = "1.0.1"
 __author__ = "Python Port"
 
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
 
 def _validate_geographic_coordinates(lat: float, lon: float) -> None:
     """Validate geographic coordinates."""
@@ -42,6 +51,83 @@ def _validate_minecraft_coordinates(x: float, z: float) -> None:
     if not (min_z <= z <= max_z):
         raise ValueError(f'Invalid z coordinate: {z} (must be between {min_z} and {max_z})')
 
+def _validate_geographic_arrays(lats: np.ndarray, lons: np.ndarray) -> None:
+    """Validate arrays of geographic coordinates, reporting the first bad value."""
+    bad_lat = ~((lats >= -90) & (lats <= 90))
+    if bad_lat.any():
+        index = int(np.flatnonzero(bad_lat)[0])
+        _validate_geographic_coordinates(float(lats.flat[index]), 0.0)
+    bad_lon = ~((lons >= -180) & (lons <= 180))
+    if bad_lon.any():
+        index = int(np.flatnonzero(bad_lon)[0])
+        _validate_geographic_coordinates(0.0, float(lons.flat[index]))
+
+
+def _validate_minecraft_arrays(xs: np.ndarray, zs: np.ndarray) -> None:
+    """Validate arrays of Minecraft coordinates, reporting the first bad value."""
+    bad_x = ~((xs >= -25000000) & (xs <= 25000000))
+    if bad_x.any():
+        index = int(np.flatnonzero(bad_x)[0])
+        _validate_minecraft_coordinates(float(xs.flat[index]), 0.0)
+    bad_z = ~((zs >= -15000000) & (zs <= 15000000))
+    if bad_z.any():
+        index = int(np.flatnonzero(bad_z)[0])
+        _validate_minecraft_coordinates(0.0, float(zs.flat[index]))
+
+
+def _geographic_mask(lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """Get the mask of valid geographic pairs, False for NaN."""
+    return (lats >= -90) & (lats <= 90) & (lons >= -180) & (lons <= 180)
+
+
+def _minecraft_mask(xs: np.ndarray, zs: np.ndarray) -> np.ndarray:
+    """Get the mask of valid Minecraft pairs, False for NaN."""
+    return (xs >= -25000000) & (xs <= 25000000) & (zs >= -15000000) & (zs <= 15000000)
+
+
+def _invalid_message(validate: Callable[[float, float], None], a: float, b: float) -> str:
+    """Get the message the scalar validator raises for a pair."""
+    try:
+        validate(a, b)
+    except ValueError as e:
+        return str(e)
+    return ''
+
+
+_DIRECTIONS = ('from_geo', 'to_geo')
+
+# Input and output column names of each direction, for the table and stream converters
+_DEFAULT_COLUMNS = {
+    'from_geo': (('lat', 'lon'), ('x', 'z')),
+    'to_geo': (('x', 'z'), ('lat', 'lon')),
+}
+
+
+def _check_errors(errors: str, choices: Tuple[str, ...]) -> None:
+    if errors not in choices:
+        raise ValueError(f'Invalid errors: {errors!r} (must be one of {choices})')
+
+
+def _check_direction(direction: str) -> None:
+    if direction not in _DIRECTIONS:
+        raise ValueError(f'Invalid direction: {direction!r} (must be one of {_DIRECTIONS})')
+
+
+def _convert_masked(convert: Callable[[np.ndarray, np.ndarray], Tuple[np.ndarray, np.ndarray]],
+                    a: np.ndarray, b: np.ndarray, valid: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Run a batch conversion with NaN in place of the results of invalid pairs."""
+    if valid.all():
+        return convert(a, b)
+    # Invalid pairs go through the engine as (0, 0) so they cannot raise or
+    # warn, and are replaced afterwards
+    first, second = convert(np.where(valid, a, 0.0), np.where(valid, b, 0.0))
+    return np.where(valid, first, np.nan), np.where(valid, second, np.nan)
+
+
+def _as_coordinate_arrays(a, b) -> Tuple[np.ndarray, np.ndarray]:
+    """Convert a pair of array-likes into broadcast float64 arrays."""
+    return np.broadcast_arrays(np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64))
+
 # Initialize the projection chain
 def _orient_projection(base, orientation: Orientation):
     """Apply orientation transformation to projection."""
@@ -57,10 +143,107 @@ def _orient_projection(base, orientation: Orientation):
     
     return base
 
-# Create the projection pipeline
-_projection = ModifiedAirocean()
-_upright_proj = _orient_projection(_projection, Orientation.UPRIGHT)  
-_scale_proj = ScaleProjection(_upright_proj, 7318261.522857145, 7318261.522857145)
+# The projection pipeline is built on first use, loading the conformal data is expensive
+_scale_proj: Optional[GeographicProjection] = None
+_projection_lock = threading.Lock()
+
+
+def _build_projection(grid: Optional[np.ndarray] = None) -> GeographicProjection:
+    """
+    Create the projection pipeline, optionally on an existing conformal grid.
+    
+    The orientation and scale transforms are compiled into a single affine map
+    around the ModifiedAirocean.
+    """
+    projection = ModifiedAirocean(grid)
+    upright_proj = _orient_projection(projection, Orientation.UPRIGHT)
+    return ScaleProjection(upright_proj, 7318261.522857145, 7318261.522857145).compile()
+
+
+def _get_projection() -> GeographicProjection:
+    """Get the shared projection pipeline, building it on first use."""
+    global _scale_proj
+    projection = _scale_proj
+    if projection is None:
+        with _projection_lock:
+            if _scale_proj is None:
+                _scale_proj = _build_projection()
+            projection = _scale_proj
+    return projection
+
+
+def _base_projection() -> ModifiedAirocean:
+    """Get the ModifiedAirocean at the bottom of the shared projection pipeline."""
+    projection = _get_projection()
+    while isinstance(projection, ProjectionTransform):
+        projection = projection.input
+    return projection
+
+
+def _install_projection(projection: GeographicProjection) -> None:
+    """Replace the shared projection pipeline, used by worker processes."""
+    global _scale_proj
+    with _projection_lock:
+        _scale_proj = projection
+
+
+def warmup() -> None:
+    """
+    Build the projection pipeline now instead of on the first conversion.
+    
+    Importing terrapyconvert is cheap; the conformal correction data is loaded
+    lazily by the first conversion. Long-running services can call this at
+    startup to move that cost out of the first request.
+    """
+    _get_projection()
+
+
+def configure_newton(tolerance: Optional[float] = None, max_iterations: Optional[int] = None,
+                     stats: Optional[NewtonStats] = None) -> None:
+    """
+    Configure the Newton solvers of the shared projection.
+    
+    Both the conformal correction inverse (used by from_geo) and the inverse
+    triangle transform (used by to_geo) stop as soon as a step is no larger
+    than the tolerance, or after max_iterations steps.
+    
+    Args:
+        tolerance: Step size at which a solve counts as converged, unchanged if None;
+            0.0 always runs max_iterations steps
+        max_iterations: Iteration cap, unchanged if None
+        stats: NewtonStats to record iteration counts and residuals into;
+            None stops recording
+    """
+    projection = _base_projection()
+    if tolerance is not None:
+        if tolerance < 0:
+            raise ValueError(f'Invalid tolerance: {tolerance} (must not be negative)')
+        projection.newton_tolerance = tolerance
+        projection.conformal_tolerance = tolerance
+    if max_iterations is not None:
+        if max_iterations < 1:
+            raise ValueError(f'Invalid max_iterations: {max_iterations} (must be at least 1)')
+        projection.newton = max_iterations
+        projection.conformal_newton = max_iterations
+    projection.newton_stats = stats
+
+
+def configure_batch(partition_by_face: Optional[bool] = None) -> None:
+    """
+    Configure how the batch functions of the shared projection run.
+    
+    With partition_by_face, from_geo_array and to_geo_array sort each batch by
+    face and apply every face's rotation, flip and offset as constants to a
+    contiguous run, instead of gathering the face tables per point. Results
+    are identical either way; partitioning skips points off the map early and
+    suits inputs already grouped by area, while scattered inputs pay for the
+    sort and the scatter back into input order.
+    
+    Args:
+        partition_by_face: Whether to partition batches by face, unchanged if None
+    """
+    if partition_by_face is not None:
+        _base_projection().partition_by_face = bool(partition_by_face)
 
 
 def from_geo(lat: float, lon: float) -> Tuple[float, float]:
@@ -70,15 +253,15 @@ def from_geo(lat: float, lon: float) -> Tuple[float, float]:
     Args:
         lat: Latitude in degrees (must be between -90 and 90)
         lon: Longitude in degrees (must be between -180 and 180)
-        
+    
     Returns:
         Tuple of (x, z) Minecraft coordinates
-        
+    
     Raises:
         ValueError: If latitude or longitude are outside valid ranges
     """
     _validate_geographic_coordinates(lat, lon)
-    x, z = _scale_proj.from_geo(lon, lat)
+    x, z = _get_projection().from_geo(lon, lat)
     return x, z
 
 
@@ -89,15 +272,15 @@ def from_geo_object(lat: float, lon: float) -> Dict[str, float]:
     Args:
         lat: Latitude in degrees (must be between -90 and 90)
         lon: Longitude in degrees (must be between -180 and 180)
-        
+    
     Returns:
         Dictionary with 'x' and 'z' Minecraft coordinates
-        
+    
     Raises:
         ValueError: If latitude or longitude are outside valid ranges
     """
     _validate_geographic_coordinates(lat, lon)
-    x, z = _scale_proj.from_geo(lon, lat)
+    x, z = _get_projection().from_geo(lon, lat)
     return {"x": x, "z": z}
 
 
@@ -108,15 +291,15 @@ def to_geo(x: float, z: float) -> Tuple[float, float]:
     Args:
         x: Minecraft x coordinate
         z: Minecraft z coordinate
-        
+    
     Returns:
         Tuple of (latitude, longitude) in degrees
-        
+    
     Raises:
         ValueError: If coordinates are outside reasonable bounds
     """
     _validate_minecraft_coordinates(x, z)
-    lat, lon = _scale_proj.to_geo(x, z)
+    lat, lon = _get_projection().to_geo(x, z)
     return lat, lon
 
 
@@ -127,21 +310,208 @@ def to_geo_object(x: float, z: float) -> Dict[str, float]:
     Args:
         x: Minecraft x coordinate
         z: Minecraft z coordinate
-        
+    
     Returns:
         Dictionary with 'lat' and 'lon' coordinates in degrees
-        
+    
     Raises:
         ValueError: If coordinates are outside reasonable bounds
     """
     _validate_minecraft_coordinates(x, z)
-    lat, lon = _scale_proj.to_geo(x, z)
+    lat, lon = _get_projection().to_geo(x, z)
     return {"lat": lat, "lon": lon}
 
 
+class ValidationReport(NamedTuple):
+    """
+    Result of validating a batch of coordinate pairs.
+    
+    valid is a boolean mask in the broadcast shape of the input, invalid holds
+    the flat indices of the failing pairs in order, and messages the ValueError
+    message the scalar API raises for each of them.
+    """
+    valid: np.ndarray
+    invalid: np.ndarray
+    messages: List[str]
+
+
+def validate_array(a, b, direction: str = 'from_geo',
+                   errors: str = 'mask') -> Union[np.ndarray, ValidationReport]:
+    """
+    Check arrays of coordinate pairs in one vectorized pass.
+    
+    Uses the same ranges as from_geo and to_geo; NaN is never valid.
+    
+    Args:
+        a: Array-like of latitudes for 'from_geo' or Minecraft x coordinates for 'to_geo'
+        b: Array-like of longitudes for 'from_geo' or Minecraft z coordinates for 'to_geo'
+        direction: The conversion the pairs are meant for, 'from_geo' or 'to_geo'
+        errors: 'mask' to return the validity mask, 'report' to return a
+            ValidationReport, or 'raise' to raise ValueError for the first
+            invalid pair and return the mask otherwise
+    
+    Returns:
+        Boolean mask, True for valid pairs, or a ValidationReport
+    
+    Raises:
+        ValueError: If direction or errors is invalid, or with errors='raise'
+            for the first invalid pair
+    """
+    _check_direction(direction)
+    _check_errors(errors, ('mask', 'report', 'raise'))
+    a, b = _as_coordinate_arrays(a, b)
+    if direction == 'from_geo':
+        valid, validate = _geographic_mask(a, b), _validate_geographic_coordinates
+    else:
+        valid, validate = _minecraft_mask(a, b), _validate_minecraft_coordinates
+    if errors == 'mask' or (errors == 'raise' and valid.all()):
+        return valid
+    
+    invalid = np.flatnonzero(~valid)
+    bad_a, bad_b = a.ravel()[invalid].tolist(), b.ravel()[invalid].tolist()
+    if errors == 'raise':
+        validate(bad_a[0], bad_b[0])
+    return ValidationReport(valid, invalid, [_invalid_message(validate, *pair) for pair in zip(bad_a, bad_b)])
+
+
+def from_geo_array(lats, lons, errors: str = 'raise') -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert arrays of real life coordinates to in-game coordinates.
+    
+    Runs the whole projection chain vectorized with NumPy, which is much
+    faster than calling from_geo in a loop for large inputs.
+    
+    Args:
+        lats: Array-like of latitudes in degrees (must be between -90 and 90)
+        lons: Array-like of longitudes in degrees (must be between -180 and 180)
+        errors: 'raise' to raise on an invalid pair, or 'nan' to convert the valid
+            pairs and return NaN for the others
+    
+    Returns:
+        Tuple of (x, z) arrays of Minecraft coordinates, broadcast to a common shape
+    
+    Raises:
+        ValueError: If any latitude or longitude is outside the valid ranges and
+            errors is 'raise'
+    """
+    _check_errors(errors, ('raise', 'nan'))
+    lats, lons = _as_coordinate_arrays(lats, lons)
+    if errors == 'nan':
+        return _convert_masked(_get_projection().from_geo_array, lons, lats, _geographic_mask(lats, lons))
+    _validate_geographic_arrays(lats, lons)
+    return _get_projection().from_geo_array(lons, lats)
+
+
+def to_geo_array(xs, zs, errors: str = 'raise') -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert arrays of in-game coordinates to real life coordinates.
+    
+    Points that fall outside the projected map come back as NaN, like the
+    (nan, nan) pair returned by to_geo.
+    
+    Args:
+        xs: Array-like of Minecraft x coordinates
+        zs: Array-like of Minecraft z coordinates
+        errors: 'raise' to raise on an invalid pair, or 'nan' to convert the valid
+            pairs and return NaN for the others, as for points off the map
+    
+    Returns:
+        Tuple of (latitude, longitude) arrays in degrees, broadcast to a common shape
+    
+    Raises:
+        ValueError: If any coordinate is outside reasonable bounds and errors is 'raise'
+    """
+    _check_errors(errors, ('raise', 'nan'))
+    xs, zs = _as_coordinate_arrays(xs, zs)
+    if errors == 'nan':
+        return _convert_masked(_get_projection().to_geo_array, xs, zs, _minecraft_mask(xs, zs))
+    _validate_minecraft_arrays(xs, zs)
+    return _get_projection().to_geo_array(xs, zs)
+
+
+def face_ids(a, b, direction: str = 'from_geo', errors: str = 'raise') -> np.ndarray:
+    """
+    Get the icosahedron face each coordinate pair falls on.
+    
+    Faces are numbered 0 to 19 and are the units the projection works in, so
+    they can be used to shard large jobs by face across processes or machines.
+    A point and its converted counterpart report the same face.
+    
+    Args:
+        a: Array-like of latitudes for 'from_geo' or Minecraft x coordinates for 'to_geo'
+        b: Array-like of longitudes for 'from_geo' or Minecraft z coordinates for 'to_geo'
+        direction: 'from_geo' or 'to_geo'
+        errors: 'raise' to raise on an invalid pair, or 'nan' to return -1 for it
+    
+    Returns:
+        Integer array of faces in the broadcast shape of the input, -1 for points
+        off the map
+    
+    Raises:
+        ValueError: If direction or errors is invalid, or any pair is invalid and
+            errors is 'raise'
+    """
+    _check_direction(direction)
+    _check_errors(errors, ('raise', 'nan'))
+    a, b = _as_coordinate_arrays(a, b)
+    base = _base_projection()
+    if direction == 'from_geo':
+        mask, validate = _geographic_mask, _validate_geographic_arrays
+        
+        def lookup(lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+            return base.from_geo_face_array(lons, lats)
+    else:
+        mask, validate = _minecraft_mask, _validate_minecraft_arrays
+        projection = _get_projection()
+        _, inverse = projection.affine()
+        
+        def lookup(xs: np.ndarray, zs: np.ndarray) -> np.ndarray:
+            return base.to_geo_face_array(*projection._apply_array(inverse, xs, zs))
+    if errors == 'raise':
+        validate(a, b)
+        return lookup(a, b)
+    valid = mask(a, b)
+    if valid.all():
+        return lookup(a, b)
+    return np.where(valid, lookup(np.where(valid, a, 0.0), np.where(valid, b, 0.0)), -1)
+
+
+from .parallel import ConversionPool, convert_many
+from .geometry import convert_geometry
+from .cache import CachedConverter, CacheInfo
+from .tiles import TileGrid, reproject_tile
+from .raster import resample_raster
+from .distortion import Distortion, distortion_array
+from .measure import line_lengths, polygon_areas
+from .instrumentation import Instrumentation, instrument
+
+
 __all__ = [
     'from_geo',
     'from_geo_object', 
     'to_geo',
     'to_geo_object',
+    'from_geo_array',
+    'to_geo_array',
+    'validate_array',
+    'ValidationReport',
+    'warmup',
+    'configure_newton',
+    'configure_batch',
+    'face_ids',
+    'NewtonStats',
+    'convert_many',
+    'ConversionPool',
+    'convert_geometry',
+    'CachedConverter',
+    'CacheInfo',
+    'reproject_tile',
+    'TileGrid',
+    'resample_raster',
+    'distortion_array',
+    'Distortion',
+    'line_lengths',
+    'polygon_areas',
+    'instrument',
+    'Instrumentation',
 ]
@@ -0,0 +1,8 @@
+"""
+Entry point for python -m terrapyconvert.
+"""
+import sys
+
+from .cli import main
+
+sys.exit(main())
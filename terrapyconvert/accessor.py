@@ -0,0 +1,161 @@
+"""
+pandas and GeoPandas accessors for converting whole columns.
+
+Importing this module registers a ``bte`` accessor on DataFrames and on
+GeoSeries (requires pandas, pip install terrapyconvert[pandas]):
+    
+    import terrapyconvert.accessor
+    
+    df = df.bte.to_minecraft(lat='lat', lon='lon')
+    blocks = gdf.geometry.bte.to_minecraft(tolerance=0.5)
+
+Columns go through the vectorized batch path in one call, instead of one
+from_geo call per row through DataFrame.apply.
+"""
+from typing import Optional
+
+import numpy as np
+
+try:
+    import pandas as pd
+except ImportError as e:
+    raise ImportError('terrapyconvert.accessor requires pandas, install it with '
+                      'pip install terrapyconvert[pandas]') from e
+
+from . import from_geo_array, to_geo_array
+from .geometry import _convert_geometries
+
+
+def _column(frame: 'pd.DataFrame', name: str) -> np.ndarray:
+    """Get a column as float64, without copying float64 columns; missing values become NaN."""
+    if name not in frame.columns:
+        raise ValueError(f'DataFrame has no column {name!r}')
+    return frame[name].to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+@pd.api.extensions.register_dataframe_accessor('bte')
+class BteFrameAccessor:
+    """
+    Converts coordinate columns of a DataFrame, available as ``df.bte``.
+    
+    Results are float64 columns on the same index, NaN for points off the
+    map. By default a new DataFrame is returned; with inplace=True the columns
+    are written into the frame itself.
+    """
+    
+    def __init__(self, frame: 'pd.DataFrame'):
+        self._frame = frame
+    
+    def _assign(self, names, values, inplace: bool) -> Optional['pd.DataFrame']:
+        frame = self._frame if inplace else self._frame.copy(deep=False)
+        for name, value in zip(names, values):
+            frame[name] = value
+        return None if inplace else frame
+    
+    def to_minecraft(self, lat: str = 'lat', lon: str = 'lon', x: str = 'x', z: str = 'z',
+                     errors: str = 'raise', inplace: bool = False) -> Optional['pd.DataFrame']:
+        """
+        Convert latitude and longitude columns to Minecraft coordinate columns.
+        
+        Args:
+            lat: Name of the latitude column
+            lon: Name of the longitude column
+            x: Name of the x column to write, replaced if it exists
+            z: Name of the z column to write, replaced if it exists
+            errors: 'raise' or 'nan', as for from_geo_array; missing values are invalid
+            inplace: Write the columns into this DataFrame and return None
+        
+        Returns:
+            DataFrame with the x and z columns, or None if inplace
+        
+        Raises:
+            ValueError: If a column is missing, or any pair is invalid and errors is 'raise'
+        """
+        xs, zs = from_geo_array(_column(self._frame, lat), _column(self._frame, lon), errors)
+        return self._assign((x, z), (xs, zs), inplace)
+    
+    def to_geo(self, x: str = 'x', z: str = 'z', lat: str = 'lat', lon: str = 'lon',
+               errors: str = 'raise', inplace: bool = False) -> Optional['pd.DataFrame']:
+        """
+        Convert Minecraft coordinate columns to latitude and longitude columns.
+        
+        Args:
+            x: Name of the x column
+            z: Name of the z column
+            lat: Name of the latitude column to write, replaced if it exists
+            lon: Name of the longitude column to write, replaced if it exists
+            errors: 'raise' or 'nan', as for to_geo_array; missing values are invalid
+            inplace: Write the columns into this DataFrame and return None
+        
+        Returns:
+            DataFrame with the lat and lon columns, or None if inplace
+        
+        Raises:
+            ValueError: If a column is missing, or any pair is invalid and errors is 'raise'
+        """
+        lats, lons = to_geo_array(_column(self._frame, x), _column(self._frame, z), errors)
+        return self._assign((lat, lon), (lats, lons), inplace)
+
+
+@pd.api.extensions.register_series_accessor('bte')
+class BteGeoSeriesAccessor:
+    """
+    Converts the geometries of a GeoSeries, available as ``gdf.geometry.bte``.
+    
+    Every geometry goes through convert_geometry, all of them in one batch, so
+    edges are densified and cut at the seams of the map. Missing and empty
+    geometries are kept as they are, and Points off the map become missing.
+    Only GeoSeries have this accessor.
+    """
+    
+    def __init__(self, series: 'pd.Series'):
+        if getattr(series.dtype, 'name', None) != 'geometry':
+            raise AttributeError('The bte accessor is only available on GeoSeries')
+        self._series = series
+    
+    def _convert(self, direction: str, tolerance: float, crs):
+        from geopandas import GeoSeries
+        from shapely.geometry import mapping, shape
+        
+        series = self._series
+        present = [i for i, geometry in enumerate(series.array) if geometry is not None and not geometry.is_empty]
+        converted = _convert_geometries([mapping(series.array[i]) for i in present], direction, tolerance)
+        
+        geometries = list(series.array)
+        for i, geometry in zip(present, converted):
+            geometries[i] = None if geometry is None else shape(geometry)
+        return GeoSeries(geometries, index=series.index, name=series.name, crs=crs)
+    
+    def to_minecraft(self, tolerance: float = 0.5):
+        """
+        Convert geometries in longitude/latitude to block space.
+        
+        Args:
+            tolerance: Largest allowed deviation of converted edges, in blocks
+        
+        Returns:
+            GeoSeries of [x, z] geometries without a CRS
+        
+        Raises:
+            ValueError: If the series has a projected CRS, or any geometry or
+                coordinate is invalid
+        """
+        crs = self._series.crs
+        if crs is not None and not crs.is_geographic:
+            raise ValueError(f'Expected geographic coordinates, got CRS {crs.name!r}; use to_crs(4326) first')
+        return self._convert('from_geo', tolerance, None)
+    
+    def to_geo(self, tolerance: float = 0.5):
+        """
+        Convert geometries in block space to longitude/latitude.
+        
+        Args:
+            tolerance: Largest allowed deviation of converted edges, in blocks
+        
+        Returns:
+            GeoSeries of [lon, lat] geometries in EPSG:4326
+        
+        Raises:
+            ValueError: If any geometry is invalid
+        """
+        return self._convert('to_geo', tolerance, 'EPSG:4326')
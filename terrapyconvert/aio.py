@@ -0,0 +1,169 @@
+"""
+asyncio counterparts of the bulk conversion functions.
+
+Work is split into chunks that run on an executor, a thread pool by default
+or any concurrent.futures executor such as a ProcessPoolExecutor, so the event
+loop keeps running between and during chunks:
+    
+    from terrapyconvert.aio import afrom_geo_many
+    
+    xz = await afrom_geo_many(lat_lon_pairs)
+
+Cancelling the awaiting task cancels the chunks that have not started yet.
+Process pool workers receive the settings made with configure_newton and
+configure_batch along with each chunk.
+"""
+import asyncio
+import collections
+import functools
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, AsyncIterable, AsyncIterator, Deque, Dict, Iterable, Optional, Union
+
+import numpy as np
+
+from . import _check_direction, _check_errors
+from .parallel import _apply_projection_settings, _as_points, _convert_chunk, _projection_settings
+
+Pairs = Union[AsyncIterable, Iterable]
+
+
+async def _array_chunks(points: np.ndarray, chunksize: int) -> AsyncIterator[np.ndarray]:
+    for start in range(0, len(points), chunksize):
+        yield points[start:start + chunksize]
+
+
+async def _pair_chunks(pairs: Pairs, chunksize: int) -> AsyncIterator[np.ndarray]:
+    """Group a sync or async iterable of pairs into (n, 2) arrays."""
+    batch = []
+    if hasattr(pairs, '__aiter__'):
+        async for pair in pairs:
+            batch.append(pair)
+            if len(batch) == chunksize:
+                yield _as_points(batch)
+                batch = []
+    else:
+        for pair in pairs:
+            batch.append(pair)
+            if len(batch) == chunksize:
+                yield _as_points(batch)
+                batch = []
+    if batch:
+        yield _as_points(batch)
+
+
+def _convert_chunk_with_settings(settings: Dict[str, Any], direction: str, errors: str,
+                                 chunk: np.ndarray) -> np.ndarray:
+    """Convert a chunk in a process of an executor this package does not manage, first applying settings."""
+    _apply_projection_settings(settings)
+    return _convert_chunk(direction, errors, chunk)
+
+
+async def _pipeline(chunks: AsyncIterator[np.ndarray], direction: str, errors: str,
+                    executor: Optional[Executor], max_pending: int) -> AsyncIterator[np.ndarray]:
+    """Convert chunks on the executor, at most max_pending at a time, yielding results in order."""
+    loop = asyncio.get_running_loop()
+    # Threads share this process's projection, worker processes have their own
+    if isinstance(executor, ProcessPoolExecutor):
+        convert = functools.partial(_convert_chunk_with_settings, _projection_settings())
+    else:
+        convert = _convert_chunk
+    pending: Deque[asyncio.Future] = collections.deque()
+    try:
+        async for chunk in chunks:
+            pending.append(loop.run_in_executor(executor, convert, direction, errors, chunk))
+            if len(pending) >= max_pending:
+                yield await pending.popleft()
+        while pending:
+            yield await pending.popleft()
+    finally:
+        # Reached on cancellation, errors and early close; chunks not yet
+        # running are dropped
+        for future in pending:
+            future.cancel()
+
+
+def _check_options(direction: str, chunksize: int, max_pending: int, errors: str) -> None:
+    _check_direction(direction)
+    _check_errors(errors, ('raise', 'nan'))
+    if chunksize < 1:
+        raise ValueError(f'Invalid chunksize: {chunksize} (must be at least 1)')
+    if max_pending < 1:
+        raise ValueError(f'Invalid max_pending: {max_pending} (must be at least 1)')
+
+
+async def aconvert_many(points, direction: str = 'from_geo', chunksize: int = 65536,
+                        executor: Optional[Executor] = None, max_pending: int = 2,
+                        errors: str = 'raise') -> np.ndarray:
+    """
+    Convert an (N, 2) array of pairs without blocking the event loop.
+    
+    Args:
+        points: Array-like of shape (N, 2), holding (lat, lon) pairs for
+            'from_geo' or (x, z) pairs for 'to_geo'
+        direction: 'from_geo' or 'to_geo'
+        chunksize: Points converted per executor call
+        executor: Executor running the chunks, the loop's default thread pool
+            if None; process workers load the projection on their first chunk
+        max_pending: Chunks submitted to the executor at a time
+        errors: 'raise' or 'nan', as for from_geo_array
+    
+    Returns:
+        Array of shape (N, 2) with (x, z) or (lat, lon) pairs
+    
+    Raises:
+        ValueError: If an option or the shape is invalid, or any coordinate is
+            invalid and errors is 'raise'
+    """
+    _check_options(direction, chunksize, max_pending, errors)
+    points = _as_points(points)
+    results = [result async for result in _pipeline(_array_chunks(points, chunksize), direction, errors,
+                                                    executor, max_pending)]
+    return np.concatenate(results) if results else np.empty((0, 2))
+
+
+async def afrom_geo_many(points, chunksize: int = 65536, executor: Optional[Executor] = None,
+                         max_pending: int = 2, errors: str = 'raise') -> np.ndarray:
+    """Convert (lat, lon) pairs to (x, z) pairs, see aconvert_many."""
+    return await aconvert_many(points, 'from_geo', chunksize, executor, max_pending, errors)
+
+
+async def ato_geo_many(points, chunksize: int = 65536, executor: Optional[Executor] = None,
+                       max_pending: int = 2, errors: str = 'raise') -> np.ndarray:
+    """Convert (x, z) pairs to (lat, lon) pairs, see aconvert_many."""
+    return await aconvert_many(points, 'to_geo', chunksize, executor, max_pending, errors)
+
+
+async def aconvert_iter(pairs: Pairs, direction: str = 'from_geo', chunksize: int = 4096,
+                        executor: Optional[Executor] = None, max_pending: int = 2,
+                        errors: str = 'raise') -> AsyncIterator[np.ndarray]:
+    """
+    Convert a stream of pairs, yielding one (n, 2) result array per chunk.
+    
+    The source is read only while fewer than max_pending chunks are being
+    converted and the consumer has taken the earlier results, so a slow
+    consumer slows the reading down instead of letting results pile up.
+    Closing the iterator or cancelling the consuming task cancels the chunks
+    that have not started.
+    
+    Example:
+        async for xz in aconvert_iter(read_nodes(), 'from_geo'):
+            await store(xz)
+    
+    Args:
+        pairs: Sync or async iterable of (a, b) pairs
+        direction: 'from_geo' or 'to_geo'
+        chunksize: Pairs per chunk
+        executor: Executor running the chunks, the loop's default thread pool if None
+        max_pending: Chunks in flight at a time
+        errors: 'raise' or 'nan', as for from_geo_array
+    
+    Yields:
+        Arrays of shape (n, 2) with the results of each chunk, in input order
+    
+    Raises:
+        ValueError: If an option is invalid, or any coordinate is invalid and
+            errors is 'raise'
+    """
+    _check_options(direction, chunksize, max_pending, errors)
+    async for result in _pipeline(_pair_chunks(pairs, chunksize), direction, errors, executor, max_pending):
+        yield result
@@ -0,0 +1,164 @@
+"""
+Columnar conversion of Apache Arrow tables and Parquet files.
+
+Requires pyarrow (pip install terrapyconvert[arrow]). Float64 columns without
+nulls are handed to the batch engine as zero-copy NumPy views, and results are
+appended as new columns, so no per-row Python objects are created. Parquet
+files are converted one row group at a time, bounding memory by the largest
+row group rather than the file.
+"""
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError as e:
+    raise ImportError('terrapyconvert.arrow requires pyarrow, install it with '
+                      'pip install terrapyconvert[arrow]') from e
+
+from . import _DEFAULT_COLUMNS, _check_direction, from_geo_array, to_geo_array
+
+ArrowArray = Union['pa.Array', 'pa.ChunkedArray']
+
+
+def _to_numpy(array: 'pa.Array', name: str) -> np.ndarray:
+    """View a numeric Arrow array as float64, copying only when it has to."""
+    if pa.types.is_float64(array.type) and array.null_count == 0:
+        return array.to_numpy(zero_copy_only=True)
+    if not (pa.types.is_floating(array.type) or pa.types.is_integer(array.type)
+            or pa.types.is_decimal(array.type)):
+        raise ValueError(f'Column {name!r} is not numeric: {array.type}')
+    # Other types are cast, and nulls become NaN so they count as invalid
+    return pc.cast(array, pa.float64()).to_numpy(zero_copy_only=False)
+
+
+def _column_names(direction: str, columns: Optional[Sequence[str]],
+                  out_columns: Optional[Sequence[str]]) -> Tuple[Tuple[str, str], Tuple[str, str]]:
+    _check_direction(direction)
+    default_in, default_out = _DEFAULT_COLUMNS[direction]
+    columns = tuple(columns or default_in)
+    out_columns = tuple(out_columns or default_out)
+    if len(columns) != 2 or len(out_columns) != 2:
+        raise ValueError(f'Expected two column names, got {columns} and {out_columns}')
+    return columns, out_columns
+
+
+def _convert_columns(table: 'pa.Table', columns: Tuple[str, str], direction: str,
+                     errors: str) -> Tuple['pa.ChunkedArray', 'pa.ChunkedArray']:
+    """Convert two columns of a table batch by batch, keeping its chunking."""
+    convert = from_geo_array if direction == 'from_geo' else to_geo_array
+    first, second = [], []
+    # to_batches slices both columns at the same boundaries, without copying
+    for batch in table.select(list(columns)).to_batches():
+        a, b = convert(_to_numpy(batch.column(0), columns[0]), _to_numpy(batch.column(1), columns[1]), errors)
+        # NaN results, off the map or invalid, are stored as nulls
+        first.append(pa.array(a, from_pandas=True))
+        second.append(pa.array(b, from_pandas=True))
+    return pa.chunked_array(first, pa.float64()), pa.chunked_array(second, pa.float64())
+
+
+def convert_arrays(a: ArrowArray, b: ArrowArray, direction: str = 'from_geo',
+                   errors: str = 'raise') -> Tuple['pa.ChunkedArray', 'pa.ChunkedArray']:
+    """
+    Convert a pair of Arrow arrays through the batch engine.
+    
+    Args:
+        a: Latitudes for 'from_geo' or Minecraft x coordinates for 'to_geo'
+        b: Longitudes for 'from_geo' or Minecraft z coordinates for 'to_geo'
+        direction: 'from_geo' or 'to_geo'
+        errors: 'raise' to raise on an invalid pair, or 'nan' to convert the
+            valid pairs and return null for the others; null inputs are invalid
+    
+    Returns:
+        Tuple of float64 chunked arrays, (x, z) or (lat, lon), with null for
+        points off the map
+    
+    Raises:
+        ValueError: If the direction, lengths or types are invalid, or any pair
+            is invalid and errors is 'raise'
+    """
+    _check_direction(direction)
+    if len(a) != len(b):
+        raise ValueError(f'Arrays have different lengths: {len(a)} and {len(b)}')
+    return _convert_columns(pa.table({'a': a, 'b': b}), ('a', 'b'), direction, errors)
+
+
+def convert_table(table: Union['pa.Table', 'pa.RecordBatch'], direction: str = 'from_geo',
+                  columns: Optional[Sequence[str]] = None, out_columns: Optional[Sequence[str]] = None,
+                  errors: str = 'raise') -> 'pa.Table':
+    """
+    Convert two columns of an Arrow table and append the results.
+    
+    Args:
+        table: pyarrow Table or RecordBatch
+        direction: 'from_geo' or 'to_geo'
+        columns: Input column names, default ('lat', 'lon') for 'from_geo' and
+            ('x', 'z') for 'to_geo'
+        out_columns: Result column names, default ('x', 'z') for 'from_geo' and
+            ('lat', 'lon') for 'to_geo'; existing columns are replaced in place
+        errors: 'raise' or 'nan', as for convert_arrays
+    
+    Returns:
+        Table with the float64 result columns, null for points off the map
+    
+    Raises:
+        ValueError: If the direction or columns are invalid, or any pair is
+            invalid and errors is 'raise'
+    """
+    columns, out_columns = _column_names(direction, columns, out_columns)
+    if isinstance(table, pa.RecordBatch):
+        table = pa.Table.from_batches([table])
+    missing = [name for name in columns if name not in table.column_names]
+    if missing:
+        raise ValueError(f'Table is missing the columns {missing}')
+    
+    results = _convert_columns(table, columns, direction, errors)
+    for name, result in zip(out_columns, results):
+        index = table.schema.get_field_index(name)
+        if index >= 0:
+            table = table.set_column(index, name, result)
+        else:
+            table = table.append_column(name, result)
+    return table
+
+
+def convert_parquet(source, target, direction: str = 'from_geo', columns: Optional[Sequence[str]] = None,
+                    out_columns: Optional[Sequence[str]] = None, errors: str = 'raise',
+                    **writer_options) -> int:
+    """
+    Convert a Parquet file into another, one row group at a time.
+    
+    Each row group of the source is read, converted with convert_table and
+    written as a row group of the target before the next one is read, so
+    files larger than memory can be converted.
+    
+    Args:
+        source: Path or file object of the Parquet file to read
+        target: Path or file object to write, must differ from source
+        direction: 'from_geo' or 'to_geo'
+        columns: Input column names, as for convert_table
+        out_columns: Result column names, as for convert_table
+        errors: 'raise' or 'nan', as for convert_arrays
+        **writer_options: Passed to pyarrow.parquet.ParquetWriter, such as compression
+    
+    Returns:
+        Number of rows written
+    
+    Raises:
+        ValueError: If the direction or columns are invalid, or any pair is
+            invalid and errors is 'raise'
+    """
+    parquet = pq.ParquetFile(source)
+    # Converting an empty table checks the columns and gives the output schema
+    schema = convert_table(parquet.schema_arrow.empty_table(), direction, columns, out_columns, errors).schema
+    
+    rows = 0
+    with pq.ParquetWriter(target, schema, **writer_options) as writer:
+        for index in range(parquet.num_row_groups):
+            table = convert_table(parquet.read_row_group(index), direction, columns, out_columns, errors)
+            writer.write_table(table.cast(schema))
+            rows += table.num_rows
+    return rows
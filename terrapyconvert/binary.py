@@ -0,0 +1,112 @@
+"""
+Conversion of flat binary files of coordinate pairs through memory maps.
+
+Files hold raw float64 or float32 values without a header, either as
+interleaved pairs (a0 b0 a1 b1 ...) or as two planes (a0 a1 ... b0 b1 ...).
+Only one chunk of the input and output is mapped at a time, so memory use
+does not grow with the file size.
+"""
+import mmap
+import os
+from typing import Callable, Optional
+
+import numpy as np
+
+from . import _check_direction
+from .parallel import ConversionPool
+
+LAYOUTS = ('interleaved', 'planar')
+
+
+def _chunk_points(chunk_points: int, itemsize: int) -> int:
+    """Round a chunk up to whole pages per plane, so every chunk starts on a page boundary."""
+    per_page = mmap.ALLOCATIONGRANULARITY // itemsize
+    return -(-chunk_points // per_page) * per_page
+
+
+def _map_chunk(path, mode: str, dtype: np.dtype, layout: str, total: int, start: int, count: int):
+    """Map the a and b values of points [start, start + count) of a file."""
+    if layout == 'interleaved':
+        pairs = np.memmap(path, dtype, mode, offset=start * 2 * dtype.itemsize, shape=(count, 2))
+        return pairs[:, 0], pairs[:, 1], (pairs,)
+    a = np.memmap(path, dtype, mode, offset=start * dtype.itemsize, shape=(count,))
+    b = np.memmap(path, dtype, mode, offset=(total + start) * dtype.itemsize, shape=(count,))
+    return a, b, (a, b)
+
+
+def convert_file(source, target, direction: str = 'from_geo', dtype='<f8', layout: str = 'interleaved',
+                 chunk_points: int = 1 << 20, start_chunk: int = 0, errors: str = 'raise', workers: int = 1,
+                 progress: Optional[Callable[[int, int], None]] = None) -> int:
+    """
+    Convert a binary file of coordinate pairs into another of the same layout.
+    
+    The input is converted chunk by chunk through the batch path, each chunk
+    mapped, converted and flushed to the output before the next one is
+    mapped. After an interruption, call again with the same arguments and
+    start_chunk set to the first chunk not reported to progress; the output
+    file is then updated in place instead of recreated.
+    
+    Args:
+        source: Path of the input file of (lat, lon) pairs for 'from_geo' or
+            (x, z) pairs for 'to_geo'
+        target: Path of the output file of (x, z) or (lat, lon) pairs, created or
+            overwritten unless resuming
+        direction: 'from_geo' or 'to_geo'
+        dtype: Value type of both files, float64 or float32 in any byte order;
+            float32 keeps only about a block of precision in block coordinates
+        layout: 'interleaved' or 'planar'
+        chunk_points: Points per chunk, rounded up to whole memory pages
+        start_chunk: Index of the first chunk to convert, to resume
+        errors: 'raise' or 'nan', as for from_geo_array
+        workers: Worker processes converting each chunk, as for ConversionPool
+        progress: Called as progress(chunk, points_done) after each chunk is flushed
+    
+    Returns:
+        Number of points converted by this call
+    
+    Raises:
+        ValueError: If an argument or the file size is invalid, or any pair is
+            invalid and errors is 'raise'
+    """
+    _check_direction(direction)
+    dtype = np.dtype(dtype)
+    if dtype.kind != 'f' or dtype.itemsize not in (4, 8):
+        raise ValueError(f'Invalid dtype: {dtype} (must be float32 or float64)')
+    if layout not in LAYOUTS:
+        raise ValueError(f'Invalid layout: {layout!r} (must be one of {LAYOUTS})')
+    if chunk_points < 1:
+        raise ValueError(f'Invalid chunk_points: {chunk_points} (must be at least 1)')
+    if start_chunk < 0:
+        raise ValueError(f'Invalid start_chunk: {start_chunk} (must not be negative)')
+    
+    size = os.path.getsize(source)
+    if size % (2 * dtype.itemsize):
+        raise ValueError(f'Invalid file size: {size} bytes is not a whole number of {dtype} pairs')
+    total = size // (2 * dtype.itemsize)
+    chunk_points = _chunk_points(chunk_points, dtype.itemsize)
+    
+    if start_chunk == 0:
+        with open(target, 'wb') as f:
+            f.truncate(size)
+    elif os.path.getsize(target) != size:
+        raise ValueError(f'Cannot resume: {target} is not the size of {source}')
+    
+    converted = 0
+    with ConversionPool(workers) as pool:
+        for chunk in range(start_chunk, -(-total // chunk_points)):
+            start = chunk * chunk_points
+            count = min(chunk_points, total - start)
+            a, b, _ = _map_chunk(source, 'r', dtype, layout, total, start, count)
+            result = pool.convert(np.column_stack((a, b)), direction, errors=errors)
+            
+            out_a, out_b, maps = _map_chunk(target, 'r+', dtype, layout, total, start, count)
+            out_a[:] = result[:, 0]
+            out_b[:] = result[:, 1]
+            for out in maps:
+                out.flush()
+            # Unmap the chunk before mapping the next one
+            del a, b, out_a, out_b, maps
+            converted += count
+            if progress is not None:
+                progress(chunk, start + count)
+    return converted
@@ -0,0 +1,270 @@
+"""
+Command-line tool for streaming CSV, TSV and NDJSON conversion.
+
+Input is read and converted in bounded chunks through the batch path, and each
+chunk is written out before the next one is read, so inputs of any size can be
+piped through in constant memory:
+    
+    terrapyconvert from-geo nodes.csv -o nodes_mc.csv
+    cat blocks.ndjson | terrapyconvert to-geo --format ndjson --workers 8
+"""
+import argparse
+import csv
+import itertools
+import json
+import math
+import sys
+from typing import Callable, Iterable, Iterator, Optional, Sequence, TextIO, Tuple
+
+import numpy as np
+
+from . import _DEFAULT_COLUMNS, __version__, validate_array
+from .parallel import ConversionPool
+
+FORMATS = ('csv', 'tsv', 'ndjson')
+
+
+class CliError(Exception):
+    """An error reported to the user without a traceback."""
+
+
+def _format_from_path(path: str) -> str:
+    lower = path.lower()
+    if lower.endswith('.tsv') or lower.endswith('.tab'):
+        return 'tsv'
+    if lower.endswith('.ndjson') or lower.endswith('.jsonl'):
+        return 'ndjson'
+    return 'csv'
+
+
+def _number_formatter(precision: Optional[int]) -> Callable[[float], str]:
+    if precision is None:
+        return repr
+    return lambda value: f'{value:.{precision}f}'
+
+
+def _chunked(rows: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(rows)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _parse_float(value, column: str, line: int, strict: bool = True) -> float:
+    """Parse a number, or NaN when not strict so the row is reported as invalid."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        if not strict:
+            return math.nan
+        raise CliError(f'line {line}: column {column!r} is not a number: {value!r}')
+
+
+def _convert_rows(args: argparse.Namespace, pool: ConversionPool, points: np.ndarray,
+                  line_of: Callable[[int], int]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert a chunk of points, applying the invalid and out-of-bounds policies.
+    
+    The points are validated once, and only the valid ones are sent to the
+    pool. Returns the results, NaN for invalid rows, and the mask of rows to
+    write.
+    """
+    valid = validate_array(points[:, 0], points[:, 1], args.direction)
+    if args.on_invalid == 'error' and not valid.all():
+        index = int(np.flatnonzero(~valid)[0])
+        report = validate_array(points[index:index + 1, 0], points[index:index + 1, 1], args.direction,
+                                errors='report')
+        raise CliError(f'line {line_of(index)}: {report.messages[0]}')
+    
+    if valid.all():
+        result = pool.convert(points, args.direction)
+    else:
+        result = np.full(points.shape, np.nan)
+        if valid.any():
+            result[valid] = pool.convert(points[valid], args.direction)
+    
+    out_of_bounds = np.isnan(result).any(axis=1) & valid
+    if args.on_out_of_bounds == 'error' and out_of_bounds.any():
+        line = line_of(int(np.flatnonzero(out_of_bounds)[0]))
+        raise CliError(f'line {line}: coordinates are outside the projected map')
+    keep = np.ones(len(result), dtype=bool)
+    if args.on_out_of_bounds == 'drop':
+        keep &= ~out_of_bounds
+    if args.on_invalid == 'drop':
+        keep &= valid
+    return result, keep
+
+
+def _convert_delimited(args: argparse.Namespace, pool: ConversionPool,
+                       source: TextIO, sink: TextIO, delimiter: str) -> None:
+    in_columns, out_columns = args.in_columns, args.out_columns
+    reader = csv.reader(source, delimiter=delimiter)
+    writer = csv.writer(sink, delimiter=delimiter, lineterminator='\n')
+    fmt = _number_formatter(args.precision)
+    
+    header = next(reader, None)
+    if header is None:
+        return
+    try:
+        in_index = [header.index(name) for name in in_columns]
+    except ValueError:
+        raise CliError(f'input header {header} is missing one of the columns {list(in_columns)}')
+    
+    out_header = list(header)
+    out_index = []
+    for name in out_columns:
+        if name not in out_header:
+            out_header.append(name)
+        out_index.append(out_header.index(name))
+    writer.writerow(out_header)
+    
+    strict = args.on_invalid == 'error'
+    line = 2
+    for rows in _chunked(reader, args.chunk_size):
+        points = np.array([
+            [_parse_float(row[i] if i < len(row) else None, in_columns[k], line + n, strict)
+             for k, i in enumerate(in_index)]
+            for n, row in enumerate(rows)
+        ], dtype=np.float64).reshape(-1, 2)
+        result, keep = _convert_rows(args, pool, points, lambda n: line + n)
+        
+        for row, values, kept in zip(rows, result.tolist(), keep.tolist()):
+            if not kept:
+                continue
+            row = row + [''] * (len(out_header) - len(row))
+            for i, value in zip(out_index, values):
+                row[i] = '' if math.isnan(value) else fmt(value)
+            writer.writerow(row)
+        sink.flush()
+        line += len(rows)
+
+
+def _convert_ndjson(args: argparse.Namespace, pool: ConversionPool,
+                    source: TextIO, sink: TextIO) -> None:
+    in_columns, out_columns = args.in_columns, args.out_columns
+    precision = args.precision
+    strict = args.on_invalid == 'error'
+    
+    def records() -> Iterator[tuple]:
+        for line, text in enumerate(source, 1):
+            if text.strip():
+                try:
+                    record = json.loads(text)
+                except json.JSONDecodeError as e:
+                    raise CliError(f'line {line}: invalid JSON: {e}')
+                # Other JSON values have no columns; they count as invalid rows
+                if strict and not isinstance(record, dict):
+                    raise CliError(f'line {line}: expected a JSON object, got {type(record).__name__}')
+                yield line, record
+    
+    for chunk in _chunked(records(), args.chunk_size):
+        points = np.array([
+            [_parse_float(record.get(name) if isinstance(record, dict) else None, name, line, strict)
+             for name in in_columns]
+            for line, record in chunk
+        ], dtype=np.float64).reshape(-1, 2)
+        result, keep = _convert_rows(args, pool, points, lambda n: chunk[n][0])
+        
+        for (_, record), values, kept in zip(chunk, result.tolist(), keep.tolist()):
+            if not kept:
+                continue
+            if not isinstance(record, dict):
+                sink.write(json.dumps(record))
+                sink.write('\n')
+                continue
+            for name, value in zip(out_columns, values):
+                if math.isnan(value):
+                    record[name] = None
+                else:
+                    record[name] = value if precision is None else round(value, precision)
+            sink.write(json.dumps(record))
+            sink.write('\n')
+        sink.flush()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for the terrapyconvert command."""
+    parser = argparse.ArgumentParser(
+        prog='terrapyconvert',
+        description='Convert coordinates between latitude/longitude and BTE Minecraft '
+                    'coordinates in CSV, TSV or NDJSON streams.',
+    )
+    parser.add_argument('direction', choices=('from-geo', 'to-geo'),
+                        help='from-geo converts lat/lon to x/z, to-geo converts x/z to lat/lon')
+    parser.add_argument('input', nargs='?', default='-',
+                        help='input file, or - for stdin (default)')
+    parser.add_argument('-o', '--output', default='-',
+                        help='output file, or - for stdout (default)')
+    parser.add_argument('-f', '--format', choices=FORMATS,
+                        help='input and output format, guessed from the input file name '
+                             'and csv for stdin')
+    parser.add_argument('--in-columns', nargs=2, metavar=('A', 'B'),
+                        help='input columns, default lat lon for from-geo and x z for to-geo')
+    parser.add_argument('--out-columns', nargs=2, metavar=('A', 'B'),
+                        help='output columns, default x z for from-geo and lat lon for to-geo; '
+                             'existing columns are overwritten')
+    parser.add_argument('-j', '--workers', type=int, default=1,
+                        help='number of worker processes (default 1)')
+    parser.add_argument('-c', '--chunk-size', type=int, default=65536,
+                        help='rows read and converted at a time (default 65536)')
+    parser.add_argument('-p', '--precision', type=int,
+                        help='decimal places in the output, default full precision')
+    parser.add_argument('--on-out-of-bounds', choices=('keep', 'drop', 'error'), default='keep',
+                        help='rows whose coordinates fall off the projected map: keep them '
+                             'with empty (CSV) or null (NDJSON) results, drop them, or stop '
+                             'with an error (default keep)')
+    parser.add_argument('--on-invalid', choices=('keep', 'drop', 'error'), default='error',
+                        help='rows with missing, non-numeric or out-of-range coordinates: keep '
+                             'them with empty (CSV) or null (NDJSON) results, drop them, or stop '
+                             'with an error (default error)')
+    parser.add_argument('--version', action='version', version=f'%(prog)s {__version__}')
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the terrapyconvert command, returning the exit status."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    
+    args.direction = args.direction.replace('-', '_')
+    default_in, default_out = _DEFAULT_COLUMNS[args.direction]
+    args.in_columns = tuple(args.in_columns or default_in)
+    args.out_columns = tuple(args.out_columns or default_out)
+    args.format = args.format or ('csv' if args.input == '-' else _format_from_path(args.input))
+    if args.chunk_size < 1:
+        parser.error('--chunk-size must be at least 1')
+    if args.workers < 1:
+        parser.error('--workers must be at least 1')
+    if args.precision is not None and args.precision < 0:
+        parser.error('--precision must not be negative')
+    
+    source: TextIO = sys.stdin
+    sink: TextIO = sys.stdout
+    try:
+        if args.input != '-':
+            source = open(args.input, 'r', newline='', encoding='utf-8')
+        if args.output != '-':
+            sink = open(args.output, 'w', newline='', encoding='utf-8')
+        
+        with ConversionPool(args.workers) as pool:
+            if args.format == 'ndjson':
+                _convert_ndjson(args, pool, source, sink)
+            else:
+                _convert_delimited(args, pool, source, sink, '\t' if args.format == 'tsv' else ',')
+    except BrokenPipeError:
+        return 0
+    except (CliError, ValueError, OSError) as e:
+        print(f'terrapyconvert: error: {e}', file=sys.stderr)
+        return 1
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
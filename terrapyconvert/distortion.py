@@ -0,0 +1,90 @@
+"""
+Local scale and distortion of the projection at many points.
+
+The Jacobian of the whole from_geo chain is computed analytically, including
+the conformal correction, whose derivative is the inverse of the correction
+field's own derivative. Scale factors follow from its singular values, the
+axes of Tissot's indicatrix at each point.
+"""
+import math
+from typing import NamedTuple
+
+import numpy as np
+
+from . import (
+    _as_coordinate_arrays,
+    _check_errors,
+    _geographic_mask,
+    _get_projection,
+    _validate_geographic_arrays,
+)
+from .projection import GeographicProjection
+
+# Radius of the sphere the projection is defined on, in meters
+EARTH_RADIUS = GeographicProjection.EARTH_CIRCUMFERENCE / (2 * math.pi)
+
+
+class Distortion(NamedTuple):
+    """
+    Local scale and distortion of the map at each point.
+    
+    jacobian has shape (..., 2, 2): rows are the Minecraft x and z coordinates,
+    columns the derivatives in blocks per meter toward east and north.
+    max_scale and min_scale are the longest and shortest axes of the Tissot
+    indicatrix in blocks per meter, meters_per_block the inverse of their
+    geometric mean, angular_distortion the largest change of an angle in
+    degrees, and convergence the angle in degrees from map north (-z) to true
+    north, positive toward +x.
+    """
+    jacobian: np.ndarray
+    max_scale: np.ndarray
+    min_scale: np.ndarray
+    meters_per_block: np.ndarray
+    angular_distortion: np.ndarray
+    convergence: np.ndarray
+
+
+def distortion_array(lats, lons, errors: str = 'raise') -> Distortion:
+    """
+    Get the local scale and distortion of the map at arrays of coordinates.
+    
+    Args:
+        lats: Array-like of latitudes in degrees (must be between -90 and 90)
+        lons: Array-like of longitudes in degrees (must be between -180 and 180)
+        errors: 'raise' to raise on an invalid pair, or 'nan' to return NaN for it
+    
+    Returns:
+        Distortion with arrays in the broadcast shape of the input
+    
+    Raises:
+        ValueError: If any latitude or longitude is outside the valid ranges and
+            errors is 'raise'
+    """
+    _check_errors(errors, ('raise', 'nan'))
+    lats, lons = _as_coordinate_arrays(lats, lons)
+    if errors == 'nan':
+        valid = _geographic_mask(lats, lons)
+        lats, lons = np.where(valid, lats, 0.0), np.where(valid, lons, 0.0)
+    else:
+        _validate_geographic_arrays(lats, lons)
+    
+    _, _, jacobian = _get_projection().from_geo_jacobian_array(lons, lats)
+    jacobian = jacobian / EARTH_RADIUS
+    if errors == 'nan':
+        jacobian = np.where(valid[..., np.newaxis, np.newaxis], jacobian, np.nan)
+    
+    # Closed-form singular values of a 2x2 matrix
+    (a, b), (c, d) = np.moveaxis(jacobian, (-2, -1), (0, 1))
+    q = np.hypot(a + d, c - b) / 2
+    r = np.hypot(a - d, c + b) / 2
+    max_scale = q + r
+    min_scale = np.abs(q - r)
+    
+    return Distortion(
+        jacobian=jacobian,
+        max_scale=max_scale,
+        min_scale=min_scale,
+        meters_per_block=1 / np.sqrt(max_scale * min_scale),
+        angular_distortion=np.degrees(2 * np.arcsin((max_scale - min_scale) / (max_scale + min_scale))),
+        convergence=np.degrees(np.arctan2(b, -d)),
+    )
@@ -0,0 +1,408 @@
+"""
+Geometry-aware conversion of GeoJSON-like LineStrings, Polygons and Multi* geometries.
+
+Straight edges in one coordinate space are curves in the other, and edges that
+cross a seam of the unfolded icosahedron (or the Bering/Aleutian cut, or the
+antimeridian going back to geographic coordinates) jump between distant parts
+of the map. convert_geometry converts every vertex in one batch, then refines
+only the edges whose converted form strays more than a tolerance (in blocks)
+from the true curve, and splits lines where the conversion is discontinuous.
+"""
+from collections.abc import Mapping
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from . import _check_direction, _get_projection, from_geo_array, to_geo_array
+
+GEOMETRY_TYPES = ('Point', 'MultiPoint', 'LineString', 'MultiLineString',
+                  'Polygon', 'MultiPolygon', 'GeometryCollection')
+
+# Edges shorter than this in input units (degrees, blocks) that still do not
+# meet the tolerance are taken to cross a discontinuity
+_MIN_STEP = {'from_geo': 1e-9, 'to_geo': 1e-6}
+
+# Edges with both ends off the map are probed down to this length in case
+# they pass over it
+_OFF_MAP_STEP = {'from_geo': 1.0, 'to_geo': 10000.0}
+
+# Midpoint fractions stay exact in float64 up to this many halvings
+_MAX_DEPTH = 50
+
+# Neighbouring faces of the conformal correction meet with gaps of a few
+# blocks. Once an edge is refined to within the tolerance on the input side,
+# a converted edge up to this long, deviating by up to this much, is taken to
+# cross such a seam and is bridged instead of refined further or split. Real
+# cuts in the map are tens of thousands of blocks wide.
+_SEAM_BLOCKS = 64.0
+
+# Upper bound on the size of an input unit in blocks; a degree is at most
+# about 220000 blocks anywhere on the map
+_BLOCKS_PER_UNIT = {'from_geo': 250000.0, 'to_geo': 1.0}
+
+# The conformal correction is piecewise linear over cells about 30000 blocks
+# wide, so a long converted edge can bend at several kinks whose deviations
+# hide each other at the probed points. Edges are split below this length at
+# the default tolerance of half a block before the probes are trusted. Like
+# the sagitta of an arc, the deviation that can hide grows with the square of
+# the length, so the limit scales with the square root of the tolerance.
+_MAX_EDGE_BLOCKS = 4096.0
+
+
+def _geo_to_blocks(points: np.ndarray) -> np.ndarray:
+    """Convert (n, 2) [lon, lat] positions to [x, z], without validation."""
+    x, z = _get_projection().from_geo_array(points[:, 0], points[:, 1])
+    return np.column_stack((x, z))
+
+
+def _blocks_to_geo(points: np.ndarray) -> np.ndarray:
+    """Convert (n, 2) [x, z] positions to [lon, lat], without validation."""
+    lat, lon = _get_projection().to_geo_array(points[:, 0], points[:, 1])
+    return np.column_stack((lon, lat))
+
+
+def _segment_distance(p: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Get the distance from each point p to the segment from a to b."""
+    ab = b - a
+    ap = p - a
+    length_sq = np.einsum('ij,ij->i', ab, ab)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        t = np.where(length_sq > 0, np.einsum('ij,ij->i', ap, ab) / length_sq, 0.0)
+    t = np.clip(t, 0.0, 1.0)[:, np.newaxis]
+    return np.hypot(*(ap - t * ab).T)
+
+
+def _deviation(direction: str, a: np.ndarray, b: np.ndarray, out_a: np.ndarray, out_b: np.ndarray,
+               out_mid: np.ndarray) -> np.ndarray:
+    """
+    Get how far each converted edge strays from the true curve, in blocks.
+    
+    For from_geo the converted edge is the straight segment between the
+    converted endpoints, compared against the converted input midpoint and
+    quarter points. For to_geo it is the straight [lon, lat] segment, whose
+    midpoint and quarter points are converted back and compared against the
+    converted-back endpoints; to_geo and from_geo disagree by up to a block
+    or so, but smoothly, so measuring both ends of the comparison through
+    from_geo cancels it out. The quarter points catch S-shaped edges and kinks
+    of the conformal correction that leave the midpoint on the segment.
+    
+    A midpoint that lands close to one end of a long segment is on the segment
+    but still wrong, it means the edge jumps across a discontinuity. On a
+    continuous edge the midpoint stays near the middle, so distances from
+    either end beyond three quarters of the segment count as deviation too.
+    """
+    if direction == 'from_geo':
+        start, end, p = out_a, out_b, out_mid
+        quarters = _geo_to_blocks(np.concatenate((0.75 * a + 0.25 * b, 0.25 * a + 0.75 * b)))
+    else:
+        start, end, p, quarters = np.split(_geo_to_blocks(np.concatenate((
+            out_a, out_b, 0.5 * (out_a + out_b),
+            0.75 * out_a + 0.25 * out_b, 0.25 * out_a + 0.75 * out_b))), [len(a), 2 * len(a), 3 * len(a)])
+    
+    lopsided = (np.maximum(np.hypot(*(p - start).T), np.hypot(*(p - end).T)) -
+                0.75 * np.hypot(*(end - start).T))
+    quarter = _segment_distance(quarters, np.concatenate((start, start)),
+                                np.concatenate((end, end))).reshape(2, -1).max(axis=0)
+    return np.maximum(np.maximum(_segment_distance(p, start, end), lopsided), quarter)
+
+
+def _worth_refining(direction: str, a: np.ndarray, b: np.ndarray, out_a: np.ndarray,
+                    out_b: np.ndarray) -> np.ndarray:
+    """Check which edges touch the map or are long enough to pass over it."""
+    return (~np.isnan(out_a).any(axis=1) | ~np.isnan(out_b).any(axis=1) |
+            (np.max(np.abs(b - a), axis=1) > _OFF_MAP_STEP[direction]))
+
+
+def _refine(direction: str, points: np.ndarray, line_ids: np.ndarray,
+            tolerance: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert the vertices of all lines in one batch and insert midpoints where needed.
+    
+    Returns the line id and converted position of every sample, in order along
+    each line. Discontinuities are marked by a NaN sample, as are vertices and
+    midpoints that fall off the map.
+    """
+    convert = _geo_to_blocks if direction == 'from_geo' else _blocks_to_geo
+    max_edge_blocks = _MAX_EDGE_BLOCKS * np.sqrt(2 * tolerance)
+    
+    # Vertices go through the public API so they are validated
+    if direction == 'from_geo':
+        converted = np.column_stack(from_geo_array(points[:, 1], points[:, 0]))
+    else:
+        converted = np.column_stack(to_geo_array(points[:, 0], points[:, 1])[::-1])
+    
+    # A sample is ordered by its line, the edge it lies on and its fraction along that edge
+    vertex_edges = np.arange(len(points)) - np.searchsorted(line_ids, line_ids)
+    samples_line = [line_ids]
+    samples_edge = [vertex_edges]
+    samples_fraction = [np.zeros(len(points))]
+    samples_position = [converted]
+    
+    # Edges join consecutive vertices of a line
+    start = np.flatnonzero(line_ids[:-1] == line_ids[1:])
+    start = start[_worth_refining(direction, points[start], points[start + 1],
+                                  converted[start], converted[start + 1])]
+    
+    line = line_ids[start]
+    edge = vertex_edges[start]
+    f_a = np.zeros(len(start))
+    f_b = np.ones(len(start))
+    a, b = points[start], points[start + 1]
+    out_a, out_b = converted[start], converted[start + 1]
+    
+    for depth in range(_MAX_DEPTH + 1):
+        if len(line) == 0:
+            break
+        mid = 0.5 * (a + b)
+        f_mid = 0.5 * (f_a + f_b)
+        out_mid = convert(mid)
+        
+        # The probes only sample the edge, so they are held to half the
+        # tolerance. NaN deviations come from edges running off the map, which
+        # are refined until the edge of the map is found to within the tolerance.
+        deviation = _deviation(direction, a, b, out_a, out_b, out_mid)
+        block_length = np.hypot(*(b - a if direction == 'to_geo' else out_b - out_a).T)
+        refine = ~(deviation <= 0.5 * tolerance) & ~(np.isnan(deviation) & (block_length <= tolerance))
+        refine |= block_length > max_edge_blocks
+        step = np.max(np.abs(b - a), axis=1)
+        refine &= ~((step * _BLOCKS_PER_UNIT[direction] <= tolerance) &
+                    (block_length <= _SEAM_BLOCKS) & (deviation <= _SEAM_BLOCKS))
+        
+        final = (step <= _MIN_STEP[direction]) | (depth == _MAX_DEPTH)
+        broken = refine & final
+        split = refine & ~final
+        out_mid[broken] = np.nan
+        
+        keep = split | broken
+        samples_line.append(line[keep])
+        samples_edge.append(edge[keep])
+        samples_fraction.append(f_mid[keep])
+        samples_position.append(out_mid[keep])
+        
+        # Continue with both halves of each split edge
+        first = split & _worth_refining(direction, a, mid, out_a, out_mid)
+        second = split & _worth_refining(direction, mid, b, out_mid, out_b)
+        line = np.concatenate((line[first], line[second]))
+        edge = np.concatenate((edge[first], edge[second]))
+        f_a, f_b = np.concatenate((f_a[first], f_mid[second])), np.concatenate((f_mid[first], f_b[second]))
+        a, b = np.concatenate((a[first], mid[second])), np.concatenate((mid[first], b[second]))
+        out_a, out_b = (np.concatenate((out_a[first], out_mid[second])),
+                        np.concatenate((out_mid[first], out_b[second])))
+    
+    line = np.concatenate(samples_line)
+    order = np.lexsort((np.concatenate(samples_fraction), np.concatenate(samples_edge), line))
+    return line[order], np.concatenate(samples_position)[order]
+
+
+def _pieces(line_count: int, line: np.ndarray, position: np.ndarray) -> List[List[np.ndarray]]:
+    """Split the samples of each line into runs of points on the map."""
+    on_map = ~np.isnan(position).any(axis=1)
+    new_line = np.concatenate(([True], line[1:] != line[:-1]))
+    starts = on_map & (new_line | ~np.concatenate(([False], on_map[:-1])))
+    
+    pieces: List[List[np.ndarray]] = [[] for _ in range(line_count)]
+    runs = np.split(position[on_map], np.flatnonzero(starts[on_map])[1:])
+    for line_id, run in zip(line[starts].tolist(), runs):
+        pieces[line_id].append(run)
+    return pieces
+
+
+def _drop_slivers(pieces: List[np.ndarray], tolerance: float) -> List[np.ndarray]:
+    """Drop pieces smaller than the tolerance left over where a line grazes a corner of the map."""
+    if len(pieces) < 2:
+        return pieces
+    return [piece for piece in pieces if np.hypot(*np.ptp(piece, axis=0)) >= tolerance]
+
+
+def _close_ring(pieces: List[np.ndarray], first_on_map: bool, tolerance: float) -> List[np.ndarray]:
+    """Turn the pieces of a split ring back into closed rings."""
+    if len(pieces) > 1 and first_on_map:
+        # The ring starts and ends at the same vertex, so its first and last pieces are one
+        pieces = [np.concatenate((pieces[-1], pieces[0][1:]))] + pieces[1:-1]
+    
+    rings = []
+    pieces = _drop_slivers(pieces, tolerance)
+    for piece in pieces:
+        if not np.array_equal(piece[0], piece[-1]):
+            piece = np.concatenate((piece, piece[:1]))
+        if len(piece) >= 4:
+            rings.append(piece)
+    return rings
+
+
+def _contains(ring: np.ndarray, point: np.ndarray) -> bool:
+    """Check if a point lies inside a closed ring, by ray casting."""
+    x, y = point
+    x_i, y_i = ring[:-1].T
+    x_j, y_j = ring[1:].T
+    crosses = (y_i > y) != (y_j > y)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        x_cross = x_i + (y - y_i) * (x_j - x_i) / (y_j - y_i)
+    return bool(np.count_nonzero(crosses & (x < x_cross)) % 2)
+
+
+def _ring_distance(ring: np.ndarray, point: np.ndarray) -> float:
+    """Get the distance from a point to the nearest edge of a closed ring."""
+    return float(_segment_distance(np.broadcast_to(point, ring[:-1].shape), ring[:-1], ring[1:]).min())
+
+
+def _polygons(ring_pieces: List[List[np.ndarray]]) -> List[List[np.ndarray]]:
+    """
+    Group split exterior and interior rings back into polygons.
+    
+    A hole goes to the exterior that contains it. One that ends up inside no
+    exterior, where a cut or the tolerance moved the rings against each other,
+    goes to the nearest exterior rather than being lost.
+    """
+    polygons = [[exterior] for exterior in ring_pieces[0]] if ring_pieces else []
+    for holes in ring_pieces[1:]:
+        for hole in holes:
+            if not polygons:
+                break
+            owner = next((polygon for polygon in polygons if _contains(polygon[0], hole[0])), None)
+            if owner is None:
+                owner = min(polygons, key=lambda polygon: _ring_distance(polygon[0], hole[0]))
+            owner.append(hole)
+    return polygons
+
+
+def _positions(coordinates, depth: int) -> List[np.ndarray]:
+    """Parse nested GeoJSON positions into (n, 2) arrays, dropping any third coordinate."""
+    if depth == 0:
+        coordinates = [coordinates]
+    try:
+        array = np.asarray(coordinates, dtype=np.float64)
+    except (TypeError, ValueError):
+        array = None
+    if depth <= 1:
+        if array is None or array.ndim != 2 or array.shape[1] < 2 or len(array) == 0:
+            raise ValueError(f'Invalid positions: {coordinates!r}')
+        return [array[:, :2]]
+    if not isinstance(coordinates, (list, tuple)):
+        raise ValueError(f'Invalid coordinates: {coordinates!r}')
+    return [positions for member in coordinates for positions in _positions(member, depth - 1)]
+
+
+class _Collector:
+    """Gathers the vertex sequences of a geometry so they convert in one batch."""
+    
+    def __init__(self):
+        self.lines: List[np.ndarray] = []
+        self.closed: List[bool] = []
+    
+    def add(self, positions: np.ndarray, closed: bool = False) -> int:
+        if closed and not np.array_equal(positions[0], positions[-1]):
+            positions = np.concatenate((positions, positions[:1]))
+        self.lines.append(positions)
+        self.closed.append(closed)
+        return len(self.lines) - 1
+    
+    def collect(self, geometry) -> Callable[[List[List[np.ndarray]]], Optional[Dict]]:
+        """Register a geometry's lines and return a function building its converted form."""
+        if not isinstance(geometry, Mapping) or geometry.get('type') not in GEOMETRY_TYPES:
+            raise ValueError(f'Invalid geometry: expected a mapping with a type in {GEOMETRY_TYPES}')
+        kind = geometry['type']
+        
+        if kind == 'GeometryCollection':
+            members = [self.collect(member) for member in geometry.get('geometries', [])]
+            
+            def build_collection(pieces):
+                geometries = [build(pieces) for build in members]
+                return {'type': kind, 'geometries': [member for member in geometries if member is not None]}
+            return build_collection
+        
+        coordinates = geometry.get('coordinates')
+        if kind == 'Point':
+            index = self.add(_positions(coordinates, 0)[0])
+            
+            def build_point(pieces):
+                # A Point has no empty form in GeoJSON, so one off the map becomes None
+                if not pieces[index]:
+                    return None
+                return {'type': kind, 'coordinates': pieces[index][0][0].tolist()}
+            return build_point
+        
+        if kind == 'MultiPoint':
+            indices = [self.add(point[np.newaxis]) for point in _positions(coordinates, 1)[0]]
+            return lambda pieces: {'type': kind,
+                                   'coordinates': [pieces[i][0][0].tolist() for i in indices if pieces[i]]}
+        
+        if kind in ('LineString', 'MultiLineString'):
+            indices = [self.add(line) for line in _positions(coordinates, 1 if kind == 'LineString' else 2)]
+            
+            def build_lines(pieces):
+                lines = [piece.tolist() for i in indices for piece in pieces[i] if len(piece) >= 2]
+                if kind == 'LineString' and len(lines) <= 1:
+                    return {'type': kind, 'coordinates': lines[0] if lines else []}
+                return {'type': 'MultiLineString', 'coordinates': lines}
+            return build_lines
+        
+        if not isinstance(coordinates, (list, tuple)):
+            raise ValueError(f'Invalid coordinates: {coordinates!r}')
+        polygons = [coordinates] if kind == 'Polygon' else coordinates
+        rings = [[self.add(ring, closed=True) for ring in _positions(polygon, 2)] for polygon in polygons]
+        
+        def build_polygons(pieces):
+            result = [[ring.tolist() for ring in polygon]
+                      for indices in rings for polygon in _polygons([pieces[i] for i in indices])]
+            if kind == 'Polygon' and len(result) <= 1:
+                return {'type': kind, 'coordinates': result[0] if result else []}
+            return {'type': 'MultiPolygon', 'coordinates': result}
+        return build_polygons
+
+
+def convert_geometry(geometry: Dict, direction: str = 'from_geo', tolerance: float = 0.5) -> Optional[Dict]:
+    """
+    Convert a GeoJSON-like geometry, following the curves and seams of the projection.
+    
+    All vertices are converted in one batch. An edge is then split at its
+    midpoint, repeatedly, only while the straight converted edge strays more
+    than tolerance blocks from the true image of the input edge. Where an edge
+    crosses a discontinuity the line is cut in two, so a LineString may become
+    a MultiLineString and a Polygon a MultiPolygon; the pieces of a cut ring
+    are closed along the cut. Parts that fall off the map are dropped; a
+    Point off the map gives None, and is left out of a GeometryCollection.
+    
+    Positions use GeoJSON order, [lon, lat] for geographic coordinates and
+    [x, z] for Minecraft coordinates; any third coordinate is dropped.
+    
+    Args:
+        geometry: Point, MultiPoint, LineString, MultiLineString, Polygon,
+            MultiPolygon or GeometryCollection mapping
+        direction: 'from_geo' for [lon, lat] to [x, z], 'to_geo' for [x, z] to [lon, lat]
+        tolerance: Largest allowed deviation of converted edges, in blocks
+    
+    Returns:
+        A new geometry mapping with converted coordinates, or None for a Point
+        off the map
+    
+    Raises:
+        ValueError: If the direction, tolerance, geometry or any coordinate is invalid
+    """
+    return _convert_geometries([geometry], direction, tolerance)[0]
+
+
+def _convert_geometries(geometries: List, direction: str, tolerance: float) -> List[Optional[Dict]]:
+    """Convert several geometries in one batch, keeping a None in place of each Point off the map."""
+    _check_direction(direction)
+    if not tolerance > 0:
+        raise ValueError(f'Invalid tolerance: {tolerance} (must be positive)')
+    
+    collector = _Collector()
+    builds = [collector.collect(geometry) for geometry in geometries]
+    if not collector.lines:
+        return [build([]) for build in builds]
+    
+    points = np.concatenate(collector.lines)
+    line_ids = np.repeat(np.arange(len(collector.lines)), [len(line) for line in collector.lines])
+    line, position = _refine(direction, points, line_ids, tolerance)
+    pieces = _pieces(len(collector.lines), line, position)
+    
+    # Rings are closed again, a ring's first sample is its first vertex
+    first = np.searchsorted(line, np.arange(len(collector.lines)))
+    for i, closed in enumerate(collector.closed):
+        if closed:
+            pieces[i] = _close_ring(pieces[i], not np.isnan(position[first[i]]).any(), tolerance)
+        else:
+            pieces[i] = _drop_slivers(pieces[i], tolerance)
+    return [build(pieces) for build in builds]
@@ -0,0 +1,278 @@
+"""
+Opt-in timers and counters for the conversion hot paths.
+
+Nothing here runs unless instrument() is active: entering it shadows the
+hooked methods of the shared projection with timing wrappers, and leaving it
+removes them again, so conversions made without it pay nothing.
+"""
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from . import _base_projection, _get_projection
+from .projection import Airocean, NewtonStats
+
+# (stage, method, batch) for the methods hooked on each layer; the _array
+# forms count every point of the batch. Stages are inclusive, the time of
+# 'from_geo' also contains 'face_lookup' and 'triangle_transform'. The
+# _find_triangle_scan fallbacks of the bucket index only run inside
+# _find_triangle and _find_triangle_array, whose wrappers time them and count
+# the faces they return; hooking them too would count those lookups twice.
+_CHAIN_HOOKS = (
+    ('from_geo', 'from_geo', False),
+    ('from_geo', 'from_geo_array', True),
+    ('to_geo', 'to_geo', False),
+    ('to_geo', 'to_geo_array', True),
+)
+_AIROCEAN_HOOKS = (
+    ('face_lookup', '_find_triangle', False),
+    ('face_lookup', '_find_triangle_array', True),
+    ('face_lookup', '_find_triangle_grid', False),
+    ('face_lookup', '_find_triangle_grid_array', True),
+    ('triangle_transform', '_triangle_transform', False),
+    ('triangle_transform', '_triangle_transform_array', True),
+    ('inverse_triangle_transform', '_inverse_triangle_transform', False),
+    ('inverse_triangle_transform', '_inverse_triangle_transform_array', True),
+    ('inverse_triangle_newton', '_inverse_triangle_transform_newton', False),
+    ('inverse_triangle_newton', '_inverse_triangle_transform_newton_array', True),
+)
+_FIELD_HOOKS = (
+    ('conformal_newton', 'apply_newtons_method', False),
+    ('conformal_newton', 'apply_newtons_method_array', True),
+)
+_VALIDATORS = (
+    ('_validate_geographic_coordinates', False),
+    ('_validate_minecraft_coordinates', False),
+    ('_validate_geographic_arrays', True),
+    ('_validate_minecraft_arrays', True),
+    ('_geographic_mask', True),
+    ('_minecraft_mask', True),
+)
+
+# Which direction a face lookup or chain method belongs to
+_DIRECTIONS = {
+    '_find_triangle': 'from_geo',
+    '_find_triangle_array': 'from_geo',
+    '_find_triangle_grid': 'to_geo',
+    '_find_triangle_grid_array': 'to_geo',
+    'from_geo': 'from_geo',
+    'from_geo_array': 'from_geo',
+    'to_geo': 'to_geo',
+    'to_geo_array': 'to_geo',
+}
+
+# Placeholder for methods that were not shadowed on the instance before
+_MISSING = object()
+
+_active: Optional['Instrumentation'] = None
+_active_lock = threading.Lock()
+
+
+class Instrumentation:
+    """
+    Per-stage timers and counters for the shared projection.
+    
+    Every stage counts its calls, the points those calls converted (one per
+    scalar call, the batch size for the _array forms) and the wall time spent
+    in them. The stages are:
+    
+    - validation: range checks of the public API, CachedConverter and tiles
+    - from_geo, to_geo: the whole projection chain, including the transforms
+    - face_lookup: icosahedron face search (from_geo) and grid lookup (to_geo)
+    - triangle_transform: the Airocean triangle map with conformal correction
+    - conformal_newton: the InvertableVectorField Newton solve inside it
+    - inverse_triangle_transform: the inverse triangle map with conformal field
+    - inverse_triangle_newton: the Airocean inverse Newton solve inside it
+    
+    Face lookups are also counted per face and direction, chain results off
+    the map are counted as out of bounds, and the Newton iteration counts are
+    recorded into a NewtonStats.
+    
+    Counters are updated under a lock, so snapshot() can be called from another
+    thread (for example a metrics exporter) while conversions run.
+    """
+    
+    def __init__(self):
+        self.stages: Dict[str, List[float]] = {}
+        self.faces: Dict[str, Dict[int, int]] = {'from_geo': {}, 'to_geo': {}}
+        self.out_of_bounds: Dict[str, int] = {'from_geo': 0, 'to_geo': 0}
+        self.newton: NewtonStats = NewtonStats()
+        self._lock = threading.Lock()
+    
+    def _record(self, stage: str, points: int, seconds: float) -> None:
+        with self._lock:
+            totals = self.stages.get(stage)
+            if totals is None:
+                totals = self.stages[stage] = [0, 0, 0.0]
+            totals[0] += 1
+            totals[1] += points
+            totals[2] += seconds
+    
+    def _count_faces(self, direction: str, face) -> None:
+        counts = self.faces[direction]
+        if direction == 'to_geo':
+            # Count grid lookups under the same faces face_ids reports
+            face = Airocean._icosahedron_face(face)
+        with self._lock:
+            if isinstance(face, np.ndarray):
+                face = face.ravel()
+                hits = np.bincount(face[face >= 0])
+                for index in np.flatnonzero(hits).tolist():
+                    counts[index] = counts.get(index, 0) + int(hits[index])
+            elif face >= 0:
+                counts[int(face)] = counts.get(int(face), 0) + 1
+    
+    def _count_out_of_bounds(self, direction: str, result: Tuple) -> None:
+        first = result[0]
+        if isinstance(first, np.ndarray):
+            missing = int(np.count_nonzero(np.isnan(first)))
+        else:
+            missing = int(first != first)
+        if missing:
+            with self._lock:
+                self.out_of_bounds[direction] += missing
+    
+    def _wrap(self, stage: str, function: Callable, batch: bool,
+              inspect: Optional[Callable[[Any], None]] = None) -> Callable:
+        """Wrap function to record its time under stage, and pass its result to inspect."""
+        record = self._record
+        clock = time.perf_counter
+        
+        def instrumented(*args, **kwargs):
+            start = clock()
+            try:
+                result = function(*args, **kwargs)
+            finally:
+                record(stage, int(np.size(args[0])) if batch else 1, clock() - start)
+            if inspect is not None:
+                inspect(result)
+            return result
+        return instrumented
+    
+    def reset(self) -> None:
+        """Clear all timers and counters."""
+        with self._lock:
+            self.stages.clear()
+            for counts in self.faces.values():
+                counts.clear()
+            for direction in self.out_of_bounds:
+                self.out_of_bounds[direction] = 0
+            self.newton.reset()
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get a copy of the timers and counters as plain dicts.
+        
+        Returns:
+            Dictionary with 'stages' (stage name to 'calls', 'points' and
+            'seconds'), 'faces' (direction to face index to lookups),
+            'out_of_bounds' (direction to points off the map) and 'newton'
+            (NewtonStats.as_dict)
+        """
+        with self._lock:
+            return {
+                'stages': {
+                    stage: {'calls': int(calls), 'points': int(points), 'seconds': seconds}
+                    for stage, (calls, points, seconds) in sorted(self.stages.items())
+                },
+                'faces': {direction: dict(sorted(counts.items())) for direction, counts in self.faces.items()},
+                'out_of_bounds': dict(self.out_of_bounds),
+                'newton': self.newton.as_dict(),
+            }
+
+
+def _hook_instance(instrumentation: Instrumentation, target, hooks, restore: List) -> None:
+    """Shadow methods of target with wrappers, remembering how to undo it."""
+    for stage, name, batch in hooks:
+        inspect = None
+        direction = _DIRECTIONS.get(name)
+        if stage == 'face_lookup':
+            inspect = partial(instrumentation._count_faces, direction)
+        elif direction is not None:
+            inspect = partial(instrumentation._count_out_of_bounds, direction)
+        own = target.__dict__.get(name, _MISSING)
+        restore.append((target, name, own))
+        setattr(target, name, instrumentation._wrap(stage, getattr(target, name), batch, inspect))
+
+
+def _hook_validators(instrumentation: Instrumentation, restore: List) -> None:
+    """Replace the validators in every package module that imported them."""
+    package = sys.modules[__package__]
+    for name, batch in _VALIDATORS:
+        original = getattr(package, name)
+        wrapper = instrumentation._wrap('validation', original, batch)
+        for module_name, module in list(sys.modules.items()):
+            if (module_name == __package__ or module_name.startswith(__package__ + '.')) and \
+                    getattr(module, name, None) is original:
+                restore.append((module, name, original))
+                setattr(module, name, wrapper)
+
+
+def _unhook(restore: List) -> None:
+    for target, name, previous in reversed(restore):
+        if previous is _MISSING:
+            delattr(target, name)
+        else:
+            setattr(target, name, previous)
+
+
+@contextmanager
+def instrument(instrumentation: Optional[Instrumentation] = None) -> Iterator[Instrumentation]:
+    """
+    Record timers and counters for conversions made inside the block.
+    
+    Hooks the shared projection and the validators of this process; worker
+    processes of ConversionPool are not covered. While active, Newton
+    iterations are recorded into instrumentation.newton instead of any
+    NewtonStats passed to configure_newton, which is restored on exit.
+    
+    Example:
+        with terrapyconvert.instrument() as stats:
+            terrapyconvert.from_geo(48.8584, 2.2945)
+        print(stats.snapshot()['stages']['face_lookup'])
+    
+    Args:
+        instrumentation: Instrumentation to add to, a new one if None
+    
+    Yields:
+        The Instrumentation being recorded into
+    
+    Raises:
+        ValueError: If instrumentation is already active
+    """
+    global _active
+    if instrumentation is None:
+        instrumentation = Instrumentation()
+    chain = _get_projection()
+    base = _base_projection()
+    
+    with _active_lock:
+        if _active is not None:
+            raise ValueError('Instrumentation is already active')
+        _active = instrumentation
+        restore: List = []
+        newton_stats = base.newton_stats
+        try:
+            _hook_instance(instrumentation, chain, _CHAIN_HOOKS, restore)
+            _hook_instance(instrumentation, base, _AIROCEAN_HOOKS, restore)
+            _hook_instance(instrumentation, base.inverse, _FIELD_HOOKS, restore)
+            _hook_validators(instrumentation, restore)
+            base.newton_stats = instrumentation.newton
+        except BaseException:
+            _unhook(restore)
+            _active = None
+            raise
+    
+    try:
+        yield instrumentation
+    finally:
+        with _active_lock:
+            _unhook(restore)
+            base.newton_stats = newton_stats
+            _active = None
+
@@ -0,0 +1,200 @@
+"""
+Bulk conversion across a pool of worker processes.
+
+The workers attach to one copy of the conformal grid through
+multiprocessing.shared_memory instead of each loading it again.
+"""
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+from . import (
+    _base_projection,
+    _build_projection,
+    _check_direction,
+    _check_errors,
+    _install_projection,
+    from_geo_array,
+    to_geo_array,
+)
+
+# Attributes of the shared ModifiedAirocean set by configure_newton and configure_batch
+_SETTINGS = ('newton', 'conformal_newton', 'newton_tolerance', 'conformal_tolerance', 'inverse_guess',
+             'partition_by_face')
+
+# Kept alive for the lifetime of a worker so the grid buffer stays mapped
+_worker_shared_memory: Optional[shared_memory.SharedMemory] = None
+
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing block, leaving its cleanup to the parent process."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # type: ignore[call-arg]
+    except TypeError:
+        # Python < 3.13 always tracks; workers share the parent's resource tracker,
+        # so registering the same name again is harmless
+        return shared_memory.SharedMemory(name=name)
+
+
+def _projection_settings() -> Dict[str, Any]:
+    """Get the solver and batch settings of the shared projection."""
+    projection = _base_projection()
+    return {name: getattr(projection, name) for name in _SETTINGS}
+
+
+def _apply_projection_settings(settings: Dict[str, Any]) -> None:
+    """Copy settings taken with _projection_settings onto this process's shared projection."""
+    projection = _base_projection()
+    for name, value in settings.items():
+        setattr(projection, name, value)
+
+
+def _init_worker(name: str, shape: Tuple[int, int], settings: Dict[str, Any]) -> None:
+    """Build the worker's projection on top of the shared conformal grid, with the parent's settings."""
+    global _worker_shared_memory
+    _worker_shared_memory = _attach_shared_memory(name)
+    grid = np.ndarray(shape, dtype=np.float64, buffer=_worker_shared_memory.buf)
+    grid.flags.writeable = False
+    _install_projection(_build_projection(grid))
+    _apply_projection_settings(settings)
+
+
+def _convert_chunk(direction: str, errors: str, chunk: np.ndarray) -> np.ndarray:
+    """Convert one (n, 2) chunk through the batch path."""
+    if direction == 'from_geo':
+        a, b = from_geo_array(chunk[:, 0], chunk[:, 1], errors)
+    else:
+        a, b = to_geo_array(chunk[:, 0], chunk[:, 1], errors)
+    return np.column_stack((a, b))
+
+
+def _chunks(points: np.ndarray, chunksize: int) -> Iterator[np.ndarray]:
+    for start in range(0, len(points), chunksize):
+        yield points[start:start + chunksize]
+
+
+def _as_points(points) -> np.ndarray:
+    points = np.asarray(points, dtype=np.float64)
+    if points.ndim != 2 or points.shape[1] != 2:
+        raise ValueError(f'Expected points of shape (N, 2), got {points.shape}')
+    return points
+
+
+class ConversionPool:
+    """
+    A reusable pool of worker processes sharing one copy of the conformal grid.
+    
+    Use it as a context manager when converting many batches, so the workers and
+    the shared memory block are set up once:
+        
+        with ConversionPool(workers=8) as pool:
+            for batch in batches:
+                xz = pool.convert(batch, 'from_geo')
+    
+    With workers=1 no processes are started and batches are converted in the
+    current process. The workers copy the settings made with configure_newton
+    and configure_batch when the pool starts; later changes do not reach them.
+    """
+    
+    def __init__(self, workers: Optional[int] = None):
+        self.workers: int = max(1, workers if workers is not None else (os.cpu_count() or 1))
+        self._block: Optional[shared_memory.SharedMemory] = None
+        self._executor: Optional[ProcessPoolExecutor] = None
+        
+        if self.workers > 1:
+            grid = _base_projection().inverse.values
+            self._block = shared_memory.SharedMemory(create=True, size=grid.nbytes)
+            try:
+                np.ndarray(grid.shape, dtype=np.float64, buffer=self._block.buf)[:] = grid
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                                     initargs=(self._block.name, grid.shape,
+                                                               _projection_settings()))
+            except BaseException:
+                self.close()
+                raise
+    
+    def convert(self, points, direction: str = 'from_geo', chunksize: Optional[int] = None,
+                errors: str = 'raise') -> np.ndarray:
+        """
+        Convert an (N, 2) array of pairs, returning results in input order.
+        
+        Args:
+            points: Array-like of (lat, lon) pairs for 'from_geo' or (x, z) pairs for 'to_geo'
+            direction: 'from_geo' or 'to_geo'
+            chunksize: Points per worker task, defaults to an even split across the workers
+            errors: 'raise' or 'nan', as for from_geo_array
+        """
+        _check_direction(direction)
+        _check_errors(errors, ('raise', 'nan'))
+        points = _as_points(points)
+        if chunksize is None:
+            chunksize = max(1, -(-len(points) // self.workers))
+        if chunksize < 1:
+            raise ValueError(f'Invalid chunksize: {chunksize} (must be at least 1)')
+        
+        if self._executor is None or len(points) <= chunksize:
+            return _convert_chunk(direction, errors, points)
+        
+        results = self._executor.map(_convert_chunk, itertools.repeat(direction), itertools.repeat(errors),
+                                     _chunks(points, chunksize))
+        return np.concatenate(list(results))
+    
+    def close(self) -> None:
+        """Shut down the workers and release the shared memory block."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        if self._block is not None:
+            self._block.close()
+            self._block.unlink()
+            self._block = None
+    
+    def __enter__(self) -> 'ConversionPool':
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def convert_many(points, direction: str = 'from_geo', workers: Optional[int] = None,
+                 chunksize: int = 65536, errors: str = 'raise') -> np.ndarray:
+    """
+    Convert many coordinate pairs using a pool of worker processes.
+    
+    The points are split into chunks that are converted with the vectorized
+    batch path in separate processes. The parent's conformal grid is copied once
+    into shared memory and every worker attaches to it. Results are returned
+    in input order.
+    
+    Args:
+        points: Array-like of shape (N, 2), holding (lat, lon) pairs for
+            'from_geo' or (x, z) pairs for 'to_geo'
+        direction: 'from_geo' or 'to_geo'
+        workers: Number of worker processes, defaults to os.cpu_count();
+            1 converts in the current process
+        chunksize: Number of points sent to a worker at a time
+        errors: 'raise' to raise on an invalid pair, or 'nan' to return NaN
+            for invalid pairs instead
+    
+    Returns:
+        Array of shape (N, 2) with (x, z) or (lat, lon) pairs
+    
+    Raises:
+        ValueError: If the direction or shape is invalid, or any coordinate is
+            invalid and errors is 'raise'
+    """
+    _check_direction(direction)
+    if chunksize < 1:
+        raise ValueError(f'Invalid chunksize: {chunksize} (must be at least 1)')
+    points = _as_points(points)
+    
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, -(-len(points) // chunksize)))
+    
+    with ConversionPool(workers) as pool:
+        return pool.convert(points, direction, chunksize, errors)
@@ -1,19 +1,21 @@
 """
 Projection classes for terrapyconvert.
 """
-from .base import GeographicProjection, ProjectionTransform
+from .base import CompiledProjection, GeographicProjection, ProjectionTransform
 from .transforms import Orientation, ScaleProjection, UprightOrientation, InvertedOrientation
-from .utils import InvertableVectorField
+from .utils import InvertableVectorField, NewtonStats
 from .core import Airocean, ConformalEstimate, ModifiedAirocean
 
 __all__ = [
     'GeographicProjection',
     'ProjectionTransform', 
+    'CompiledProjection',
     'Orientation',
     'ScaleProjection',
     'UprightOrientation',
     'InvertedOrientation',
     'InvertableVectorField',
+    'NewtonStats',
     'Airocean',
     'ConformalEstimate',
     'ModifiedAirocean',
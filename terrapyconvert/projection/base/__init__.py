@@ -3,8 +3,10 @@ Base classes for geographic projections.
 """
 from .geographic_projection import GeographicProjection
 from .projection_transform import ProjectionTransform
+from .compiled_projection import CompiledProjection
 
 __all__ = [
     'GeographicProjection',
     'ProjectionTransform',
+    'CompiledProjection',
 ]
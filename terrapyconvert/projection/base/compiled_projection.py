@@ -0,0 +1,121 @@
+"""
+Compiled projection chain with the transforms folded into one affine map.
+"""
+from .projection_transform import Affine, ProjectionTransform
+from .geographic_projection import GeographicProjection
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+
+class CompiledProjection(ProjectionTransform):
+    """
+    A chain of affine projection transforms folded into a single step.
+    
+    Created by ProjectionTransform.compile. from_geo calls the innermost
+    projection directly and applies the forward map to its result, and to_geo
+    applies the inverse map before calling it, instead of passing through one
+    method call per transform. The source chain answers upright, bounds and
+    meters_per_unit.
+    """
+    
+    def __init__(self, input_projection: GeographicProjection, forward: Affine, inverse: Affine,
+                 source: GeographicProjection):
+        super().__init__(input_projection)
+        self.forward: Affine = forward
+        self.inverse: Affine = inverse
+        self.source: GeographicProjection = source
+        
+        # Bind closures specialized to the shape of the maps, shadowing the
+        # generic methods below, so a conversion is one call around the input
+        self.from_geo = self._bind_from_geo(input_projection.from_geo, forward)
+        self.to_geo = self._bind_to_geo(input_projection.to_geo, inverse)
+    
+    @staticmethod
+    def _bind_from_geo(from_geo: Callable[[float, float], Tuple[float, float]],
+                       forward: Affine) -> Callable[[float, float], Tuple[float, float]]:
+        a, b, c, d, e, f = forward
+        if b == c == e == f == 0:
+            def compiled_from_geo(lon: float, lat: float) -> Tuple[float, float]:
+                x, y = from_geo(lon, lat)
+                return a * x, d * y
+        elif a == d == e == f == 0:
+            def compiled_from_geo(lon: float, lat: float) -> Tuple[float, float]:
+                x, y = from_geo(lon, lat)
+                return b * y, c * x
+        else:
+            def compiled_from_geo(lon: float, lat: float) -> Tuple[float, float]:
+                x, y = from_geo(lon, lat)
+                return a * x + b * y + e, c * x + d * y + f
+        return compiled_from_geo
+    
+    @staticmethod
+    def _bind_to_geo(to_geo: Callable[[float, float], Tuple[float, float]],
+                     inverse: Affine) -> Callable[[float, float], Tuple[float, float]]:
+        a, b, c, d, e, f = inverse
+        if b == c == e == f == 0:
+            def compiled_to_geo(x: float, y: float) -> Tuple[float, float]:
+                return to_geo(a * x, d * y)
+        elif a == d == e == f == 0:
+            def compiled_to_geo(x: float, y: float) -> Tuple[float, float]:
+                return to_geo(b * y, c * x)
+        else:
+            def compiled_to_geo(x: float, y: float) -> Tuple[float, float]:
+                return to_geo(a * x + b * y + e, c * x + d * y + f)
+        return compiled_to_geo
+    
+    @staticmethod
+    def _apply_array(affine: Affine, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        a, b, c, d, e, f = affine
+        if b == c == e == f == 0:
+            return a * x, d * y
+        if a == d == e == f == 0:
+            return b * y, c * x
+        return a * x + b * y + e, c * x + d * y + f
+    
+    def to_geo(self, x: float, y: float) -> Tuple[float, float]:
+        """Convert projected coordinates to geographic coordinates."""
+        a, b, c, d, e, f = self.inverse
+        return self.input.to_geo(a * x + b * y + e, c * x + d * y + f)
+    
+    def from_geo(self, lon: float, lat: float) -> Tuple[float, float]:
+        """Convert geographic coordinates to projected coordinates."""
+        x, y = self.input.from_geo(lon, lat)
+        a, b, c, d, e, f = self.forward
+        return a * x + b * y + e, c * x + d * y + f
+    
+    def to_geo_array(self, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized form of to_geo."""
+        return self.input.to_geo_array(*self._apply_array(self.inverse, x, y))
+    
+    def from_geo_array(self, lon: np.ndarray, lat: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized form of from_geo."""
+        x, y = self.input.from_geo_array(lon, lat)
+        return self._apply_array(self.forward, x, y)
+    
+    def from_geo_jacobian_array(self, lon: np.ndarray,
+                                lat: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Vectorized form of from_geo with derivatives."""
+        x, y, jacobian = self.input.from_geo_jacobian_array(lon, lat)
+        a, b, c, d, _, _ = self.forward
+        return (*self._apply_array(self.forward, x, y), np.array([[a, b], [c, d]]) @ jacobian)
+    
+    def affine(self) -> Tuple[Affine, Affine]:
+        """Get the folded forward and inverse maps."""
+        return self.forward, self.inverse
+    
+    def compile(self) -> 'CompiledProjection':
+        """Already compiled, returns itself."""
+        return self
+    
+    def upright(self) -> bool:
+        """Check if the source chain is upright."""
+        return self.source.upright()
+    
+    def bounds(self) -> List[float]:
+        """Get the bounds of the source chain."""
+        return self.source.bounds()
+    
+    def meters_per_unit(self) -> float:
+        """Get meters per unit of the source chain."""
+        return self.source.meters_per_unit()
@@ -4,6 +4,8 @@ Base geographic projection class for coordinate transformations.
 from abc import ABC, abstractmethod
 from typing import Tuple, List
 
+import numpy as np
+
 
 class GeographicProjection(ABC):
     """Abstract base class for geographic projections."""
@@ -19,6 +21,49 @@ class GeographicProjection(ABC):
         """Convert geographic coordinates to projected coordinates."""
         return lon, lat
     
+    def to_geo_array(self, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Convert arrays of projected coordinates to geographic coordinates.
+        
+        The default implementation calls to_geo point by point; projections
+        override it with vectorized NumPy math.
+        """
+        x, y = np.broadcast_arrays(np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64))
+        points = [self.to_geo(a, b) for a, b in zip(x.ravel().tolist(), y.ravel().tolist())]
+        out = np.array(points, dtype=np.float64).reshape(x.shape + (2,))
+        return out[..., 0], out[..., 1]
+    
+    def from_geo_array(self, lon: np.ndarray, lat: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Convert arrays of geographic coordinates to projected coordinates.
+        
+        The default implementation calls from_geo point by point; projections
+        override it with vectorized NumPy math.
+        """
+        lon, lat = np.broadcast_arrays(np.asarray(lon, dtype=np.float64), np.asarray(lat, dtype=np.float64))
+        points = [self.from_geo(a, b) for a, b in zip(lon.ravel().tolist(), lat.ravel().tolist())]
+        out = np.array(points, dtype=np.float64).reshape(lon.shape + (2,))
+        return out[..., 0], out[..., 1]
+    
+    def from_geo_jacobian_array(self, lon: np.ndarray,
+                                lat: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Convert arrays of geographic coordinates, with the derivatives of the result.
+        
+        Returns x, y and a (..., 2, 2) Jacobian with rows x and y and columns
+        the derivatives per radian of arc toward east and north. Projections
+        that can differentiate their math analytically override it.
+        """
+        raise NotImplementedError(f'{type(self).__name__} has no analytic Jacobian')
+    
+    def compile(self) -> 'GeographicProjection':
+        """
+        Get an equivalent projection that converts with fewer Python calls.
+        
+        Projections without anything to fold return themselves.
+        """
+        return self
+    
     def meters_per_unit(self) -> float:
         """Get meters per unit for this projection."""
         return 100000.0
@@ -36,10 +81,10 @@ class GeographicProjection(ABC):
         # Ensure proper ordering
         if coords[0] > coords[2]:
             coords[0], coords[2] = coords[2], coords[0]
-            
+        
         if coords[1] > coords[3]:
             coords[1], coords[3] = coords[3], coords[1]
-            
+        
         return coords
     
     def upright(self) -> bool:
@@ -2,7 +2,28 @@
 Base class for projection transforms.
 """
 from .geographic_projection import GeographicProjection
-from typing import List, Tuple
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# Affine map (a, b, c, d, e, f): x' = a * x + b * y + e, y' = c * x + d * y + f
+Affine = Tuple[float, float, float, float, float, float]
+
+IDENTITY: Affine = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+
+
+def compose_affine(outer: Affine, inner: Affine) -> Affine:
+    """Get the affine map that applies inner, then outer."""
+    a, b, c, d, e, f = outer
+    a_i, b_i, c_i, d_i, e_i, f_i = inner
+    return (
+        a * a_i + b * c_i,
+        a * b_i + b * d_i,
+        c * a_i + d * c_i,
+        c * b_i + d * d_i,
+        a * e_i + b * f_i + e,
+        c * e_i + d * f_i + f,
+    )
 
 
 class ProjectionTransform(GeographicProjection):
@@ -11,6 +32,50 @@ class ProjectionTransform(GeographicProjection):
     def __init__(self, input_projection: GeographicProjection):
         self.input = input_projection
     
+    def affine(self) -> Optional[Tuple[Affine, Affine]]:
+        """
+        Get the affine maps this transform applies, or None if it is not affine.
+        
+        The first map is applied to the input projection's from_geo result, the
+        second to the coordinates passed to to_geo before they reach the input.
+        """
+        return None
+    
+    def from_geo_jacobian_array(self, lon: np.ndarray,
+                                lat: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Apply an affine transform to the input's coordinates and Jacobian."""
+        maps = self.affine()
+        if maps is None:
+            return super().from_geo_jacobian_array(lon, lat)
+        a, b, c, d, e, f = maps[0]
+        x, y, jacobian = self.input.from_geo_jacobian_array(lon, lat)
+        return a * x + b * y + e, c * x + d * y + f, np.array([[a, b], [c, d]]) @ jacobian
+    
+    def compile(self) -> GeographicProjection:
+        """
+        Fold this transform and the affine transforms below it into one step.
+        
+        Returns a CompiledProjection that gives the same results with a single
+        affine map around the innermost projection, or this transform itself
+        if it is not affine.
+        """
+        from .compiled_projection import CompiledProjection
+        
+        forward = inverse = IDENTITY
+        projection: GeographicProjection = self
+        while isinstance(projection, ProjectionTransform):
+            maps = projection.affine()
+            if maps is None:
+                break
+            # from_geo applies the outermost map last, to_geo applies it first
+            forward = compose_affine(forward, maps[0])
+            inverse = compose_affine(maps[1], inverse)
+            projection = projection.input
+        
+        if projection is self:
+            return self
+        return CompiledProjection(projection, forward, inverse, self)
+    
     def upright(self) -> bool:
         """Check if the underlying projection is upright."""
         return self.input.upright()
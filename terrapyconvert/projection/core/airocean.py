@@ -2,9 +2,12 @@
 Airocean projection implementation.
 """
 from ..base.geographic_projection import GeographicProjection
-from typing import List, Tuple
+from ..utils.newton_stats import NewtonStats
+from typing import List, Optional, Tuple
 import math
 
+import numpy as np
+
 
 class Airocean(GeographicProjection):
     """Airocean icosahedral projection."""
@@ -106,14 +109,27 @@ class Airocean(GeographicProjection):
     
     OUT_OF_BOUNDS = (float('nan'), float('nan'))
     
+    # Cells per cube face edge in the face lookup index
+    FACE_INDEX_RESOLUTION: int = 32
+    
     def __init__(self):
         super().__init__()
+        # Cap and step-size tolerance for the inverse triangle Newton solve
         self.newton: int = 5
+        self.newton_tolerance: float = 1e-12
+        
+        # Optional counters shared by all Newton solvers of this projection
+        self.newton_stats: Optional[NewtonStats] = None
+        
+        # Run the batch path face by face instead of gathering per-point face tables
+        self.partition_by_face: bool = False
         
         # Initialize computed arrays
         self._initialize_vertices()
         self._initialize_centers()
         self._initialize_matrices()
+        self._initialize_arrays()
+        self._initialize_face_index()
     
     def _initialize_vertices(self):
         """Initialize vertex coordinates in radians."""
@@ -165,6 +181,68 @@ class Airocean(GeographicProjection):
             self._produce_zyz_rotation_matrix(self.ROTATION_MATRIX[i], -c_lon, -c_lat, (math.pi / 2) - v[0])
             self._produce_zyz_rotation_matrix(self.INVERSE_ROTATION_MATRIX[i], v[0] - (math.pi / 2), c_lat, c_lon)
     
+    def _initialize_arrays(self):
+        """Initialize NumPy copies of the face tables for the batch path."""
+        self._centroid_array = np.array(self.CENTROID[:20], dtype=np.float64)
+        self._rotation_array = np.array(self.ROTATION_MATRIX, dtype=np.float64)
+        self._inverse_rotation_array = np.array(self.INVERSE_ROTATION_MATRIX, dtype=np.float64)
+        self._center_map_array = np.array(self.CENTER_MAP, dtype=np.float64)
+        self._flip_array = np.array(self.FLIP_TRIANGLE, dtype=bool)
+        self._face_on_grid_array = np.array(self.FACE_ON_GRID, dtype=np.intp)
+    
+    def _initialize_face_index(self):
+        """
+        Build the bucket index used by _find_triangle.
+        
+        Directions are bucketed by the cell of the circumscribed cube they pass
+        through. A face is kept as a candidate for a cell if its centroid could
+        be the nearest one to some point of the cell: with p the cell's center
+        and r the chord from p to its farthest corner, a point q in the cell has
+        |q - c_f| >= |p - c_f| - r and |q - c_g| <= |p - c_g| + r, so any face
+        with |p - c_f| > min_g |p - c_g| + 2r can never win. The tolerance added
+        on top covers rounding, so the faces the linear scan could pick are
+        always among the candidates.
+        """
+        resolution = self.FACE_INDEX_RESOLUTION
+        edges = np.linspace(-1.0, 1.0, resolution + 1)
+        centers = 0.5 * (edges[:-1] + edges[1:])
+        
+        candidates = []
+        for cube_face in range(6):
+            center = self._cube_points(cube_face, *np.meshgrid(centers, centers, indexing='ij'))
+            radius = np.zeros((resolution, resolution))
+            for s_edges in (edges[:-1], edges[1:]):
+                for t_edges in (edges[:-1], edges[1:]):
+                    corner = self._cube_points(cube_face, *np.meshgrid(s_edges, t_edges, indexing='ij'))
+                    radius = np.maximum(radius, np.linalg.norm(center - corner, axis=-1))
+            
+            distance = np.linalg.norm(center[..., np.newaxis, :] - self._centroid_array, axis=-1)
+            bound = distance.min(axis=-1) + 2 * radius * (1 + 1e-9) + 1e-9
+            candidates.append((distance <= bound[..., np.newaxis]).reshape(-1, 20))
+        candidates = np.concatenate(candidates)
+        
+        # Candidate faces in ascending order, padded with -1 to the longest list
+        counts = candidates.sum(axis=1)
+        width = int(counts.max())
+        order = np.argsort(~candidates, axis=1, kind='stable')[:, :width]
+        padded = np.where(np.arange(width) < counts[:, np.newaxis], order, -1)
+        
+        self._face_index_half = 0.5 * resolution
+        self._face_candidate_array = padded.astype(np.intp)
+        self._face_candidates = [tuple(face for face in row if face >= 0) for row in padded.tolist()]
+    
+    @staticmethod
+    def _cube_points(cube_face: int, s: np.ndarray, t: np.ndarray) -> np.ndarray:
+        """Get the unit vectors through the points (s, t) of one face of the cube."""
+        axis, negative = divmod(cube_face, 2)
+        others = [i for i in range(3) if i != axis]
+        
+        points = np.empty(s.shape + (3,), dtype=np.float64)
+        points[..., axis] = -1.0 if negative else 1.0
+        points[..., others[0]] = s
+        points[..., others[1]] = t
+        return points / np.linalg.norm(points, axis=-1, keepdims=True)
+    
     @staticmethod
     def _cart(longitude: float, phi: float) -> Tuple[float, float, float]:
         """Convert spherical to cartesian coordinates."""
@@ -212,7 +290,64 @@ class Airocean(GeographicProjection):
         out[2][2] = cos_b
     
     def _find_triangle(self, x: float, y: float, z: float) -> int:
-        """Find the triangle face closest to the given 3D point."""
+        """
+        Find the triangle face closest to the given 3D point.
+        
+        Looks the point up in the bucket index and only compares the candidate
+        faces of its cell, giving the same face as _find_triangle_scan.
+        """
+        a_x = abs(x)
+        a_y = abs(y)
+        a_z = abs(z)
+        
+        # Project onto the circumscribed cube along the major axis
+        if a_x >= a_y and a_x >= a_z:
+            cube_face = 0 if x > 0 else 1
+            major = a_x
+            s = y
+            t = z
+        elif a_y >= a_z:
+            cube_face = 2 if y > 0 else 3
+            major = a_y
+            s = x
+            t = z
+        else:
+            cube_face = 4 if z > 0 else 5
+            major = a_z
+            s = x
+            t = y
+        
+        if not major > 0:
+            return self._find_triangle_scan(x, y, z)
+        half = self._face_index_half / major
+        s = (s + major) * half
+        t = (t + major) * half
+        resolution = self.FACE_INDEX_RESOLUTION
+        if not (0 <= s <= resolution and 0 <= t <= resolution):
+            return self._find_triangle_scan(x, y, z)
+        
+        cell = (cube_face * resolution + min(int(s), resolution - 1)) * resolution + min(int(t), resolution - 1)
+        candidates = self._face_candidates[cell]
+        
+        if len(candidates) == 1:
+            return candidates[0]
+        
+        min_dist = float('inf')
+        face = candidates[0]
+        for i in candidates:
+            x_d = self.CENTROID[i][0] - x
+            y_d = self.CENTROID[i][1] - y
+            z_d = self.CENTROID[i][2] - z
+            
+            dist_sq = x_d * x_d + y_d * y_d + z_d * z_d
+            if dist_sq < min_dist:
+                face = i
+                min_dist = dist_sq
+        
+        return face
+    
+    def _find_triangle_scan(self, x: float, y: float, z: float) -> int:
+        """Find the triangle face closest to the given 3D point by comparing all 20 centroids."""
         min_dist = float('inf')
         face = 0
         
@@ -230,6 +365,55 @@ class Airocean(GeographicProjection):
         
         return face
     
+    def _find_triangle_array(self, x: np.ndarray, y: np.ndarray, z: np.ndarray) -> np.ndarray:
+        """Vectorized form of _find_triangle."""
+        a_x = np.abs(x)
+        a_y = np.abs(y)
+        a_z = np.abs(z)
+        
+        on_x = (a_x >= a_y) & (a_x >= a_z)
+        on_y = ~on_x & (a_y >= a_z)
+        major = np.where(on_x, a_x, np.where(on_y, a_y, a_z))
+        positive = np.where(on_x, x, np.where(on_y, y, z)) > 0
+        cube_face = np.where(on_x, 0, np.where(on_y, 2, 4)) + np.where(positive, 0, 1)
+        
+        resolution = self.FACE_INDEX_RESOLUTION
+        with np.errstate(invalid='ignore', divide='ignore'):
+            half = self._face_index_half / major
+            s = (np.where(on_x, y, x) + major) * half
+            t = (np.where(on_x | on_y, z, y) + major) * half
+        indexed = (major > 0) & (s >= 0) & (s <= resolution) & (t >= 0) & (t <= resolution)
+        
+        cell_s = np.minimum(np.where(indexed, s, 0).astype(np.intp), resolution - 1)
+        cell_t = np.minimum(np.where(indexed, t, 0).astype(np.intp), resolution - 1)
+        candidates = self._face_candidate_array[(cube_face * resolution + cell_s) * resolution + cell_t]
+        
+        # Compare the padded candidate lists; padding never wins
+        centroid = self._centroid_array[candidates]
+        x_d = centroid[..., 0] - x[..., np.newaxis]
+        y_d = centroid[..., 1] - y[..., np.newaxis]
+        z_d = centroid[..., 2] - z[..., np.newaxis]
+        dist_sq = np.where(candidates >= 0, x_d * x_d + y_d * y_d + z_d * z_d, np.inf)
+        face = np.take_along_axis(candidates, np.argmin(dist_sq, axis=-1)[..., np.newaxis], axis=-1)[..., 0]
+        
+        if not indexed.all():
+            fallback = ~indexed
+            face[fallback] = self._find_triangle_scan_array(x[fallback], y[fallback], z[fallback])
+        return face
+    
+    def _find_triangle_scan_array(self, x: np.ndarray, y: np.ndarray, z: np.ndarray) -> np.ndarray:
+        """Vectorized form of _find_triangle_scan.
+        
+        At most one centroid can lie within the early-exit radius of a point,
+        so the nearest centroid is always the face the scalar scan returns.
+        """
+        centroid = self._centroid_array
+        x_d = centroid[:, 0] - x[..., np.newaxis]
+        y_d = centroid[:, 1] - y[..., np.newaxis]
+        z_d = centroid[:, 2] - z[..., np.newaxis]
+        
+        return np.argmin(x_d * x_d + y_d * y_d + z_d * z_d, axis=-1)
+    
     @classmethod
     def _find_triangle_grid(cls, x: float, y: float) -> int:
         """Find triangle face using grid lookup."""
@@ -266,6 +450,32 @@ class Airocean(GeographicProjection):
         
         return cls.FACE_ON_GRID[row][col]
     
+    def _find_triangle_grid_array(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Vectorized form of _find_triangle_grid, -1 marks points off the map."""
+        x_p = x / self.ARC
+        y_p = y / (self.ARC * self.ROOT3)
+        
+        middle = (y_p > -0.25) & (y_p < 0.25)
+        top = (y_p >= 0.25) & (y_p <= 0.75)
+        bottom = (y_p <= -0.25) & (y_p >= -0.75)
+        
+        row = np.where(top, 0, np.where(bottom, 2, 1))
+        y_p = np.where(top, 0.5 - y_p, np.where(bottom, -y_p - 0.5, y_p))
+        y_p = y_p + 0.25
+        
+        x_r = x_p - y_p
+        y_r = x_p + y_p
+        
+        in_rows = (middle | top | bottom) & np.isfinite(x_r) & np.isfinite(y_r)
+        g_x = np.floor(np.where(in_rows, x_r, 0.0))
+        g_y = np.floor(np.where(in_rows, y_r, 0.0))
+        
+        col = 2 * g_x + np.where(g_y == g_x, 0, 1) + 6
+        valid = in_rows & (col >= 0) & (col < 11)
+        col = np.where(valid, col, 0).astype(np.intp)
+        
+        return np.where(valid, self._face_on_grid_array[row, col], -1)
+    
     def _triangle_transform(self, x: float, y: float, z: float) -> Tuple[float, float]:
         """Transform 3D coordinates to 2D triangle coordinates."""
         s = self.Z / z
@@ -279,6 +489,53 @@ class Airocean(GeographicProjection):
         
         return (0.5 * (b - c), (2 * a - b - c) / (2 * self.ROOT3))
     
+    def _triangle_transform_array(self, x: np.ndarray, y: np.ndarray,
+                                  z: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized form of _triangle_transform."""
+        s = self.Z / z
+        
+        x_p = s * x
+        y_p = s * y
+        
+        a = np.arctan((2 * y_p / self.ROOT3 - self.EL6) / self.DVE)
+        b = np.arctan((x_p - y_p / self.ROOT3 - self.EL6) / self.DVE)
+        c = np.arctan((-x_p - y_p / self.ROOT3 - self.EL6) / self.DVE)
+        
+        return (0.5 * (b - c), (2 * a - b - c) / (2 * self.ROOT3))
+    
+    def _triangle_transform_jacobian_array(
+            self, x: np.ndarray, y: np.ndarray, z: np.ndarray,
+            jacobian: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Vectorized _triangle_transform with its derivatives.
+        
+        jacobian holds the derivatives of (x, y, z) on its second to last axis,
+        and the result holds those of the two outputs the same way.
+        """
+        s = self.Z / z
+        
+        x_p = s * x
+        y_p = s * y
+        
+        d_x, d_y, d_z = np.moveaxis(jacobian, -2, 0)
+        d_s = (-s / z)[..., np.newaxis] * d_z
+        d_x_p = s[..., np.newaxis] * d_x + x[..., np.newaxis] * d_s
+        d_y_p = s[..., np.newaxis] * d_y + y[..., np.newaxis] * d_s
+        
+        t_a = (2 * y_p / self.ROOT3 - self.EL6) / self.DVE
+        t_b = (x_p - y_p / self.ROOT3 - self.EL6) / self.DVE
+        t_c = (-x_p - y_p / self.ROOT3 - self.EL6) / self.DVE
+        a = np.arctan(t_a)
+        b = np.arctan(t_b)
+        c = np.arctan(t_c)
+        
+        d_a = (2 * d_y_p / self.ROOT3) / (self.DVE * (1 + t_a * t_a))[..., np.newaxis]
+        d_b = (d_x_p - d_y_p / self.ROOT3) / (self.DVE * (1 + t_b * t_b))[..., np.newaxis]
+        d_c = (-d_x_p - d_y_p / self.ROOT3) / (self.DVE * (1 + t_c * t_c))[..., np.newaxis]
+        
+        return (0.5 * (b - c), (2 * a - b - c) / (2 * self.ROOT3),
+                np.stack([0.5 * (d_b - d_c), (2 * d_a - d_b - d_c) / (2 * self.ROOT3)], axis=-2))
+    
     def _inverse_triangle_transform_newton(self, x_pp: float, y_pp: float) -> Tuple[float, float, float]:
         """Inverse triangle transform using Newton's method."""
         tan_a_off = math.tan(self.ROOT3 * y_pp + x_pp)
@@ -294,17 +551,28 @@ class Airocean(GeographicProjection):
         a_denom = 1.0
         b_denom = 1.0
         
-        for _ in range(self.newton):
+        step = 0.0
+        done = 0
+        while done < self.newton:
             f = tan_a + tan_b + tan_c - self.R
             f_p = a_numer * a_denom * a_denom + b_numer * b_denom * b_denom + 1
             
-            tan_c -= f / f_p
+            step = f / f_p
+            tan_c -= step
+            done += 1
             
             a_denom = 1 / (1 - tan_c * tan_a_off)
             b_denom = 1 / (1 - tan_c * tan_b_off)
             
             tan_a = (tan_c + tan_a_off) * a_denom
             tan_b = (tan_c + tan_b_off) * b_denom
+            
+            step = abs(step)
+            if step <= self.newton_tolerance:
+                break
+        
+        if self.newton_stats is not None:
+            self.newton_stats.record('inverse_triangle', done, step, step <= self.newton_tolerance)
         
         y_p = self.ROOT3 * (self.DVE * tan_a + self.EL6) / 2
         x_p = self.DVE * tan_b + y_p / self.ROOT3 + self.EL6
@@ -317,10 +585,70 @@ class Airocean(GeographicProjection):
         
         return (z * x_p_over_z, z * y_p_over_z, z)
     
+    def _inverse_triangle_transform_newton_array(
+            self, x_pp: np.ndarray, y_pp: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Vectorized form of _inverse_triangle_transform_newton."""
+        tan_a_off = np.tan(self.ROOT3 * y_pp + x_pp)
+        tan_b_off = np.tan(2 * x_pp)
+        
+        a_numer = tan_a_off * tan_a_off + 1
+        b_numer = tan_b_off * tan_b_off + 1
+        
+        tan_a = tan_a_off
+        tan_b = tan_b_off
+        tan_c = np.zeros_like(tan_a_off)
+        
+        a_denom = np.ones_like(tan_a_off)
+        b_denom = np.ones_like(tan_a_off)
+        
+        # Converged points stop moving, the loop ends once none are left
+        tolerance = self.newton_tolerance
+        done = np.zeros(tan_a_off.shape, dtype=np.intp)
+        steps = np.zeros(tan_a_off.shape, dtype=np.float64)
+        active = np.ones(tan_a_off.shape, dtype=bool)
+        
+        for _ in range(self.newton):
+            if not active.any():
+                break
+            
+            f = tan_a + tan_b + tan_c - self.R
+            f_p = a_numer * a_denom * a_denom + b_numer * b_denom * b_denom + 1
+            
+            step = np.where(active, f / f_p, 0.0)
+            tan_c = tan_c - step
+            done = done + active
+            
+            a_denom = 1 / (1 - tan_c * tan_a_off)
+            b_denom = 1 / (1 - tan_c * tan_b_off)
+            
+            tan_a = (tan_c + tan_a_off) * a_denom
+            tan_b = (tan_c + tan_b_off) * b_denom
+            
+            steps = np.where(active, np.abs(step), steps)
+            active &= ~(steps <= tolerance)
+        
+        if self.newton_stats is not None:
+            self.newton_stats.record_array('inverse_triangle', done, steps, steps <= tolerance)
+        
+        y_p = self.ROOT3 * (self.DVE * tan_a + self.EL6) / 2
+        x_p = self.DVE * tan_b + y_p / self.ROOT3 + self.EL6
+        
+        x_p_over_z = x_p / self.Z
+        y_p_over_z = y_p / self.Z
+        
+        z = 1 / np.sqrt(1 + x_p_over_z * x_p_over_z + y_p_over_z * y_p_over_z)
+        
+        return (z * x_p_over_z, z * y_p_over_z, z)
+    
     def _inverse_triangle_transform(self, x: float, y: float) -> Tuple[float, float, float]:
         """Inverse triangle transform."""
         return self._inverse_triangle_transform_newton(x, y)
     
+    def _inverse_triangle_transform_array(
+            self, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Vectorized form of _inverse_triangle_transform."""
+        return self._inverse_triangle_transform_newton_array(x, y)
+    
     def from_geo(self, lon: float, lat: float) -> Tuple[float, float]:
         """Convert geographic coordinates to projected coordinates."""
         lat = 90 - lat
@@ -413,3 +741,290 @@ class Airocean(GeographicProjection):
         lat = 90 - math.acos(z_p) / self.TO_RADIANS
         
         return (lat, lon)
+    
+    def from_geo_array(self, lon: np.ndarray, lat: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Convert arrays of geographic coordinates to projected coordinates."""
+        x, y, z = self._cartesian_array(lon, lat)
+        
+        face = self._find_triangle_array(x, y, z)
+        if self.partition_by_face:
+            return self._from_geo_by_face(x, y, z, face)
+        
+        x_p, y_p, z_p, _ = self._rotate_to_face_array(face, x, y, z)
+        out_x, out_y = self._triangle_transform_array(x_p, y_p, z_p)
+        out_x, out_y, _, _ = self._unfold_array(face, out_x, out_y)
+        return (out_x, out_y)
+    
+    def _cartesian_array(self, lon: np.ndarray, lat: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Get the points on the unit sphere of arrays of geographic coordinates, broadcast together."""
+        # z depends on lat alone, so broadcast first for the partitioned path
+        lon, lat = np.broadcast_arrays(np.asarray(lon, dtype=np.float64), np.asarray(lat, dtype=np.float64))
+        
+        lon_rad = lon * self.TO_RADIANS
+        lat_rad = (90 - lat) * self.TO_RADIANS
+        
+        sin_phi = np.sin(lat_rad)
+        return (np.cos(lon_rad) * sin_phi, np.sin(lon_rad) * sin_phi, np.cos(lat_rad))
+    
+    def _rotate_to_face_array(self, face: np.ndarray, x: np.ndarray, y: np.ndarray,
+                              z: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Rotate points into the frame of their face, also returning the per-point rotation matrices."""
+        rotation_matrix = self._rotation_array[face]
+        x_p = (x * rotation_matrix[..., 0, 0] + 
+               y * rotation_matrix[..., 0, 1] + 
+               z * rotation_matrix[..., 0, 2])
+        y_p = (x * rotation_matrix[..., 1, 0] + 
+               y * rotation_matrix[..., 1, 1] + 
+               z * rotation_matrix[..., 1, 2])
+        z_p = (x * rotation_matrix[..., 2, 0] + 
+               y * rotation_matrix[..., 2, 1] + 
+               z * rotation_matrix[..., 2, 2])
+        return x_p, y_p, z_p, rotation_matrix
+    
+    def _unfold_array(self, face: np.ndarray, out_x: np.ndarray,
+                      out_y: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Place triangle-transformed points of each face on the map.
+        
+        Returns the map coordinates, and the masks of the points that were
+        flipped and of those moved to faces 20 and 21, for callers that carry
+        derivatives along.
+        """
+        # Apply flip if needed
+        flip = self._flip_array[face]
+        out_x = np.where(flip, -out_x, out_x)
+        out_y = np.where(flip, -out_y, out_y)
+        
+        # Handle special face transformations, a rotation by 60 degrees
+        shifted = (((face == 15) & (out_x > out_y * self.ROOT3)) | (face == 14)) & (out_x > 0)
+        orig_x = out_x
+        out_x = np.where(shifted, 0.5 * orig_x - 0.5 * self.ROOT3 * out_y, orig_x)
+        out_y = np.where(shifted, 0.5 * self.ROOT3 * orig_x + 0.5 * out_y, out_y)
+        face = np.where(shifted, face + 6, face)
+        
+        # Apply center offset
+        center = self._center_map_array[face]
+        return (out_x + center[..., 0], out_y + center[..., 1], flip, shifted)
+    
+    def from_geo_jacobian_array(self, lon: np.ndarray,
+                                lat: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Convert arrays of geographic coordinates, with the derivatives of the result.
+        
+        Returns the projected x and y, and a (..., 2, 2) Jacobian whose rows are
+        x and y and whose columns are the derivatives per radian of arc toward
+        east and toward north, computed analytically through every step.
+        """
+        x, y, z = self._cartesian_array(lon, lat)
+        
+        # Unit vectors toward east and north, as columns
+        lon_rad = np.asarray(lon, dtype=np.float64) * self.TO_RADIANS
+        lat_rad = (90 - np.asarray(lat, dtype=np.float64)) * self.TO_RADIANS
+        sin_lon, cos_lon = np.broadcast_to(np.sin(lon_rad), z.shape), np.broadcast_to(np.cos(lon_rad), z.shape)
+        sin_phi, cos_phi = np.broadcast_to(np.sin(lat_rad), z.shape), z
+        jacobian = np.stack([
+            np.stack([-sin_lon, -cos_lon * cos_phi], axis=-1),
+            np.stack([cos_lon, -sin_lon * cos_phi], axis=-1),
+            np.stack([np.zeros_like(z), sin_phi], axis=-1),
+        ], axis=-2)
+        
+        face = self._find_triangle_array(x, y, z)
+        x_p, y_p, z_p, rotation_matrix = self._rotate_to_face_array(face, x, y, z)
+        jacobian = rotation_matrix @ jacobian
+        
+        out_x, out_y, jacobian = self._triangle_transform_jacobian_array(x_p, y_p, z_p, jacobian)
+        out_x, out_y, flip, shifted = self._unfold_array(face, out_x, out_y)
+        
+        # The flip negates both axes, the move to faces 20 and 21 rotates by 60 degrees
+        jacobian = np.where(flip[..., np.newaxis, np.newaxis], -jacobian, jacobian)
+        rotation = np.array([[0.5, -0.5 * self.ROOT3], [0.5 * self.ROOT3, 0.5]])
+        jacobian = np.where(shifted[..., np.newaxis, np.newaxis], rotation @ jacobian, jacobian)
+        return (out_x, out_y, jacobian)
+    
+    def to_geo_array(self, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Convert arrays of projected coordinates to geographic coordinates.
+        
+        Points outside the map come back as NaN, mirroring OUT_OF_BOUNDS.
+        """
+        x, y = np.broadcast_arrays(np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64))
+        
+        face = self._find_triangle_grid_array(x, y)
+        if self.partition_by_face:
+            return self._to_geo_by_face(x, y, face)
+        valid = face != -1
+        face = np.where(valid, face, 0)
+        
+        # Remove center offset
+        center = self._center_map_array[face]
+        x = x - center[..., 0]
+        y = y - center[..., 1]
+        
+        # Check bounds for special faces
+        valid &= self._inside_face_array(face, x, y)
+        
+        # Apply flip if needed
+        flip = self._flip_array[face]
+        x = np.where(flip, -x, x)
+        y = np.where(flip, -y, y)
+        
+        with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+            x_3d, y_3d, z_3d = self._inverse_triangle_transform_array(x, y)
+            
+            # Apply inverse rotation matrix
+            inverse_rotation_matrix = self._inverse_rotation_array[face]
+            x_p = (x_3d * inverse_rotation_matrix[..., 0, 0] + 
+                   y_3d * inverse_rotation_matrix[..., 0, 1] + 
+                   z_3d * inverse_rotation_matrix[..., 0, 2])
+            y_p = (x_3d * inverse_rotation_matrix[..., 1, 0] + 
+                   y_3d * inverse_rotation_matrix[..., 1, 1] + 
+                   z_3d * inverse_rotation_matrix[..., 1, 2])
+            z_p = (x_3d * inverse_rotation_matrix[..., 2, 0] + 
+                   y_3d * inverse_rotation_matrix[..., 2, 1] + 
+                   z_3d * inverse_rotation_matrix[..., 2, 2])
+            
+            lon = np.arctan2(y_p, x_p) / self.TO_RADIANS
+            lat = 90 - np.arccos(z_p) / self.TO_RADIANS
+        
+        return (np.where(valid, lat, np.nan), np.where(valid, lon, np.nan))
+    
+    def _inside_face_array(self, face: np.ndarray, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Check that points relative to their face center lie on the part of the face shown on the map."""
+        return ~(((face == 14) & (x > 0))
+                 | ((face == 20) & (-y * self.ROOT3 > x))
+                 | ((face == 15) & (x > 0) & (x > y * self.ROOT3))
+                 | ((face == 21) & ((x < 0) | (-y * self.ROOT3 > x))))
+    
+    @staticmethod
+    def _face_runs(face: np.ndarray) -> Tuple[np.ndarray, List[Tuple[int, int, int]]]:
+        """
+        Order a flat array of faces so each face forms one contiguous run.
+        
+        Returns the sorting order and a (face, start, stop) tuple per run, in
+        ascending face order so -1 comes first. Faces fit in int8, for which
+        the stable sort is a linear-time radix sort.
+        """
+        order = np.argsort(face.astype(np.int8), kind='stable')
+        if not len(order):
+            return order, []
+        sorted_face = face[order]
+        bounds = (np.flatnonzero(sorted_face[1:] != sorted_face[:-1]) + 1).tolist()
+        return order, [(int(sorted_face[start]), start, stop)
+                       for start, stop in zip([0] + bounds, bounds + [len(order)])]
+    
+    def _from_geo_by_face(self, x: np.ndarray, y: np.ndarray, z: np.ndarray,
+                          face: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Partitioned form of the rest of from_geo_array.
+        
+        Points are sorted by face, and each face's run is rotated, flipped and
+        offset with that face's constants as scalars; the triangle transform
+        runs once over all the sorted points. Results are scattered back into
+        input order and are identical to the gathering path.
+        """
+        shape = face.shape
+        order, runs = self._face_runs(face.ravel())
+        x, y, z = x.ravel()[order], y.ravel()[order], z.ravel()[order]
+        
+        x_p, y_p, z_p = np.empty_like(x), np.empty_like(x), np.empty_like(x)
+        for f, start, stop in runs:
+            (r00, r01, r02), (r10, r11, r12), (r20, r21, r22) = self.ROTATION_MATRIX[f]
+            x_f, y_f, z_f = x[start:stop], y[start:stop], z[start:stop]
+            x_p[start:stop] = x_f * r00 + y_f * r01 + z_f * r02
+            y_p[start:stop] = x_f * r10 + y_f * r11 + z_f * r12
+            z_p[start:stop] = x_f * r20 + y_f * r21 + z_f * r22
+        
+        out_x, out_y = self._triangle_transform_array(x_p, y_p, z_p)
+        
+        result_x, result_y = np.empty_like(x), np.empty_like(x)
+        for f, start, stop in runs:
+            u, v = out_x[start:stop], out_y[start:stop]
+            if self.FLIP_TRIANGLE[f] != 0:
+                u, v = -u, -v
+            center_x, center_y = self.CENTER_MAP[f]
+            if f == 14 or f == 15:
+                # Part of the face is moved on the map, shift 14->20 & 15->21
+                shifted = (u > 0) if f == 14 else (u > v * self.ROOT3) & (u > 0)
+                u, v = (np.where(shifted, 0.5 * u - 0.5 * self.ROOT3 * v, u),
+                        np.where(shifted, 0.5 * self.ROOT3 * u + 0.5 * v, v))
+                center_x = np.where(shifted, self.CENTER_MAP[f + 6][0], center_x)
+                center_y = np.where(shifted, self.CENTER_MAP[f + 6][1], center_y)
+            result_x[start:stop] = u + center_x
+            result_y[start:stop] = v + center_y
+        
+        out_x, out_y = np.empty_like(x), np.empty_like(x)
+        out_x[order] = result_x
+        out_y[order] = result_y
+        return (out_x.reshape(shape), out_y.reshape(shape))
+    
+    def _to_geo_by_face(self, x: np.ndarray, y: np.ndarray,
+                        face: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Partitioned form of the rest of to_geo_array.
+        
+        Points off the map sort first and are skipped entirely. The remaining
+        runs are offset, checked and flipped with their face's constants, go
+        through one inverse triangle transform, and are rotated back face by
+        face before being scattered into input order.
+        """
+        shape = face.shape
+        order, runs = self._face_runs(face.ravel())
+        x, y = x.ravel()[order], y.ravel()[order]
+        lat, lon = np.full(len(order), np.nan), np.full(len(order), np.nan)
+        
+        skip = runs[0][2] if runs and runs[0][0] == -1 else 0
+        runs = [(f, start - skip, stop - skip) for f, start, stop in runs if f != -1]
+        x, y = x[skip:], y[skip:]
+        
+        valid = np.empty(len(x), dtype=bool)
+        x_f, y_f = np.empty_like(x), np.empty_like(x)
+        for f, start, stop in runs:
+            center_x, center_y = self.CENTER_MAP[f]
+            u, v = x[start:stop] - center_x, y[start:stop] - center_y
+            valid[start:stop] = self._inside_face_array(f, u, v) if f in (14, 15, 20, 21) else True
+            if self.FLIP_TRIANGLE[f] != 0:
+                u, v = -u, -v
+            x_f[start:stop] = u
+            y_f[start:stop] = v
+        
+        with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+            x_3d, y_3d, z_3d = self._inverse_triangle_transform_array(x_f, y_f)
+            
+            x_p, y_p, z_p = np.empty_like(x), np.empty_like(x), np.empty_like(x)
+            for f, start, stop in runs:
+                (r00, r01, r02), (r10, r11, r12), (r20, r21, r22) = self.INVERSE_ROTATION_MATRIX[f]
+                a, b, c = x_3d[start:stop], y_3d[start:stop], z_3d[start:stop]
+                x_p[start:stop] = a * r00 + b * r01 + c * r02
+                y_p[start:stop] = a * r10 + b * r11 + c * r12
+                z_p[start:stop] = a * r20 + b * r21 + c * r22
+            
+            on_map_lon = np.arctan2(y_p, x_p) / self.TO_RADIANS
+            on_map_lat = 90 - np.arccos(z_p) / self.TO_RADIANS
+        
+        lat[order[skip:]] = np.where(valid, on_map_lat, np.nan)
+        lon[order[skip:]] = np.where(valid, on_map_lon, np.nan)
+        return (lat.reshape(shape), lon.reshape(shape))
+    
+    def from_geo_face_array(self, lon: np.ndarray, lat: np.ndarray) -> np.ndarray:
+        """Get the icosahedron face (0-19) each geographic point falls on."""
+        return self._find_triangle_array(*self._cartesian_array(lon, lat))
+    
+    def to_geo_face_array(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """
+        Get the icosahedron face (0-19) each projected point lies on, -1 off the map.
+        
+        Faces 20 and 21 of the map are the moved parts of faces 14 and 15 and
+        are reported as those, so both directions agree.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        
+        face = self._find_triangle_grid_array(x, y)
+        on_grid = np.where(face != -1, face, 0)
+        center = self._center_map_array[on_grid]
+        valid = (face != -1) & self._inside_face_array(on_grid, x - center[..., 0], y - center[..., 1])
+        return np.where(valid, self._icosahedron_face(face), -1)
+    
+    @staticmethod
+    def _icosahedron_face(face):
+        """Report the map's faces 20 and 21, the moved parts of faces 14 and 15, as those faces."""
+        return np.where(face >= 20, face - 6, face)
@@ -3,76 +3,113 @@ Conformal estimate projection.
 """
 from .airocean import Airocean
 from ..utils.invertable_vector_field import InvertableVectorField
-from ..data.conformal import get_conformal_json
-from typing import Tuple
+from ..data.conformal import load_conformal_grid
+from typing import Optional, Tuple
 import math
 
+import numpy as np
+
 
 class ConformalEstimate(Airocean):
     """Conformal correction applied to Airocean projection."""
     
     VECTOR_SCALE_FACTOR: float = 1 / 1.1473979730192934
+    INVERSE_GRID_RESOLUTION: int = 64
     
-    def __init__(self):
+    def __init__(self, grid: Optional[np.ndarray] = None):
+        """
+        Args:
+            grid: Pre-scaled conformal data in the packed (N, 2) layout, for example
+                a shared memory buffer; loaded with load_conformal_grid when omitted
+        """
         super().__init__()
         
+        # Cap and step-size tolerance for the conformal correction Newton solve
+        self.conformal_newton: int = 5
+        self.conformal_tolerance: float = 1e-12
+        
         side_length = 256
         
-        # Initialize arrays for conformal data
-        xs = []
-        ys = []
+        # Load the pre-scaled conformal data, already in the field's packed layout
+        if grid is None:
+            grid = load_conformal_grid(self.VECTOR_SCALE_FACTOR)
         
-        for u in range(side_length + 1):
-            px = [0.0] * (side_length + 1 - u)
-            py = [0.0] * (side_length + 1 - u)
-            xs.append(px)
-            ys.append(py)
+        point_count = InvertableVectorField.point_count(side_length)
+        if len(grid) < point_count:
+            # Fallback to identity if data is insufficient
+            grid = self._pad_with_identity(grid, side_length)
         
-        # Load conformal data
-        conformal_data = get_conformal_json()
+        self.inverse = InvertableVectorField.from_packed(grid[:point_count], side_length)
         
-        # Fill arrays with conformal data
-        counter = 0
+        # Start the Newton solve from a precomputed inverse lookup instead of
+        # the uncorrected position
+        self.inverse_guess: bool = True
+        self.inverse.build_inverse_grid(self.INVERSE_GRID_RESOLUTION)
+    
+    def _pad_with_identity(self, grid: np.ndarray, side_length: int) -> np.ndarray:
+        """Fill missing samples at the end of the grid with the identity mapping."""
+        offsets = InvertableVectorField.row_offsets(side_length)
+        padded = np.empty((InvertableVectorField.point_count(side_length), 2), dtype=np.float64)
         for v in range(side_length + 1):
             for u in range(side_length + 1 - v):
-                if counter < len(conformal_data):
-                    entry = conformal_data[counter]
-                    xs[u][v] = entry[0] * self.VECTOR_SCALE_FACTOR
-                    ys[u][v] = entry[1] * self.VECTOR_SCALE_FACTOR
-                else:
-                    # Fallback to identity if data is insufficient
-                    xs[u][v] = u / side_length * self.VECTOR_SCALE_FACTOR
-                    ys[u][v] = v / side_length * self.VECTOR_SCALE_FACTOR
-                counter += 1
-        
-        self.inverse = InvertableVectorField(xs, ys)
+                padded[offsets[v] + u] = (u / side_length * self.VECTOR_SCALE_FACTOR,
+                                          v / side_length * self.VECTOR_SCALE_FACTOR)
+        padded[:len(grid)] = grid
+        return padded
     
     def _triangle_transform(self, x: float, y: float, z: float) -> Tuple[float, float]:
         """Apply conformal correction to triangle transform."""
-        c = list(super()._triangle_transform(x, y, z))
+        orig_x, orig_y = super()._triangle_transform(x, y, z)
         
-        orig_x = c[0]
-        orig_y = c[1]
-        
-        # Normalize to unit triangle
-        c[0] /= self.ARC
-        c[1] /= self.ARC
-        
-        # Apply correction
-        c[0] += 0.5
-        c[1] += self.ROOT3 / 6
+        if self.inverse_guess and self.inverse.has_inverse_grid:
+            c_x, c_y = self.inverse.get_initial_guess(orig_x, orig_y)
+        else:
+            # Normalize to unit triangle and apply correction
+            c_x = orig_x / self.ARC + 0.5
+            c_y = orig_y / self.ARC + self.ROOT3 / 6
         
         # Apply Newton's method for conformal correction
-        corrected = self.inverse.apply_newtons_method(orig_x, orig_y, c[0], c[1], 5)
-        
-        c[0] = corrected[0] - 0.5
-        c[1] = corrected[1] - self.ROOT3 / 6
+        c_x, c_y = self.inverse.apply_newtons_method(orig_x, orig_y, c_x, c_y, self.conformal_newton,
+                                                     self.conformal_tolerance, self.newton_stats)
         
         # Scale back
-        c[0] *= self.ARC
-        c[1] *= self.ARC
+        return (c_x - 0.5) * self.ARC, (c_y - self.ROOT3 / 6) * self.ARC
+    
+    def _triangle_transform_array(self, x: np.ndarray, y: np.ndarray,
+                                  z: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized form of _triangle_transform."""
+        orig_x, orig_y = super()._triangle_transform_array(x, y, z)
+        c_x, c_y = self._conformal_solve_array(orig_x, orig_y)
         
-        return (c[0], c[1])
+        return ((c_x - 0.5) * self.ARC, (c_y - self.ROOT3 / 6) * self.ARC)
+    
+    def _conformal_solve_array(self, orig_x: np.ndarray, orig_y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Find the points of the unit triangle the conformal field maps onto the given points."""
+        if self.inverse_guess and self.inverse.has_inverse_grid:
+            c_x, c_y = self.inverse.get_initial_guess_array(orig_x, orig_y)
+        else:
+            # Normalize to unit triangle and apply correction
+            c_x = orig_x / self.ARC + 0.5
+            c_y = orig_y / self.ARC + self.ROOT3 / 6
+        
+        return self.inverse.apply_newtons_method_array(orig_x, orig_y, c_x, c_y, self.conformal_newton,
+                                                       self.conformal_tolerance, self.newton_stats)
+    
+    def _triangle_transform_jacobian_array(
+            self, x: np.ndarray, y: np.ndarray, z: np.ndarray,
+            jacobian: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Vectorized _triangle_transform with its derivatives."""
+        orig_x, orig_y, jacobian = super()._triangle_transform_jacobian_array(x, y, z, jacobian)
+        c_x, c_y = self._conformal_solve_array(orig_x, orig_y)
+        
+        # The correction inverts the field, so its derivative is the inverse of
+        # the field's derivative at the solution; the field is linear on each
+        # grid triangle, so that derivative is exact
+        _, _, dfdx, dfdy, dgdx, dgdy = self.inverse.get_interpolated_vector_array(c_x, c_y)
+        scale = (self.ARC / (dfdx * dgdy - dfdy * dgdx))[..., np.newaxis, np.newaxis]
+        adjugate = np.stack([np.stack([dgdy, -dfdy], axis=-1), np.stack([-dgdx, dfdx], axis=-1)], axis=-2)
+        
+        return ((c_x - 0.5) * self.ARC, (c_y - self.ROOT3 / 6) * self.ARC, scale * (adjugate @ jacobian))
     
     def _inverse_triangle_transform(self, x: float, y: float) -> Tuple[float, float, float]:
         """Apply inverse conformal correction."""
@@ -90,6 +127,16 @@ class ConformalEstimate(Airocean):
         # Apply the correction and return to parent method
         return super()._inverse_triangle_transform(corrected[0], corrected[1])
     
+    def _inverse_triangle_transform_array(
+            self, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Vectorized form of _inverse_triangle_transform."""
+        x = x / self.ARC + 0.5
+        y = y / self.ARC + self.ROOT3 / 6
+        
+        corrected = self.inverse.get_interpolated_vector_array(x, y)
+        
+        return super()._inverse_triangle_transform_array(corrected[0], corrected[1])
+    
     def meters_per_unit(self) -> float:
         """Get adjusted meters per unit accounting for conformal scaling."""
         return (40075017 / (2 * math.pi)) / self.VECTOR_SCALE_FACTOR
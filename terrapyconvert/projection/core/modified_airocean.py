@@ -3,9 +3,11 @@ Modified Airocean projection with custom transformations.
 """
 from .conformal_estimate import ConformalEstimate
 from .airocean import Airocean
-from typing import Tuple, List
+from typing import Tuple, List, Optional
 import math
 
+import numpy as np
+
 
 class ModifiedAirocean(ConformalEstimate):
     """Modified Airocean projection with Eurasian adjustments."""
@@ -23,8 +25,8 @@ class ModifiedAirocean(ConformalEstimate):
     ALEUTIAN_XL: float = -0.5149231279757507
     ALEUTIAN_XR: float = -0.45
     
-    def __init__(self):
-        super().__init__()
+    def __init__(self, grid: Optional[np.ndarray] = None):
+        super().__init__(grid)
         
         # Calculate derived constants
         self.ARCTIC_M = ((self.ARCTIC_Y - self.ROOT3 * self.ARC / 4) / 
@@ -56,10 +58,32 @@ class ModifiedAirocean(ConformalEstimate):
         
         return y > self.ALEUTIAN_M * x + self.ALEUTIAN_B
     
+    def _is_eurasian_part_array(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Vectorized form of _is_eurasian_part, branches are tested in the same order."""
+        in_strait = (y > self.BERING_Y) & (y < self.ARCTIC_Y)
+        return np.select(
+            [
+                x > 0,
+                x < -0.5 * self.ARC,
+                y > self.ROOT3 * self.ARC / 4,
+                y < self.ALEUTIAN_Y,
+                in_strait,
+                y > self.BERING_Y,
+            ],
+            [
+                False,
+                True,
+                x < 0,
+                y < (self.ALEUTIAN_Y + self.ALEUTIAN_XL) - x,
+                x < self.BERING_X,
+                y < self.ARCTIC_M * x + self.ARCTIC_B,
+            ],
+            default=y > self.ALEUTIAN_M * x + self.ALEUTIAN_B,
+        )
+    
     def from_geo(self, lon: float, lat: float) -> Tuple[float, float]:
         """Convert geographic coordinates with Eurasian modifications."""
-        c = list(super().from_geo(lon, lat))
-        x, y = c[0], c[1]
+        x, y = super().from_geo(lon, lat)
         
         easia = self._is_eurasian_part(x, y)
         
@@ -76,10 +100,7 @@ class ModifiedAirocean(ConformalEstimate):
             x -= self.ARC
         
         # Swap coordinates
-        c[0] = y
-        c[1] = -x
-        
-        return (c[0], c[1])
+        return y, -x
     
     def to_geo(self, x: float, y: float) -> Tuple[float, float]:
         """Convert to geographic coordinates with Eurasian modifications."""
@@ -113,6 +134,72 @@ class ModifiedAirocean(ConformalEstimate):
         
         return super().to_geo(x, y)
     
+    def from_geo_array(self, lon: np.ndarray, lat: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized form of from_geo."""
+        x, y, _ = self._modify_array(*super().from_geo_array(lon, lat))
+        return (x, y)
+    
+    def from_geo_jacobian_array(self, lon: np.ndarray,
+                                lat: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Vectorized form of from_geo with derivatives, see Airocean.from_geo_jacobian_array."""
+        x, y, jacobian = super().from_geo_jacobian_array(lon, lat)
+        x, y, easia = self._modify_array(x, y)
+        
+        rotation = np.array([[self.COS_THETA, -self.SIN_THETA], [self.SIN_THETA, self.COS_THETA]])
+        jacobian = np.where(easia[..., np.newaxis, np.newaxis], rotation @ jacobian, jacobian)
+        # Swap coordinates
+        return (x, y, np.array([[0.0, 1.0], [-1.0, 0.0]]) @ jacobian)
+    
+    def _modify_array(self, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Apply the Eurasian modifications to Airocean coordinates, also returning the Eurasian mask."""
+        easia = self._is_eurasian_part_array(x, y)
+        
+        y = y - 0.75 * self.ARC * self.ROOT3
+        
+        # Eurasia is shifted and rotated, the rest is only shifted
+        x_e = x + self.ARC
+        x = np.where(easia, self.COS_THETA * x_e - self.SIN_THETA * y, x - self.ARC)
+        y = np.where(easia, self.SIN_THETA * x_e + self.COS_THETA * y, y)
+        
+        # Swap coordinates
+        return (y, -x, easia)
+    
+    def _unmodify_array(self, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Undo the Eurasian modifications, returning Airocean coordinates and a mask of consistent points."""
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        
+        easia = np.where(
+            y < 0,
+            x > 0,
+            np.where(y > self.ARC / 2, x > -self.ROOT3 * self.ARC / 2, y * -self.ROOT3 < x),
+        )
+        
+        # Unswap coordinates
+        x, y = -y, x
+        
+        x_e = self.COS_THETA * x + self.SIN_THETA * y - self.ARC
+        y = np.where(easia, self.COS_THETA * y - self.SIN_THETA * x, y)
+        x = np.where(easia, x_e, x + self.ARC)
+        
+        y = y + 0.75 * self.ARC * self.ROOT3
+        
+        # Check if still in right part
+        return (x, y, easia == self._is_eurasian_part_array(x, y))
+    
+    def to_geo_array(self, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized form of to_geo."""
+        x, y, valid = self._unmodify_array(x, y)
+        
+        lat, lon = super().to_geo_array(x, y)
+        return (np.where(valid, lat, np.nan), np.where(valid, lon, np.nan))
+    
+    def to_geo_face_array(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Get the icosahedron face each point lies on, -1 off the map."""
+        x, y, valid = self._unmodify_array(x, y)
+        
+        return np.where(valid, super().to_geo_face_array(x, y), -1)
+    
     def bounds(self) -> List[float]:
         """Get bounds for the modified projection."""
         return [
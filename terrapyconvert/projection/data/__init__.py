@@ -1,9 +1,11 @@
 """
 Data files and loaders for projections.
 """
-from .conformal import get_conformal_json, load_conformal_data
+from .conformal import get_cache_dir, get_conformal_json, load_conformal_data, load_conformal_grid
 
 __all__ = [
+    'get_cache_dir',
     'get_conformal_json', 
     'load_conformal_data',
+    'load_conformal_grid',
 ]
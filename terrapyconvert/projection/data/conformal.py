@@ -3,9 +3,21 @@ Conformal correction data loader.
 """
 import json
 import base64
-from typing import List, Any
+import hashlib
+import logging
+import tempfile
+from typing import List, Any, Optional
 import os
 
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CONFORMAL_FILE = os.path.join(os.path.dirname(__file__), 'conformal.txt')
+
+# Bump when the layout of the binary cache changes
+_CACHE_FORMAT_VERSION = 1
+
 
 def load_conformal_data() -> List[List[float]]:
     """
@@ -18,7 +30,7 @@ def load_conformal_data() -> List[List[float]]:
         2D array of conformal correction coordinates
     """
     # Try to load from conformal.txt
-    conformal_file = os.path.join(os.path.dirname(__file__), 'conformal.txt')
+    conformal_file = CONFORMAL_FILE
     
     if os.path.exists(conformal_file):
         try:
@@ -27,16 +39,16 @@ def load_conformal_data() -> List[List[float]]:
                 
                 # The file contains JSON array format
                 if content.startswith('[[') or content.startswith('['):
-                    print("Loading conformal correction data...")
+                    logger.debug("Loading conformal correction data from %s", conformal_file)
                     data = json.loads(content)
-                    print(f"Loaded {len(data)} conformal correction points")
+                    logger.debug("Loaded %d conformal correction points", len(data))
                     return data
                 else:
                     # Handle base64 encoded format if needed
                     try:
                         decoded = base64.b64decode(content).decode('utf-8')
                         data = json.loads(decoded)
-                        print(f"Loaded {len(data)} conformal correction points from base64")
+                        logger.debug("Loaded %d conformal correction points from base64", len(data))
                         return data
                     except Exception as decode_error:
                         raise ValueError(f"Could not decode base64 conformal data: {decode_error}")
@@ -50,3 +62,126 @@ def load_conformal_data() -> List[List[float]]:
 def get_conformal_json() -> List[List[float]]:
     """Get conformal correction data as JSON."""
     return load_conformal_data()
+
+
+def get_cache_dir() -> str:
+    """
+    Get the directory used for the binary conformal cache.
+    
+    TERRAPYCONVERT_CACHE_DIR overrides the default, which is the platform's
+    user cache directory.
+    """
+    override = os.environ.get('TERRAPYCONVERT_CACHE_DIR')
+    if override:
+        return override
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'terrapyconvert')
+
+
+def _sha256_file(path: str) -> str:
+    """Get the hex SHA-256 digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _cache_path(scale: float, cache_dir: str) -> str:
+    """Get the cache file for the current conformal.txt and scale factor."""
+    key = hashlib.sha256()
+    key.update(_sha256_file(CONFORMAL_FILE).encode('ascii'))
+    key.update(repr((float(scale), _CACHE_FORMAT_VERSION)).encode('ascii'))
+    return os.path.join(cache_dir, f"conformal-{key.hexdigest()[:32]}.npy")
+
+
+def _load_cached_grid(path: str) -> Optional[np.ndarray]:
+    """Memory-map a cached grid, or return None if it is missing or fails validation."""
+    checksum_path = path + '.sha256'
+    if not (os.path.exists(path) and os.path.exists(checksum_path)):
+        return None
+    try:
+        with open(checksum_path, 'r') as f:
+            expected = f.read().strip()
+        if _sha256_file(path) != expected:
+            logger.warning("Ignoring corrupt conformal cache %s", path)
+            return None
+        grid = np.load(path, mmap_mode='r')
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring unreadable conformal cache %s: %s", path, e)
+        return None
+    if grid.dtype != np.float64 or grid.ndim != 2 or grid.shape[1] != 2:
+        logger.warning("Ignoring conformal cache %s with unexpected layout", path)
+        return None
+    return grid
+
+
+def _write_cached_grid(path: str, grid: np.ndarray) -> None:
+    """Write a grid and its checksum atomically so readers never see a partial file."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, grid)
+        checksum = _sha256_file(tmp_path)
+        with open(tmp_path + '.sha256', 'w') as f:
+            f.write(checksum)
+        # The checksum goes first: a grid without a matching checksum is ignored
+        os.replace(tmp_path + '.sha256', path + '.sha256')
+        os.replace(tmp_path, path)
+    finally:
+        for leftover in (tmp_path, tmp_path + '.sha256'):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+
+
+def load_conformal_grid(scale: float = 1.0, use_cache: bool = True,
+                        cache_dir: Optional[str] = None) -> np.ndarray:
+    """
+    Load the conformal correction data as a flat (N, 2) float64 array.
+    
+    conformal.txt stays the source of truth. The first call parses it, multiplies
+    every entry by scale and stores the result as a binary .npy file in the user
+    cache directory, keyed by a checksum of conformal.txt and the scale. Later
+    calls memory-map that file read-only, so every process on the machine shares
+    one page-cache copy instead of parsing the JSON. If the cache is missing,
+    corrupt or cannot be written the JSON is used directly.
+    
+    Args:
+        scale: Factor applied to every entry
+        use_cache: Set to False to always parse conformal.txt
+        cache_dir: Cache directory, defaults to get_cache_dir()
+        
+    Returns:
+        Array of shape (N, 2), read-only when memory-mapped from the cache
+    """
+    path = None
+    if use_cache:
+        try:
+            path = _cache_path(scale, cache_dir or get_cache_dir())
+        except OSError as e:
+            logger.warning("Could not checksum conformal data: %s", e)
+        if path is not None:
+            grid = _load_cached_grid(path)
+            if grid is not None:
+                logger.debug("Memory-mapped conformal grid from %s", path)
+                return grid
+    
+    grid = np.array(get_conformal_json(), dtype=np.float64).reshape(-1, 2) * scale
+    
+    if path is not None:
+        try:
+            _write_cached_grid(path, grid)
+            logger.debug("Wrote conformal grid cache to %s", path)
+        except OSError as e:
+            logger.debug("Could not write conformal grid cache %s: %s", path, e)
+            return grid
+        cached = _load_cached_grid(path)
+        if cached is not None:
+            return cached
+    return grid
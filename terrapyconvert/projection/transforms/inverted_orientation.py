@@ -1,10 +1,12 @@
 """
 Inverted orientation transformation.
 """
-from ..base.projection_transform import ProjectionTransform
+from ..base.projection_transform import IDENTITY, Affine, ProjectionTransform
 from ..base.geographic_projection import GeographicProjection
 from typing import List, Tuple
 
+import numpy as np
+
 
 class InvertedOrientation(ProjectionTransform):
     """Projection transform that swaps X and Y coordinates."""
@@ -21,6 +23,19 @@ class InvertedOrientation(ProjectionTransform):
         x, y = self.input.from_geo(lon, lat)
         return y, x  # Swap coordinates
     
+    def to_geo_array(self, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized form of to_geo."""
+        return self.input.to_geo_array(x, y)
+    
+    def from_geo_array(self, lon: np.ndarray, lat: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized form of from_geo."""
+        x, y = self.input.from_geo_array(lon, lat)
+        return y, x  # Swap coordinates
+    
+    def affine(self) -> Tuple[Affine, Affine]:
+        """Get the swap as affine maps, to_geo passes coordinates through unchanged."""
+        return (0.0, 1.0, 1.0, 0.0, 0.0, 0.0), IDENTITY
+    
     def bounds(self) -> List[float]:
         """Get bounds with X and Y swapped."""
         bounds = self.input.bounds()
@@ -1,11 +1,13 @@
 """
 Scale projection transformation.
 """
-from ..base.projection_transform import ProjectionTransform
+from ..base.projection_transform import Affine, ProjectionTransform
 from ..base.geographic_projection import GeographicProjection
 from typing import List, Tuple
 import math
 
+import numpy as np
+
 
 class ScaleProjection(ProjectionTransform):
     """Projection that scales coordinates by specified factors."""
@@ -24,6 +26,20 @@ class ScaleProjection(ProjectionTransform):
         x, y = self.input.from_geo(lon, lat)
         return x * self.scale_x, y * self.scale_y
     
+    def to_geo_array(self, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized form of to_geo."""
+        return self.input.to_geo_array(x / self.scale_x, y / self.scale_y)
+    
+    def from_geo_array(self, lon: np.ndarray, lat: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized form of from_geo."""
+        x, y = self.input.from_geo_array(lon, lat)
+        return x * self.scale_x, y * self.scale_y
+    
+    def affine(self) -> Tuple[Affine, Affine]:
+        """Get the scaling as affine maps."""
+        return ((self.scale_x, 0.0, 0.0, self.scale_y, 0.0, 0.0),
+                (1 / self.scale_x, 0.0, 0.0, 1 / self.scale_y, 0.0, 0.0))
+    
     def upright(self) -> bool:
         """Check if projection is upright, accounting for y-scale sign."""
         return not self.input.upright() if self.scale_y < 0 else self.input.upright()
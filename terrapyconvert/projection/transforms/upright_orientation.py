@@ -1,10 +1,12 @@
 """
 Upright orientation transformation.
 """
-from ..base.projection_transform import ProjectionTransform
+from ..base.projection_transform import Affine, ProjectionTransform
 from ..base.geographic_projection import GeographicProjection
 from typing import List, Tuple
 
+import numpy as np
+
 
 class UprightOrientation(ProjectionTransform):
     """Projection transform that flips the Y axis to make projection upright."""
@@ -21,6 +23,20 @@ class UprightOrientation(ProjectionTransform):
         x, y = self.input.from_geo(lon, lat)
         return x, -y
     
+    def to_geo_array(self, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized form of to_geo."""
+        return self.input.to_geo_array(x, -y)
+    
+    def from_geo_array(self, lon: np.ndarray, lat: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized form of from_geo."""
+        x, y = self.input.from_geo_array(lon, lat)
+        return x, -y
+    
+    def affine(self) -> Tuple[Affine, Affine]:
+        """Get the Y flip as affine maps."""
+        flip = (1.0, 0.0, 0.0, -1.0, 0.0, 0.0)
+        return flip, flip
+    
     def upright(self) -> bool:
         """Returns opposite of input projection's upright status."""
         return not self.input.upright()
@@ -2,7 +2,9 @@
 Utility classes for projections.
 """
 from .invertable_vector_field import InvertableVectorField
+from .newton_stats import NewtonStats
 
 __all__ = [
     'InvertableVectorField',
+    'NewtonStats',
 ]
@@ -1,83 +1,290 @@
 """
 Invertable vector field for conformal corrections.
 """
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 import math
 
+import numpy as np
+
+from .newton_stats import NewtonStats
+
 
 class InvertableVectorField:
-    """A vector field that can be inverted using Newton's method."""
+    """
+    A vector field that can be inverted using Newton's method.
+    
+    The field is sampled on a triangular grid with side_length + 1 points per
+    side. Samples are stored packed in one contiguous (N, 2) float64 array with
+    x and y interleaved, row by row along v, so the sample at (u, v) lives at
+    row_offset[v] + u. This is the order of conformal.txt, so the memory-mapped
+    conformal grid can be used directly without copying.
+    """
     
     ROOT3: float = math.sqrt(3)
     
     def __init__(self, vector_x: List[List[float]], vector_y: List[List[float]]):
-        self.side_length: int = len(vector_x) - 1
-        self.vector_x = vector_x
-        self.vector_y = vector_y
+        side_length = len(vector_x) - 1
+        values = np.empty((self.point_count(side_length), 2), dtype=np.float64)
+        offsets = self.row_offsets(side_length)
+        for v in range(side_length + 1):
+            for u in range(side_length + 1 - v):
+                values[offsets[v] + u] = (vector_x[u][v], vector_y[u][v])
+        self._set_values(values, side_length)
+    
+    @classmethod
+    def from_packed(cls, values: np.ndarray, side_length: int) -> 'InvertableVectorField':
+        """
+        Create a field from samples already in the packed layout.
+        
+        Args:
+            values: C-contiguous float64 array of shape (N, 2), may be a read-only memmap
+            side_length: Number of grid cells along each side of the triangle
+        """
+        field = cls.__new__(cls)
+        field._set_values(values, side_length)
+        return field
+    
+    @staticmethod
+    def point_count(side_length: int) -> int:
+        """Get the number of samples in a triangular grid."""
+        return (side_length + 1) * (side_length + 2) // 2
+    
+    @staticmethod
+    def row_offsets(side_length: int) -> List[int]:
+        """Get the index of the first sample of each row v."""
+        offsets = []
+        offset = 0
+        for v in range(side_length + 1):
+            offsets.append(offset)
+            offset += side_length + 1 - v
+        return offsets
+    
+    def _set_values(self, values: np.ndarray, side_length: int) -> None:
+        """Attach the packed samples and precompute the row index."""
+        values = np.ascontiguousarray(values, dtype=np.float64)
+        if values.shape != (self.point_count(side_length), 2):
+            raise ValueError(
+                f'Expected {self.point_count(side_length)} samples of shape (N, 2), got {values.shape}')
+        
+        self.side_length: int = side_length
+        self.values = values
+        
+        # Offsets of each row in the flat interleaved buffer, for the scalar path
+        self._flat = memoryview(values.reshape(-1))
+        offsets = self.row_offsets(side_length)
+        self._flat_offsets = [2 * offset for offset in offsets]
+        self._row_offset_array = np.array(offsets, dtype=np.intp)
+        
+        self._guess_values = None
+    
+    def _piece(self, x: float, y: float) -> int:
+        """Get the id of the linear piece (grid triangle) that get_interpolated_vector uses at x, y."""
+        side_length = self.side_length
+        x *= side_length
+        y *= side_length
+        
+        v = 2 * y / self.ROOT3
+        u = x - v * 0.5
+        
+        u1 = max(0, min(int(u), side_length - 1))
+        v1 = max(0, min(int(v), side_length - u1 - 1))
+        
+        lower = y < -self.ROOT3 * (x - u1 - v1 - 1) or v1 == side_length - u1 - 1
+        return ((u1 * side_length + v1) << 1) | lower
+    
+    def _piece_array(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Vectorized form of _piece."""
+        side_length = self.side_length
+        x = x * side_length
+        y = y * side_length
+        
+        v = 2 * y / self.ROOT3
+        u = x - v * 0.5
+        
+        u1 = np.clip(np.trunc(np.nan_to_num(u)), 0, side_length - 1).astype(np.intp)
+        v1 = np.maximum(0, np.minimum(np.trunc(np.nan_to_num(v)), side_length - u1 - 1)).astype(np.intp)
+        
+        lower = (y < -self.ROOT3 * (x - u1 - v1 - 1)) | (v1 == side_length - u1 - 1)
+        return ((u1 * side_length + v1) << 1) | lower
+    
+    @property
+    def has_inverse_grid(self) -> bool:
+        """Check if build_inverse_grid has been called."""
+        return self._guess_values is not None
+    
+    def build_inverse_grid(self, resolution: int = 128, iterations: int = 30) -> None:
+        """
+        Precompute a coarse lookup grid from field values back to field coordinates.
+        
+        The grid spans the bounding box of the field's values. Each node is solved
+        once with Newton's method; get_initial_guess then interpolates between the
+        nodes, giving Newton a starting point that is usually already on the right
+        linear piece, so the solve finishes in a single step.
+        
+        Args:
+            resolution: Number of nodes along each axis of the lookup grid
+            iterations: Newton iterations used to solve each node
+        """
+        if resolution < 2:
+            raise ValueError(f'Invalid resolution: {resolution} (must be at least 2)')
+        side_length = self.side_length
+        
+        # Field coordinates of every sample, in the packed order
+        v = np.repeat(np.arange(side_length + 1), np.arange(side_length + 1, 0, -1))
+        u = np.arange(len(v)) - self._row_offset_array[v]
+        coords = np.column_stack(((u + 0.5 * v) / side_length, 0.5 * self.ROOT3 * v / side_length))
+        
+        # An affine fit of the field gives every node a reasonable place to start
+        design = np.column_stack((coords, np.ones(len(coords))))
+        affine = np.linalg.lstsq(design, self.values, rcond=None)[0]
+        
+        low = self.values.min(axis=0)
+        high = self.values.max(axis=0)
+        margin = 0.02 * (high - low)
+        low = low - margin
+        high = high + margin
+        
+        f, g = np.meshgrid(np.linspace(low[0], high[0], resolution),
+                           np.linspace(low[1], high[1], resolution), indexing='ij')
+        start = np.linalg.solve(affine[:2].T, np.stack((f.ravel(), g.ravel())) - affine[2][:, np.newaxis])
+        
+        with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+            x_est, y_est = self.apply_newtons_method_array(f.ravel(), g.ravel(), start[0], start[1], iterations)
+        solved = np.isfinite(x_est) & np.isfinite(y_est)
+        x_est = np.where(solved, x_est, start[0])
+        y_est = np.where(solved, y_est, start[1])
+        
+        self._guess_resolution = resolution
+        self._guess_origin = (float(low[0]), float(low[1]))
+        self._guess_scale = (float((resolution - 1) / (high[0] - low[0])),
+                             float((resolution - 1) / (high[1] - low[1])))
+        self._guess_values = np.column_stack((x_est, y_est)).reshape(resolution, resolution, 2)
+        self._guess_flat = memoryview(self._guess_values.reshape(-1))
+    
+    def get_initial_guess(self, expected_f: float, expected_g: float) -> Tuple[float, float]:
+        """Get a starting point for apply_newtons_method from the inverse lookup grid."""
+        resolution = self._guess_resolution
+        flat = self._guess_flat
+        
+        g_x = (expected_f - self._guess_origin[0]) * self._guess_scale[0]
+        g_y = (expected_g - self._guess_origin[1]) * self._guess_scale[1]
+        
+        # Cells at the edge extrapolate linearly
+        i = max(0, min(int(g_x), resolution - 2))
+        j = max(0, min(int(g_y), resolution - 2))
+        t_x = g_x - i
+        t_y = g_y - j
+        
+        base = 2 * (i * resolution + j)
+        above = base + 2 * resolution
+        
+        x_est = ((flat[base] * (1 - t_y) + flat[base + 2] * t_y) * (1 - t_x) +
+                 (flat[above] * (1 - t_y) + flat[above + 2] * t_y) * t_x)
+        y_est = ((flat[base + 1] * (1 - t_y) + flat[base + 3] * t_y) * (1 - t_x) +
+                 (flat[above + 1] * (1 - t_y) + flat[above + 3] * t_y) * t_x)
+        return x_est, y_est
+    
+    def get_initial_guess_array(self, expected_f: np.ndarray,
+                                expected_g: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized form of get_initial_guess."""
+        resolution = self._guess_resolution
+        values = self._guess_values
+        
+        g_x = (np.asarray(expected_f, dtype=np.float64) - self._guess_origin[0]) * self._guess_scale[0]
+        g_y = (np.asarray(expected_g, dtype=np.float64) - self._guess_origin[1]) * self._guess_scale[1]
+        
+        i = np.clip(np.trunc(np.nan_to_num(g_x)), 0, resolution - 2).astype(np.intp)
+        j = np.clip(np.trunc(np.nan_to_num(g_y)), 0, resolution - 2).astype(np.intp)
+        t_x = (g_x - i)[..., np.newaxis]
+        t_y = (g_y - j)[..., np.newaxis]
+        
+        estimate = ((values[i, j] * (1 - t_y) + values[i, j + 1] * t_y) * (1 - t_x) +
+                    (values[i + 1, j] * (1 - t_y) + values[i + 1, j + 1] * t_y) * t_x)
+        return estimate[..., 0], estimate[..., 1]
     
     def get_interpolated_vector(self, x: float, y: float) -> Tuple[float, float, float, float, float, float]:
         """Get interpolated vector and derivatives at given coordinates."""
+        side_length = self.side_length
+        root3 = self.ROOT3
+        flat = self._flat
+        
         # Scale up triangle to be side_length across
-        x *= self.side_length
-        y *= self.side_length
+        x *= side_length
+        y *= side_length
         
         # Convert to triangle units
-        v = 2 * y / self.ROOT3
+        v = 2 * y / root3
         u = x - v * 0.5
         
         # Clamp to valid ranges
-        u1 = max(0, min(int(u), self.side_length - 1))
-        v1 = max(0, min(int(v), self.side_length - u1 - 1))
+        u1 = max(0, min(int(u), side_length - 1))
+        v1 = max(0, min(int(v), side_length - u1 - 1))
+        
+        # Flat indices of (u1, v1) and (u1, v1 + 1); (u1 + 1, v) is always 2 further on
+        row = self._flat_offsets[v1] + 2 * u1
+        next_row = self._flat_offsets[v1 + 1] + 2 * u1
         
         # Determine which triangle we're in and get values
         flip = 1
         
-        if y < -self.ROOT3 * (x - u1 - v1 - 1) or v1 == self.side_length - u1 - 1:
+        if y < -root3 * (x - u1 - v1 - 1) or v1 == side_length - u1 - 1:
             # Lower triangle
-            valx1 = self.vector_x[u1][v1]
-            valy1 = self.vector_y[u1][v1]
-            valx2 = self.vector_x[u1][v1 + 1]
-            valy2 = self.vector_y[u1][v1 + 1]
-            valx3 = self.vector_x[u1 + 1][v1]
-            valy3 = self.vector_y[u1 + 1][v1]
+            valx1 = flat[row]
+            valy1 = flat[row + 1]
+            valx2 = flat[next_row]
+            valy2 = flat[next_row + 1]
+            valx3 = flat[row + 2]
+            valy3 = flat[row + 3]
             
-            y3 = 0.5 * self.ROOT3 * v1
+            y3 = 0.5 * root3 * v1
             x3 = (u1 + 1) + 0.5 * v1
         else:
             # Upper triangle
-            valx1 = self.vector_x[u1][v1 + 1]
-            valy1 = self.vector_y[u1][v1 + 1]
-            valx2 = self.vector_x[u1 + 1][v1]
-            valy2 = self.vector_y[u1 + 1][v1]
-            valx3 = self.vector_x[u1 + 1][v1 + 1]
-            valy3 = self.vector_y[u1 + 1][v1 + 1]
+            valx1 = flat[next_row]
+            valy1 = flat[next_row + 1]
+            valx2 = flat[row + 2]
+            valy2 = flat[row + 3]
+            valx3 = flat[next_row + 2]
+            valy3 = flat[next_row + 3]
             
             flip = -1
             y = -y
             
-            y3 = -(0.5 * self.ROOT3 * (v1 + 1))
+            y3 = -(0.5 * root3 * (v1 + 1))
             x3 = (u1 + 1) + 0.5 * (v1 + 1)
         
         # Calculate barycentric coordinates
-        w1 = -(y - y3) / self.ROOT3 - (x - x3)
-        w2 = 2 * (y - y3) / self.ROOT3
+        w1 = -(y - y3) / root3 - (x - x3)
+        w2 = 2 * (y - y3) / root3
         w3 = 1 - w1 - w2
         
         # Interpolated values and derivatives
         val_x = valx1 * w1 + valx2 * w2 + valx3 * w3
         val_y = valy1 * w1 + valy2 * w2 + valy3 * w3
         
-        dfdx = (valx3 - valx1) * self.side_length
-        dfdy = self.side_length * flip * (2 * valx2 - valx1 - valx3) / self.ROOT3
-        dgdx = (valy3 - valy1) * self.side_length
-        dgdy = self.side_length * flip * (2 * valy2 - valy1 - valy3) / self.ROOT3
+        dfdx = (valx3 - valx1) * side_length
+        dfdy = side_length * flip * (2 * valx2 - valx1 - valx3) / root3
+        dgdx = (valy3 - valy1) * side_length
+        dgdy = side_length * flip * (2 * valy2 - valy1 - valy3) / root3
         
         return val_x, val_y, dfdx, dfdy, dgdx, dgdy
     
-    def apply_newtons_method(self, expected_f: float, expected_g: float, 
-                           x_est: float, y_est: float, iterations: int) -> Tuple[float, float]:
-        """Apply Newton's method to find inverse mapping."""
-        for _ in range(iterations):
+    def apply_newtons_method(self, expected_f: float, expected_g: float,
+                           x_est: float, y_est: float, iterations: int,
+                           tolerance: float = 0.0, stats: Optional[NewtonStats] = None) -> Tuple[float, float]:
+        """
+        Apply Newton's method to find inverse mapping.
+        
+        The field is linear on each grid triangle, so a step that lands on the
+        same triangle it was computed on is exact and ends the solve. Otherwise
+        the solve stops once a step moves the estimate by no more than tolerance
+        in either coordinate, or after iterations steps.
+        """
+        step = 0.0
+        done = 0
+        converged = False
+        piece = self._piece(x_est, y_est)
+        while done < iterations:
             val_x, val_y, dfdx, dfdy, dgdx, dgdy = self.get_interpolated_vector(x_est, y_est)
             
             f = val_x - expected_f
@@ -87,7 +294,138 @@ class InvertableVectorField:
             determinant = 1.0 / (dfdx * dgdy - dfdy * dgdx)
             
             # Update estimates using Newton's method
-            x_est -= determinant * (dgdy * f - dfdy * g)
-            y_est -= determinant * (-dgdx * f + dfdx * g)
+            step_x = determinant * (dgdy * f - dfdy * g)
+            step_y = determinant * (-dgdx * f + dfdx * g)
+            x_est -= step_x
+            y_est -= step_y
+            done += 1
+            
+            step = max(abs(step_x), abs(step_y))
+            if step <= tolerance:
+                converged = True
+                break
+            if not (math.isfinite(x_est) and math.isfinite(y_est)):
+                continue
+            next_piece = self._piece(x_est, y_est)
+            if next_piece == piece:
+                # Exact up to rounding, so nothing is left for another step to correct
+                step = 0.0
+                converged = True
+                break
+            piece = next_piece
+        
+        if stats is not None:
+            stats.record('conformal', done, step, converged)
         
         return x_est, y_est
+    
+    def get_interpolated_vector_array(self, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """Vectorized form of get_interpolated_vector, for many query points per call."""
+        values = self.values
+        side_length = self.side_length
+        
+        # Scale up triangle to be side_length across
+        x = np.asarray(x, dtype=np.float64) * side_length
+        y = np.asarray(y, dtype=np.float64) * side_length
+        
+        # Convert to triangle units
+        v = 2 * y / self.ROOT3
+        u = x - v * 0.5
+        
+        # Clamp to valid ranges
+        u1 = np.clip(np.trunc(np.nan_to_num(u)), 0, side_length - 1).astype(np.intp)
+        v1 = np.maximum(0, np.minimum(np.trunc(np.nan_to_num(v)), side_length - u1 - 1)).astype(np.intp)
+        
+        # Determine which triangle we're in and get values
+        lower = (y < -self.ROOT3 * (x - u1 - v1 - 1)) | (v1 == side_length - u1 - 1)
+        
+        row = self._row_offset_array[v1] + u1
+        next_row = self._row_offset_array[v1 + 1] + u1
+        
+        val1 = values[np.where(lower, row, next_row)]
+        val2 = values[np.where(lower, next_row, row + 1)]
+        val3 = values[np.where(lower, row + 1, next_row + 1)]
+        valx1, valy1 = val1[..., 0], val1[..., 1]
+        valx2, valy2 = val2[..., 0], val2[..., 1]
+        valx3, valy3 = val3[..., 0], val3[..., 1]
+        
+        flip = np.where(lower, 1, -1)
+        y = np.where(lower, y, -y)
+        
+        y3 = np.where(lower, 0.5 * self.ROOT3 * v1, -(0.5 * self.ROOT3 * (v1 + 1)))
+        x3 = np.where(lower, (u1 + 1) + 0.5 * v1, (u1 + 1) + 0.5 * (v1 + 1))
+        
+        # Calculate barycentric coordinates
+        w1 = -(y - y3) / self.ROOT3 - (x - x3)
+        w2 = 2 * (y - y3) / self.ROOT3
+        w3 = 1 - w1 - w2
+        
+        # Interpolated values and derivatives
+        val_x = valx1 * w1 + valx2 * w2 + valx3 * w3
+        val_y = valy1 * w1 + valy2 * w2 + valy3 * w3
+        
+        dfdx = (valx3 - valx1) * side_length
+        dfdy = side_length * flip * (2 * valx2 - valx1 - valx3) / self.ROOT3
+        dgdx = (valy3 - valy1) * side_length
+        dgdy = side_length * flip * (2 * valy2 - valy1 - valy3) / self.ROOT3
+        
+        return val_x, val_y, dfdx, dfdy, dgdx, dgdy
+    
+    def apply_newtons_method_array(self, expected_f: np.ndarray, expected_g: np.ndarray,
+                                   x_est: np.ndarray, y_est: np.ndarray, iterations: int,
+                                   tolerance: float = 0.0,
+                                   stats: Optional[NewtonStats] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized form of apply_newtons_method, for many query points per call.
+        
+        Each point stops iterating under the same rules as the scalar method, and
+        later iterations only evaluate the points still active.
+        """
+        expected_f, expected_g, x_est, y_est = np.broadcast_arrays(
+            expected_f, expected_g, np.asarray(x_est, dtype=np.float64), np.asarray(y_est, dtype=np.float64))
+        shape = x_est.shape
+        expected_f = expected_f.ravel()
+        expected_g = expected_g.ravel()
+        x_est = x_est.astype(np.float64).ravel()
+        y_est = y_est.astype(np.float64).ravel()
+        
+        done = np.zeros(x_est.shape, dtype=np.intp)
+        steps = np.zeros(x_est.shape, dtype=np.float64)
+        converged = np.zeros(x_est.shape, dtype=bool)
+        pieces = self._piece_array(x_est, y_est)
+        active = np.arange(x_est.size)
+        
+        for _ in range(iterations):
+            if active.size == 0:
+                break
+            
+            val_x, val_y, dfdx, dfdy, dgdx, dgdy = self.get_interpolated_vector_array(
+                x_est[active], y_est[active])
+            
+            f = val_x - expected_f[active]
+            g = val_y - expected_g[active]
+            
+            determinant = 1.0 / (dfdx * dgdy - dfdy * dgdx)
+            
+            step_x = determinant * (dgdy * f - dfdy * g)
+            step_y = determinant * (-dgdx * f + dfdx * g)
+            x_est[active] -= step_x
+            y_est[active] -= step_y
+            done[active] += 1
+            
+            step = np.maximum(np.abs(step_x), np.abs(step_y))
+            
+            # Stop on a small step, or on a step that stayed on its linear piece
+            next_pieces = self._piece_array(x_est[active], y_est[active])
+            exact = ((next_pieces == pieces[active]) &
+                     np.isfinite(x_est[active]) & np.isfinite(y_est[active]))
+            finished = (step <= tolerance) | exact
+            steps[active] = np.where(exact, 0.0, step)
+            converged[active] = finished
+            pieces[active] = next_pieces
+            active = active[~finished]
+        
+        if stats is not None:
+            stats.record_array('conformal', done, steps, converged)
+        
+        return x_est.reshape(shape), y_est.reshape(shape)
@@ -0,0 +1,70 @@
+"""
+Counters for the Newton solvers.
+"""
+from typing import Any, Dict
+
+import numpy as np
+
+
+class NewtonStats:
+    """
+    Iteration counters for the projection's Newton solvers.
+    
+    Each solver ('conformal' for the conformal correction inverse and
+    'inverse_triangle' for the Airocean inverse) records how many iterations
+    every solve took, the largest final step size (the residual the tolerance
+    is checked against) and how many solves stopped at the iteration cap
+    without converging.
+    """
+    
+    def __init__(self):
+        self.histograms: Dict[str, Dict[int, int]] = {}
+        self.max_residuals: Dict[str, float] = {}
+        self.capped: Dict[str, int] = {}
+    
+    def record(self, solver: str, iterations: int, residual: float, converged: bool) -> None:
+        """Record one solve."""
+        histogram = self.histograms.setdefault(solver, {})
+        histogram[iterations] = histogram.get(iterations, 0) + 1
+        if not residual <= self.max_residuals.get(solver, 0.0):
+            self.max_residuals[solver] = residual
+        if not converged:
+            self.capped[solver] = self.capped.get(solver, 0) + 1
+    
+    def record_array(self, solver: str, iterations: np.ndarray, residuals: np.ndarray,
+                     converged: np.ndarray) -> None:
+        """Record many solves from the batch path."""
+        if iterations.size == 0:
+            return
+        histogram = self.histograms.setdefault(solver, {})
+        counts = np.bincount(iterations.ravel())
+        for count_iterations in np.flatnonzero(counts).tolist():
+            histogram[count_iterations] = histogram.get(count_iterations, 0) + int(counts[count_iterations])
+        residual = float(np.max(residuals)) if not np.isnan(residuals).any() else float('nan')
+        if not residual <= self.max_residuals.get(solver, 0.0):
+            self.max_residuals[solver] = residual
+        not_converged = int(np.count_nonzero(~converged))
+        if not_converged:
+            self.capped[solver] = self.capped.get(solver, 0) + not_converged
+    
+    def calls(self, solver: str) -> int:
+        """Get the number of solves recorded for a solver."""
+        return sum(self.histograms.get(solver, {}).values())
+    
+    def reset(self) -> None:
+        """Clear all counters."""
+        self.histograms.clear()
+        self.max_residuals.clear()
+        self.capped.clear()
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Get the counters as plain dicts, keyed by solver name."""
+        return {
+            solver: {
+                'calls': self.calls(solver),
+                'histogram': dict(sorted(histogram.items())),
+                'max_residual': self.max_residuals.get(solver, 0.0),
+                'capped': self.capped.get(solver, 0),
+            }
+            for solver, histogram in self.histograms.items()
+        }
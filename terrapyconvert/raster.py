@@ -0,0 +1,136 @@
+"""
+Resampling of georeferenced rasters (heightmaps, imagery) into block space.
+
+The output is produced in fixed-size chunks: reproject_tile gives the
+geographic position of every block of a chunk, and the source raster is
+sampled there. Only the source pixels a chunk needs are read, so sources
+can be memory-mapped files larger than memory.
+"""
+from typing import Optional, Sequence
+
+import numpy as np
+
+from .tiles import reproject_tile
+
+METHODS = ('nearest', 'bilinear')
+
+
+def _sample(data: np.ndarray, lat: np.ndarray, lon: np.ndarray, bounds: Sequence[float], method: str,
+            nodata, dtype: np.dtype) -> np.ndarray:
+    """Sample an equirectangular raster at geographic positions."""
+    west, south, east, north = bounds
+    rows, cols = data.shape[:2]
+    wraps = east - west >= 360.0
+    
+    # Fractional pixel positions, with pixel centres at whole numbers
+    col = (lon - west) % 360.0 / ((east - west) / cols) - 0.5
+    row = (north - lat) / ((north - south) / rows) - 0.5
+    with np.errstate(invalid='ignore'):
+        inside = (row >= -0.5) & (row <= rows - 0.5)
+        if not wraps:
+            inside &= (col >= -0.5) & (col <= cols - 0.5)
+    row = np.where(inside, row, 0.0)
+    col = np.where(inside, col, 0.0)
+    bands = (slice(None),) * (data.ndim - 2)
+    extra = (np.newaxis,) * (data.ndim - 2)
+    
+    if method == 'nearest':
+        r = np.clip(np.floor(row + 0.5).astype(np.intp), 0, rows - 1)
+        c = np.floor(col + 0.5).astype(np.intp)
+        c = c % cols if wraps else np.clip(c, 0, cols - 1)
+        result = np.asarray(data[(r, c) + bands], dtype=dtype)
+        result[~inside] = nodata
+        return result
+    
+    r0 = np.floor(row).astype(np.intp)
+    c0 = np.floor(col).astype(np.intp)
+    fr = (row - r0)[(...,) + extra]
+    fc = (col - c0)[(...,) + extra]
+    r0, r1 = np.clip(r0, 0, rows - 1), np.clip(r0 + 1, 0, rows - 1)
+    if wraps:
+        c0, c1 = c0 % cols, (c0 + 1) % cols
+    else:
+        c0, c1 = np.clip(c0, 0, cols - 1), np.clip(c0 + 1, 0, cols - 1)
+    
+    v00, v01, v10, v11 = (np.asarray(data[(r, c) + bands], dtype=dtype)
+                          for r, c in ((r0, c0), (r0, c1), (r1, c0), (r1, c1)))
+    result = (v00 * (1 - fc) + v01 * fc) * (1 - fr) + (v10 * (1 - fc) + v11 * fc) * fr
+    if nodata is not None and not np.isnan(nodata):
+        # Pixels marked nodata in the source must not be blended into real values
+        missing = (v00 == nodata) | (v01 == nodata) | (v10 == nodata) | (v11 == nodata)
+        result[missing] = nodata
+    result[~inside] = nodata
+    return result
+
+
+def resample_raster(data, bounds: Sequence[float], min_x: int, min_z: int, width: int, height: int,
+                    method: str = 'bilinear', nodata=None, chunk_size: int = 512, tolerance: float = 0.01,
+                    out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Resample an equirectangular raster into a rectangle of blocks.
+    
+    The raster is a regular latitude/longitude grid, such as a DEM or
+    satellite image in EPSG:4326, with rows running from north to south. It
+    may be any array-like supporting NumPy indexing, including np.memmap or
+    np.load(..., mmap_mode='r'); only the pixels that are sampled are read.
+    Extra trailing dimensions, such as colour bands, are carried through.
+    
+    The output is computed chunk_size x chunk_size blocks at a time, so memory
+    use is bounded by the chunk size rather than the output size. Block
+    positions come from reproject_tile with the given tolerance.
+    
+    Args:
+        data: Source raster of shape (rows, cols, ...)
+        bounds: Outer edges of the raster in degrees, (west, south, east, north);
+            a raster spanning 360 degrees of longitude wraps around
+        min_x: Minecraft x coordinate of the first output column
+        min_z: Minecraft z coordinate of the first output row
+        width: Number of output blocks along x
+        height: Number of output blocks along z
+        method: 'nearest' or 'bilinear'
+        nodata: Source value marking missing pixels, also written to blocks outside
+            the raster or off the map; defaults to NaN, or 0 for nearest sampling of
+            integer data
+        chunk_size: Side length of the output chunks, in blocks
+        tolerance: Position tolerance passed to reproject_tile, in blocks
+        out: Optional array of shape (height, width, ...) to write into, such as
+            a memory-mapped file
+    
+    Returns:
+        Array of shape (height, width, ...), with the source dtype for nearest
+        sampling and a floating point dtype for bilinear sampling
+    
+    Raises:
+        ValueError: If the method, bounds, shapes or rectangle are invalid
+    """
+    if method not in METHODS:
+        raise ValueError(f'Invalid method: {method!r} (must be one of {METHODS})')
+    if chunk_size < 1:
+        raise ValueError(f'Invalid chunk_size: {chunk_size} (must be at least 1)')
+    if not hasattr(data, 'shape') or not hasattr(data, 'dtype'):
+        data = np.asarray(data)
+    if len(data.shape) < 2 or data.shape[0] < 1 or data.shape[1] < 1:
+        raise ValueError(f'Invalid raster shape: {data.shape} (must be at least (1, 1))')
+    west, south, east, north = bounds
+    if not (west < east <= west + 360.0 and -90.0 <= south < north <= 90.0):
+        raise ValueError(f'Invalid bounds: {tuple(bounds)} (must be west < east and south < north, in degrees)')
+    
+    dtype = np.dtype(data.dtype)
+    if method == 'bilinear':
+        dtype = np.result_type(dtype, np.float32)
+    if nodata is None:
+        nodata = np.nan if np.issubdtype(dtype, np.floating) else 0
+    
+    shape = (height, width) + tuple(data.shape[2:])
+    if out is None:
+        out = np.empty(shape, dtype=dtype)
+    elif out.shape != shape:
+        raise ValueError(f'Invalid out shape: {out.shape} (expected {shape})')
+    
+    for row in range(0, height, chunk_size):
+        for col in range(0, width, chunk_size):
+            rows, cols = min(chunk_size, height - row), min(chunk_size, width - col)
+            tile = reproject_tile(min_x + col, min_z + row, cols, rows, tolerance)
+            out[row:row + rows, col:col + cols] = _sample(data, tile.lat, tile.lon, (west, south, east, north),
+                                                          method, nodata, dtype)
+    return out
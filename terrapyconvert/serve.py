@@ -0,0 +1,391 @@
+"""
+Local HTTP/JSON conversion server with request micro-batching.
+
+Keeps one warmed projection resident for bots, map viewers and plugins that
+would otherwise start a process per conversion:
+    
+    python -m terrapyconvert.serve --port 8765 --window-ms 2
+
+Endpoints, all answering JSON:
+    
+    GET  /from_geo?lat=48.85&lon=2.29        {"x": ..., "z": ...}
+    GET  /to_geo?x=...&z=...                 {"lat": ..., "lon": ...}
+    POST /from_geo  {"points": [[lat, lon], ...], "errors": "raise"}
+    POST /to_geo    {"points": [[x, z], ...], "errors": "nan"}
+    GET  /stats                              throughput and latency
+    GET  /health
+
+Single conversions that arrive within the batching window are converted
+together in one vectorized call. Points off the map, and invalid points of a
+batch with "errors": "nan", come back as null.
+"""
+import argparse
+import asyncio
+import collections
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from . import _DEFAULT_COLUMNS, _DIRECTIONS, __version__, from_geo_array, to_geo_array, validate_array, warmup
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           413: 'Payload Too Large', 431: 'Request Header Fields Too Large'}
+
+# Latencies kept for the percentiles in /stats
+LATENCY_SAMPLES = 10000
+
+
+class HttpError(Exception):
+    """An error answered with a status code and a JSON message."""
+    
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+async def _read_line(reader: asyncio.StreamReader, status: int, message: str) -> bytes:
+    """Read one line, answering with status if it overruns the reader's buffer limit."""
+    try:
+        return await reader.readline()
+    except ValueError:
+        # readline turns asyncio.LimitOverrunError into ValueError
+        raise HttpError(status, message)
+
+
+def _convert_points(direction: str, a: np.ndarray, b: np.ndarray):
+    """Convert a batch with NaN for invalid pairs, and report which were invalid."""
+    report = validate_array(a, b, direction, errors='report')
+    convert = from_geo_array if direction == 'from_geo' else to_geo_array
+    first, second = convert(a, b, errors='nan')
+    return first, second, report
+
+
+def _json_value(value: float) -> Optional[float]:
+    return None if value != value else value
+
+
+class _Stats:
+    """Request, point and latency counters for /stats."""
+    
+    def __init__(self):
+        self.started = time.monotonic()
+        self.requests: Dict[str, int] = collections.Counter()
+        self.errors = 0
+        self.points = 0
+        self.batches = 0
+        self.batched_points = 0
+        self.latencies: collections.deque = collections.deque(maxlen=LATENCY_SAMPLES)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        uptime = time.monotonic() - self.started
+        latency: Dict[str, Any] = {}
+        if self.latencies:
+            samples = np.array(self.latencies) * 1000
+            p50, p95, p99 = np.percentile(samples, (50, 95, 99)).tolist()
+            latency = {'p50': p50, 'p95': p95, 'p99': p99, 'max': float(samples.max())}
+        return {
+            'uptime_s': uptime,
+            'requests': dict(self.requests),
+            'errors': self.errors,
+            'points': self.points,
+            'points_per_s': self.points / uptime if uptime > 0 else 0.0,
+            'micro_batches': self.batches,
+            'mean_micro_batch': self.batched_points / self.batches if self.batches else 0.0,
+            'latency_ms': latency,
+        }
+
+
+class _MicroBatcher:
+    """Coalesces single conversions of one direction into vectorized batches."""
+    
+    def __init__(self, server: 'ConversionServer', direction: str):
+        self.server = server
+        self.direction = direction
+        self.pending: List[Tuple[float, float, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+    
+    def submit(self, a: float, b: float) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending.append((a, b, future))
+        if len(self.pending) >= self.server.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.server.window, self._flush)
+        return future
+    
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self.pending = self.pending, []
+        if pending:
+            self.server._track(asyncio.ensure_future(self._convert(pending)))
+    
+    async def _convert(self, pending: List[Tuple[float, float, asyncio.Future]]) -> None:
+        a = np.array([item[0] for item in pending], dtype=np.float64)
+        b = np.array([item[1] for item in pending], dtype=np.float64)
+        stats = self.server._stats
+        stats.batches += 1
+        stats.batched_points += len(pending)
+        try:
+            first, second, report = await self.server._run(_convert_points, self.direction, a, b)
+        except Exception as e:
+            for _, _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        errors = dict(zip(report.invalid.tolist(), report.messages))
+        for i, (x, y) in enumerate(zip(first.tolist(), second.tolist())):
+            future = pending[i][2]
+            if future.done():
+                continue
+            if i in errors:
+                future.set_exception(HttpError(400, errors[i]))
+            else:
+                future.set_result((x, y))
+
+
+class ConversionServer:
+    """
+    An asyncio HTTP server answering conversion requests from one resident projection.
+    
+    Single GET conversions are queued per direction and converted together
+    once window seconds have passed since the first of them, or as soon as
+    max_batch are waiting. Conversions run on one worker thread, so the event
+    loop keeps accepting requests meanwhile.
+    
+    Use it from a running event loop:
+        
+        server = ConversionServer(port=0)
+        await server.start()
+        print(server.port)
+        await server.serve_forever()
+    """
+    
+    def __init__(self, host: str = '127.0.0.1', port: int = 8765, window: float = 0.002,
+                 max_batch: int = 1024, max_body: int = 16 * 1024 * 1024):
+        if window < 0:
+            raise ValueError(f'Invalid window: {window} (must not be negative)')
+        if max_batch < 1:
+            raise ValueError(f'Invalid max_batch: {max_batch} (must be at least 1)')
+        self.host = host
+        self.window = window
+        self.max_batch = max_batch
+        self.max_body = max_body
+        self._port = port
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._batchers = {direction: _MicroBatcher(self, direction) for direction in _DIRECTIONS}
+        self._tasks: set = set()
+        self._stats = _Stats()
+    
+    @property
+    def port(self) -> int:
+        """The bound port, useful after starting on port 0."""
+        if self._server is not None and self._server.sockets:
+            return self._server.sockets[0].getsockname()[1]
+        return self._port
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get the /stats counters as a dict."""
+        return self._stats.snapshot()
+    
+    def _track(self, task: asyncio.Future) -> None:
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def _run(self, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+    
+    async def start(self) -> None:
+        """Load the projection and start listening."""
+        await self._run(warmup)
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self._port)
+    
+    async def serve_forever(self) -> None:
+        """Serve until cancelled."""
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+    
+    async def close(self) -> None:
+        """Stop listening and shut down the worker thread."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for task in list(self._tasks):
+            await task
+        self._executor.shutdown()
+    
+    async def __aenter__(self) -> 'ConversionServer':
+        await self.start()
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+    
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HttpError as e:
+                    writer.write(self._response(e.status, {'error': str(e)}, False))
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                method, target, keep_alive, body = request
+                
+                start = time.perf_counter()
+                try:
+                    status, payload = 200, await self._dispatch(method, target, body)
+                except HttpError as e:
+                    status, payload = e.status, {'error': str(e)}
+                    self._stats.errors += 1
+                self._stats.latencies.append(time.perf_counter() - start)
+                
+                writer.write(self._response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+    
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[Tuple[str, str, bool, bytes]]:
+        """Read one request, None when the client closed the connection."""
+        line = await _read_line(reader, 400, 'Request line too long')
+        if not line.strip():
+            return None
+        try:
+            method, target, version = line.decode('latin-1').split()
+        except ValueError:
+            raise HttpError(400, 'Malformed request line')
+        
+        headers = {}
+        while True:
+            line = await _read_line(reader, 431, 'Header line too long')
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            raise HttpError(400, 'Invalid Content-Length')
+        if length > self.max_body:
+            raise HttpError(413, f'Body of {length} bytes exceeds the limit of {self.max_body}')
+        body = await reader.readexactly(length) if length > 0 else b''
+        
+        connection = headers.get('connection', '').lower()
+        keep_alive = connection == 'keep-alive' if version == 'HTTP/1.0' else connection != 'close'
+        return method, target, keep_alive, body
+    
+    def _response(self, status: int, payload: Dict[str, Any], keep_alive: bool) -> bytes:
+        body = json.dumps(payload).encode()
+        head = (f'HTTP/1.1 {status} {REASONS.get(status, "")}\r\n'
+                f'Content-Type: application/json\r\n'
+                f'Content-Length: {len(body)}\r\n'
+                f'Connection: {"keep-alive" if keep_alive else "close"}\r\n\r\n')
+        return head.encode('latin-1') + body
+    
+    async def _dispatch(self, method: str, target: str, body: bytes) -> Dict[str, Any]:
+        url = urlsplit(target)
+        path = url.path.rstrip('/') or '/'
+        name = path.lstrip('/')
+        self._stats.requests[f'{method} {path}'] += 1
+        
+        if path in ('/stats', '/health'):
+            if method != 'GET':
+                raise HttpError(405, f'{path} only supports GET')
+            return self.stats() if path == '/stats' else {'status': 'ok', 'version': __version__}
+        if name not in _DIRECTIONS:
+            raise HttpError(404, f'Unknown path: {path}')
+        if method == 'GET':
+            return await self._convert_single(name, parse_qs(url.query))
+        if method == 'POST':
+            return await self._convert_batch(name, body)
+        raise HttpError(405, f'{path} only supports GET and POST')
+    
+    async def _convert_single(self, direction: str, query: Dict[str, List[str]]) -> Dict[str, Any]:
+        (a_name, b_name), (first_name, second_name) = _DEFAULT_COLUMNS[direction]
+        values = []
+        for name in (a_name, b_name):
+            try:
+                values.append(float(query[name][0]))
+            except (KeyError, ValueError):
+                raise HttpError(400, f'Query parameter {name!r} must be a number')
+        
+        first, second = await self._batchers[direction].submit(*values)
+        self._stats.points += 1
+        return {first_name: _json_value(first), second_name: _json_value(second)}
+    
+    async def _convert_batch(self, direction: str, body: bytes) -> Dict[str, Any]:
+        try:
+            request = json.loads(body)
+            points = np.array(request['points'], dtype=np.float64).reshape(-1, 2)
+            if len(points) != len(request['points']):
+                raise ValueError
+        except (ValueError, TypeError, KeyError):
+            raise HttpError(400, 'Body must be a JSON object with "points": [[a, b], ...]')
+        errors = request.get('errors', 'raise')
+        if errors not in ('raise', 'nan'):
+            raise HttpError(400, f'Invalid errors: {errors!r} (must be "raise" or "nan")')
+        
+        first, second, report = await self._run(_convert_points, direction, points[:, 0], points[:, 1])
+        if errors == 'raise' and len(report.invalid):
+            raise HttpError(400, f'Point {int(report.invalid[0])}: {report.messages[0]}')
+        self._stats.points += len(points)
+        
+        result = np.column_stack((first, second))
+        pairs = result.tolist()
+        if np.isnan(result).any():
+            pairs = [[_json_value(a), _json_value(b)] for a, b in pairs]
+        return {'points': pairs}
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the conversion server until interrupted."""
+    parser = argparse.ArgumentParser(prog='python -m terrapyconvert.serve',
+                                     description='Serve coordinate conversions over local HTTP/JSON.')
+    parser.add_argument('--host', default='127.0.0.1', help='address to bind (default 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='port to bind (default 8765)')
+    parser.add_argument('--window-ms', type=float, default=2.0,
+                        help='how long single conversions wait to be batched together (default 2)')
+    parser.add_argument('--max-batch', type=int, default=1024,
+                        help='largest micro-batch of single conversions (default 1024)')
+    args = parser.parse_args(argv)
+    if args.window_ms < 0:
+        parser.error('--window-ms must not be negative')
+    if args.max_batch < 1:
+        parser.error('--max-batch must be at least 1')
+    
+    async def serve() -> None:
+        server = ConversionServer(args.host, args.port, args.window_ms / 1000, args.max_batch)
+        await server.start()
+        print(f'Serving on http://{args.host}:{server.port}', file=sys.stderr)
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+    
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
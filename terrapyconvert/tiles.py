@@ -0,0 +1,180 @@
+"""
+Geographic coordinates of every block in a rectangle of the map.
+
+The exact projection only runs on a coarse lattice and on check points; the
+blocks in between are filled in by bilinear interpolation, and cells are
+split wherever the interpolation is not accurate enough.
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+from . import _get_projection, _validate_minecraft_coordinates
+
+# Cells are filled in batches of about this many blocks to bound memory
+_FILL_BATCH = 1 << 20
+
+# Positions of the check points in a cell of size 2, (dx, dz) from its corner:
+# the centre and the midpoints of the top, bottom, left and right edges
+_CHECK_OFFSETS = np.array([[1, 1], [1, 0], [1, 2], [0, 1], [2, 1]])
+
+
+class TileGrid(NamedTuple):
+    """Geographic coordinates of the blocks of a tile."""
+    lat: np.ndarray
+    lon: np.ndarray
+    max_error: float
+    evaluations: int
+
+
+def _wrap_near(lon: np.ndarray, reference: np.ndarray) -> np.ndarray:
+    """Shift longitudes by whole turns to within 180 degrees of a reference."""
+    return reference + (lon - reference + 180.0) % 360.0 - 180.0
+
+
+def _error_blocks(error_lat: np.ndarray, error_lon: np.ndarray, lat_u: np.ndarray, lon_u: np.ndarray,
+                  lat_v: np.ndarray, lon_v: np.ndarray) -> np.ndarray:
+    """Convert errors in degrees to blocks through the Jacobian (per block) of each cell."""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        det = lat_u * lon_v - lat_v * lon_u
+        error_u = (lon_v * error_lat - lat_v * error_lon) / det
+        error_v = (lat_u * error_lon - lon_u * error_lat) / det
+    return np.hypot(error_u, error_v)
+
+
+def _fill(out_lat: np.ndarray, out_lon: np.ndarray, row: np.ndarray, col: np.ndarray, size: int,
+          corners: np.ndarray) -> None:
+    """Fill the blocks of square cells by bilinear interpolation of their corners."""
+    lat00, lon00, lat10, lon10, lat01, lon01, lat11, lon11 = corners
+    lon10, lon01, lon11 = (_wrap_near(lon, lon00) for lon in (lon10, lon01, lon11))
+    u = (np.arange(size) / size)[np.newaxis, np.newaxis, :]
+    v = (np.arange(size) / size)[np.newaxis, :, np.newaxis]
+    
+    # Cells of one size are aligned to multiples of it, so the outputs can be
+    # viewed as a grid of cells and written cell by cell
+    cell_row, cell_col = row // size, col // size
+    height, width = out_lat.shape
+    batch_size = max(1, _FILL_BATCH // (size * size))
+    for start in range(0, len(row), batch_size):
+        batch = slice(start, start + batch_size)
+        for out, a, b, c, d in ((out_lat, lat00, lat10, lat01, lat11), (out_lon, lon00, lon10, lon01, lon11)):
+            a, b, c, d = (value[batch, np.newaxis, np.newaxis] for value in (a, b, c, d))
+            left = a + (c - a) * v
+            values = left + (b + (d - b) * v - left) * u
+            if out is out_lon:
+                wrapped = np.abs(values) > 180.0
+                if wrapped.any():
+                    values[wrapped] = _wrap_near(values[wrapped], 0.0)
+            cells = out.reshape(height // size, size, width // size, size)
+            cells[cell_row[batch], :, cell_col[batch], :] = values
+
+
+def reproject_tile(min_x: int, min_z: int, width: int, height: int, tolerance: float = 0.01,
+                   cell: int = 16) -> TileGrid:
+    """
+    Get the geographic coordinates of every block in a rectangle of the map.
+    
+    The exact projection is evaluated on a lattice of cell x cell blocks.
+    Each cell is checked at its centre and edge midpoints, and filled by
+    bilinear interpolation of its corners if the interpolated and exact
+    positions there agree to within tolerance blocks. Other cells, such as
+    ones a face seam or the edge of the map runs through, are split in four,
+    down to single blocks which are exact. A 512x512 region takes a few
+    thousand exact conversions instead of 262144.
+    
+    Cells with all corners and check points off the map are left NaN. The
+    returned max_error is the largest error measured at the check points of
+    interpolated cells, in blocks.
+    
+    Args:
+        min_x: Minecraft x coordinate of the first column
+        min_z: Minecraft z coordinate of the first row
+        width: Number of blocks along x
+        height: Number of blocks along z
+        tolerance: Largest allowed interpolation error at the check points, in blocks
+        cell: Lattice spacing in blocks, a power of two
+    
+    Returns:
+        TileGrid with (height, width) lat and lon arrays for the blocks
+        (min_x + column, min_z + row), the measured max_error and the number
+        of exact conversions
+    
+    Raises:
+        ValueError: If the rectangle, tolerance or cell size is invalid
+    """
+    if width < 1 or height < 1:
+        raise ValueError(f'Invalid tile size: {width}x{height} (must be at least 1x1)')
+    if cell < 1 or cell & (cell - 1):
+        raise ValueError(f'Invalid cell: {cell} (must be a power of two)')
+    if not tolerance > 0:
+        raise ValueError(f'Invalid tolerance: {tolerance} (must be positive)')
+    _validate_minecraft_coordinates(min_x, min_z)
+    _validate_minecraft_coordinates(min_x + width - 1, min_z + height - 1)
+    
+    projection = _get_projection()
+    cells_x, cells_z = -(-width // cell), -(-height // cell)
+    out_lat = np.full((cells_z * cell, cells_x * cell), np.nan)
+    out_lon = np.full((cells_z * cell, cells_x * cell), np.nan)
+    
+    lattice_lat, lattice_lon = projection.to_geo_array(
+        min_x + cell * np.arange(cells_x + 1.0)[np.newaxis, :],
+        min_z + cell * np.arange(cells_z + 1.0)[:, np.newaxis])
+    evaluations = lattice_lat.size
+    
+    # Each cell is its offset in the tile and the exact positions of its corners
+    row, col = (index.ravel() for index in np.indices((cells_z, cells_x)))
+    corners = np.array([lattice_lat[row, col], lattice_lon[row, col],
+                        lattice_lat[row, col + 1], lattice_lon[row, col + 1],
+                        lattice_lat[row + 1, col], lattice_lon[row + 1, col],
+                        lattice_lat[row + 1, col + 1], lattice_lon[row + 1, col + 1]])
+    row, col = row * cell, col * cell
+    
+    max_error = 0.0
+    size = cell
+    while len(row) and size > 1:
+        half = size // 2
+        check_lat, check_lon = projection.to_geo_array(
+            min_x + col[:, np.newaxis] + half * _CHECK_OFFSETS[:, 0],
+            min_z + row[:, np.newaxis] + half * _CHECK_OFFSETS[:, 1])
+        evaluations += check_lat.size
+        
+        lat00, lon00, lat10, lon10, lat01, lon01, lat11, lon11 = corners
+        lon10, lon01, lon11 = (_wrap_near(lon, lon00) for lon in (lon10, lon01, lon11))
+        interpolated_lat = np.column_stack(((lat00 + lat10 + lat01 + lat11) / 4, (lat00 + lat10) / 2,
+                                            (lat01 + lat11) / 2, (lat00 + lat01) / 2, (lat10 + lat11) / 2))
+        interpolated_lon = np.column_stack(((lon00 + lon10 + lon01 + lon11) / 4, (lon00 + lon10) / 2,
+                                            (lon01 + lon11) / 2, (lon00 + lon01) / 2, (lon10 + lon11) / 2))
+        error = _error_blocks(interpolated_lat - check_lat,
+                              interpolated_lon - _wrap_near(check_lon, interpolated_lon),
+                              ((lat10 - lat00) / size)[:, np.newaxis], ((lon10 - lon00) / size)[:, np.newaxis],
+                              ((lat01 - lat00) / size)[:, np.newaxis], ((lon01 - lon00) / size)[:, np.newaxis])
+        error = error.max(axis=1)
+        
+        accurate = error <= tolerance
+        off_map = np.isnan(corners).all(axis=0) & np.isnan(check_lat).all(axis=1)
+        if accurate.any():
+            max_error = max(max_error, float(error[accurate].max()))
+            _fill(out_lat, out_lon, row[accurate], col[accurate], size, corners[:, accurate])
+        
+        # Split the rest in four, the check points are the new corners
+        split = ~accurate & ~off_map
+        c_lat, c_lon = check_lat[split], check_lon[split]
+        lat00, lon00, lat10, lon10, lat01, lon01, lat11, lon11 = corners[:, split]
+        centre = (c_lat[:, 0], c_lon[:, 0])
+        top, bottom = (c_lat[:, 1], c_lon[:, 1]), (c_lat[:, 2], c_lon[:, 2])
+        left, right = (c_lat[:, 3], c_lon[:, 3]), (c_lat[:, 4], c_lon[:, 4])
+        corners = np.concatenate([
+            np.array([lat00, lon00, *top, *left, *centre]),
+            np.array([*top, lat10, lon10, *centre, *right]),
+            np.array([*left, *centre, lat01, lon01, *bottom]),
+            np.array([*centre, *right, *bottom, lat11, lon11]),
+        ], axis=1)
+        row, col = row[split], col[split]
+        row = np.concatenate((row, row, row + half, row + half))
+        col = np.concatenate((col, col + half, col, col + half))
+        size = half
+    
+    # Cells split down to single blocks take their exact corner
+    out_lat[row, col] = corners[0]
+    out_lon[row, col] = corners[1]
+    return TileGrid(out_lat[:height, :width], out_lon[:height, :width], max_error, evaluations)
@@ -0,0 +1,71 @@
+"""
+Test the pandas and GeoPandas bte accessors.
+"""
+import numpy as np
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+import terrapyconvert.accessor  # noqa: F401  registers the accessors
+from terrapyconvert import convert_geometry, from_geo_array, to_geo_array
+
+
+def test_frame_round_trip():
+    """Columns convert through the batch path and keep the index."""
+    frame = pd.DataFrame({"name": ["a", "b"], "lat": [10.0, -5.0], "lon": [20, 80]}, index=[7, 3])
+    result = frame.bte.to_minecraft()
+    assert list(result.columns) == ["name", "lat", "lon", "x", "z"]
+    assert list(result.index) == [7, 3]
+    assert "x" not in frame.columns
+    
+    xs, zs = from_geo_array([10, -5], [20, 80])
+    assert np.array_equal(result["x"].to_numpy(), xs)
+    assert np.array_equal(result["z"].to_numpy(), zs)
+    
+    back = result.bte.to_geo(lat="lat_back", lon="lon_back")
+    lats, lons = to_geo_array(xs, zs)
+    assert np.array_equal(back["lat_back"].to_numpy(), lats)
+
+
+def test_frame_inplace_and_missing_values():
+    """inplace writes into the frame, and missing values follow errors."""
+    frame = pd.DataFrame({"mc_x": [3412228.818833647, None], "mc_z": [-380303.8789656482, 0.0]})
+    with pytest.raises(ValueError, match="x coordinate"):
+        frame.bte.to_geo(x="mc_x", z="mc_z")
+    
+    assert frame.bte.to_geo(x="mc_x", z="mc_z", errors="nan", inplace=True) is None
+    assert frame["lat"].iloc[0] == pytest.approx(10.0, abs=1e-9)
+    assert np.isnan(frame["lat"].iloc[1])
+    
+    with pytest.raises(ValueError, match="column"):
+        frame.bte.to_minecraft(lat="latitude")
+
+
+def test_accessor_only_on_geoseries():
+    """Plain Series have no bte accessor."""
+    assert not hasattr(pd.Series([1.0]), "bte")
+
+
+def test_geoseries_round_trip():
+    """GeoSeries geometries match convert_geometry, keeping missing and empty ones."""
+    gpd = pytest.importorskip("geopandas")
+    from shapely.geometry import LineString, Point, mapping
+    
+    line = LineString([(2.0, 48.0), (2.5, 48.5)])
+    series = gpd.GeoSeries([line, None, Point(20, 10), Point()], index=list("abcd"), crs=4326)
+    blocks = series.bte.to_minecraft()
+    assert blocks.crs is None
+    assert list(blocks.index) == list("abcd")
+    assert blocks.iloc[1] is None and blocks.iloc[3].is_empty
+    assert mapping(blocks.iloc[0])["coordinates"] == tuple(
+        tuple(position) for position in convert_geometry(mapping(line))["coordinates"])
+    
+    back = blocks.bte.to_geo()
+    assert back.crs.to_epsg() == 4326
+    assert back.iloc[2].distance(Point(20, 10)) < 1e-9
+    
+    off_map = gpd.GeoSeries([Point(2.4e7, 1.4e7), Point(3412228.818833647, -380303.8789656482)]).bte.to_geo()
+    assert off_map.iloc[0] is None and off_map.iloc[1].distance(Point(20, 10)) < 1e-9
+    
+    with pytest.raises(ValueError, match="CRS"):
+        series.to_crs(3857).bte.to_minecraft()
@@ -0,0 +1,142 @@
+"""
+Test the asyncio conversion API.
+"""
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from terrapyconvert import configure_newton, from_geo_array, to_geo_array
+from terrapyconvert.aio import aconvert_iter, afrom_geo_many, ato_geo_many
+
+
+def _points(count=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.column_stack([rng.uniform(-89, 89, count), rng.uniform(-180, 180, count)])
+
+
+async def _collect(pairs, **options):
+    return np.concatenate([chunk async for chunk in aconvert_iter(pairs, **options)])
+
+
+class _CountingExecutor(ThreadPoolExecutor):
+    def __init__(self):
+        super().__init__(1)
+        self.submitted = 0
+    
+    def submit(self, *args, **kwargs):
+        self.submitted += 1
+        return super().submit(*args, **kwargs)
+
+
+def test_afrom_geo_many_matches_batch_path():
+    points = _points()
+    result = asyncio.run(afrom_geo_many(points, chunksize=300))
+    
+    xs, zs = from_geo_array(points[:, 0], points[:, 1])
+    np.testing.assert_array_equal(result[:, 0], xs)
+    np.testing.assert_array_equal(result[:, 1], zs)
+    
+    back = asyncio.run(ato_geo_many(result, chunksize=300))
+    lats, lons = to_geo_array(result[:, 0], result[:, 1])
+    np.testing.assert_array_equal(back[:, 0], lats)
+    np.testing.assert_array_equal(back[:, 1], lons)
+
+
+def test_loop_keeps_running_during_conversion():
+    """Other tasks run while chunks are converted."""
+    async def main():
+        ticks = 0
+        
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+        
+        task = asyncio.ensure_future(ticker())
+        await afrom_geo_many(_points(20000), chunksize=1000)
+        task.cancel()
+        return ticks
+    
+    assert asyncio.run(main()) > 20
+
+
+def test_process_executor():
+    points = _points(200)
+    
+    async def main():
+        with ProcessPoolExecutor(1) as executor:
+            return await afrom_geo_many(points, chunksize=100, executor=executor)
+    
+    xs, _ = from_geo_array(points[:, 0], points[:, 1])
+    np.testing.assert_array_equal(asyncio.run(main())[:, 0], xs)
+
+
+def test_process_executor_uses_configured_settings():
+    points = _points(200)
+    
+    async def main():
+        # A spawned worker starts from a fresh projection instead of a forked copy
+        with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context('spawn')) as executor:
+            return await afrom_geo_many(points, chunksize=100, executor=executor)
+    
+    configure_newton(tolerance=0.0, max_iterations=1)
+    try:
+        result = asyncio.run(main())
+        xs, _ = from_geo_array(points[:, 0], points[:, 1])
+    finally:
+        configure_newton(tolerance=1e-12, max_iterations=5)
+    np.testing.assert_array_equal(result[:, 0], xs)
+
+
+def test_aconvert_iter_applies_backpressure():
+    """The source is only read as far as the consumer and max_pending allow."""
+    points = _points(1000)
+    read = 0
+    
+    async def source():
+        nonlocal read
+        for pair in points:
+            read += 1
+            yield tuple(pair)
+    
+    async def main():
+        chunks = aconvert_iter(source(), chunksize=100, max_pending=2)
+        first = await chunks.__anext__()
+        read_at_first = read
+        rest = [chunk async for chunk in chunks]
+        return first, read_at_first, np.concatenate([first] + rest)
+    
+    first, read_at_first, result = asyncio.run(main())
+    assert first.shape == (100, 2)
+    assert read_at_first == 200
+    xs, zs = from_geo_array(points[:, 0], points[:, 1])
+    np.testing.assert_array_equal(result[:, 0], xs)
+    np.testing.assert_array_equal(result[:, 1], zs)
+
+
+def test_cancellation_stops_submitting_chunks():
+    executor = _CountingExecutor()
+    
+    async def main():
+        task = asyncio.ensure_future(afrom_geo_many(_points(5000), chunksize=10, executor=executor))
+        while executor.submitted < 3:
+            await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    
+    asyncio.run(main())
+    executor.shutdown()
+    assert executor.submitted < 500
+
+
+def test_errors():
+    with pytest.raises(ValueError, match="latitude"):
+        asyncio.run(afrom_geo_many([[0, 0], [95, 0]], chunksize=1))
+    result = asyncio.run(_collect([(0, 0), (95, 0)], errors='nan'))
+    assert np.isnan(result[1]).all() and not np.isnan(result[0]).any()
+    with pytest.raises(ValueError, match="max_pending"):
+        asyncio.run(afrom_geo_many([[0, 0]], max_pending=0))
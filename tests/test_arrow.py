@@ -0,0 +1,83 @@
+"""
+Test the Arrow and Parquet columnar conversion path.
+"""
+import numpy as np
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from terrapyconvert import from_geo_array, to_geo_array
+from terrapyconvert.arrow import convert_arrays, convert_parquet, convert_table
+
+
+def _table(count=1000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pa.table({
+        "id": np.arange(count),
+        "lat": np.degrees(np.arcsin(rng.uniform(-1, 1, count))),
+        "lon": rng.uniform(-180, 180, count),
+    })
+
+
+def test_table_matches_batch_path():
+    """Appended columns equal from_geo_array on the same values, across chunks."""
+    table = pa.concat_tables([_table(300, seed=1), _table(200, seed=2)])
+    result = convert_table(table)
+    assert result.column_names == ["id", "lat", "lon", "x", "z"]
+    
+    xs, zs = from_geo_array(table["lat"].to_numpy(), table["lon"].to_numpy())
+    assert np.array_equal(result["x"].to_numpy(), xs)
+    assert np.array_equal(result["z"].to_numpy(), zs)
+
+
+def test_to_geo_replaces_columns_and_nulls_off_map():
+    """Existing output columns are replaced, and points off the map become null."""
+    table = pa.table({"x": [3412228.818833647, 24000000.0], "z": [-380303.8789656482, 14000000.0],
+                      "lat": ["old", "old"]})
+    result = convert_table(table, "to_geo")
+    assert result.column_names == ["x", "z", "lat", "lon"]
+    assert result["lat"].to_pylist()[1] is None
+    assert result["lat"][0].as_py() == pytest.approx(10.0, abs=1e-9)
+
+
+def test_nulls_and_casts():
+    """Integer columns are cast, and nulls are invalid inputs."""
+    lat = pa.array([10, None, -5], pa.int32())
+    lon = pa.array([20.0, 0.0, 80.0], pa.float32())
+    with pytest.raises(ValueError, match="latitude"):
+        convert_arrays(lat, lon)
+    
+    x, z = convert_arrays(lat, lon, errors="nan")
+    xs, zs = from_geo_array([10, -5], [20, 80])
+    assert x.to_pylist() == [xs[0], None, xs[1]]
+    assert z.null_count == 1
+
+
+def test_parquet_row_groups(tmp_path):
+    """The Parquet converter keeps every row group and row."""
+    table = _table(1000)
+    pq.write_table(table, tmp_path / "in.parquet", row_group_size=256)
+    
+    rows = convert_parquet(tmp_path / "in.parquet", tmp_path / "mc.parquet", compression="zstd")
+    assert rows == 1000
+    assert pq.ParquetFile(tmp_path / "mc.parquet").num_row_groups == 4
+    
+    convert_parquet(tmp_path / "mc.parquet", tmp_path / "back.parquet", "to_geo",
+                    out_columns=("lat_back", "lon_back"))
+    result = pq.read_table(tmp_path / "back.parquet")
+    lats, lons = to_geo_array(*from_geo_array(table["lat"].to_numpy(), table["lon"].to_numpy()))
+    assert np.array_equal(result["lat_back"].to_numpy(), lats)
+    assert np.array_equal(result["id"].to_numpy(), np.arange(1000))
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"direction": "sideways"},
+    {"columns": ("lat", "missing")},
+    {"columns": ("id", "name")},
+])
+def test_invalid_input(kwargs):
+    """Bad directions and columns raise ValueError."""
+    table = _table(10).append_column("name", pa.array(["a"] * 10))
+    with pytest.raises(ValueError):
+        convert_table(table, **kwargs)
@@ -0,0 +1,121 @@
+"""
+Test the vectorized batch conversion path against the scalar path.
+"""
+import math
+
+import numpy as np
+import pytest
+from terrapyconvert import ValidationReport, from_geo, to_geo, from_geo_array, to_geo_array, validate_array
+from terrapyconvert.projection import ModifiedAirocean
+
+
+def _global_sample(count=5000, seed=0):
+    """Uniformly distributed points on the sphere plus the poles and date line."""
+    rng = np.random.default_rng(seed)
+    lats = np.degrees(np.arcsin(rng.uniform(-1, 1, count)))
+    lons = rng.uniform(-180, 180, count)
+    lats = np.concatenate([lats, [90, -90, 0, 0, 65.5345, -5]])
+    lons = np.concatenate([lons, [0, 0, 180, -180, 5.534643, 80]])
+    return lats, lons
+
+
+@pytest.fixture(scope="module")
+def projection():
+    return ModifiedAirocean()
+
+
+def test_projection_from_geo_array_matches_scalar(projection):
+    """The vectorized projection matches the scalar projection to 1e-9."""
+    lats, lons = _global_sample()
+    xs, ys = projection.from_geo_array(lons, lats)
+    
+    for lon, lat, x, y in zip(lons.tolist(), lats.tolist(), xs.tolist(), ys.tolist()):
+        expected_x, expected_y = projection.from_geo(lon, lat)
+        assert x == pytest.approx(expected_x, abs=1e-9)
+        assert y == pytest.approx(expected_y, abs=1e-9)
+
+
+def test_projection_to_geo_array_matches_scalar(projection):
+    """The vectorized inverse matches the scalar inverse, including out of bounds points."""
+    rng = np.random.default_rng(1)
+    xs = rng.uniform(-4, 4, 5000)
+    ys = rng.uniform(-4, 4, 5000)
+    lats, lons = projection.to_geo_array(xs, ys)
+    
+    for x, y, lat, lon in zip(xs.tolist(), ys.tolist(), lats.tolist(), lons.tolist()):
+        expected_lat, expected_lon = projection.to_geo(x, y)
+        if math.isnan(expected_lat):
+            assert math.isnan(lat) and math.isnan(lon)
+        else:
+            assert lat == pytest.approx(expected_lat, abs=1e-9)
+            assert lon == pytest.approx(expected_lon, abs=1e-9)
+
+
+def test_public_array_api_matches_scalar():
+    """from_geo_array and to_geo_array agree with from_geo and to_geo."""
+    lats, lons = _global_sample(1000, seed=2)
+    xs, zs = from_geo_array(lats, lons)
+    back_lats, back_lons = to_geo_array(xs, zs)
+    
+    for i in range(len(lats)):
+        x, z = from_geo(lats[i], lons[i])
+        assert xs[i] == pytest.approx(x, rel=1e-12, abs=1e-9)
+        assert zs[i] == pytest.approx(z, rel=1e-12, abs=1e-9)
+        
+        lat, lon = to_geo(x, z)
+        assert back_lats[i] == pytest.approx(lat, abs=1e-9)
+        assert back_lons[i] == pytest.approx(lon, abs=1e-9)
+
+
+def test_array_api_shapes():
+    """Inputs broadcast and keep their shape."""
+    xs, zs = from_geo_array([[10, -5], [65.5345, 0]], 20)
+    assert xs.shape == (2, 2) and zs.shape == (2, 2)
+    assert xs[0, 0] == pytest.approx(3412228.818833647, abs=1e-6)
+    
+    lats, lons = to_geo_array(np.array([]), np.array([]))
+    assert lats.shape == (0,) and lons.shape == (0,)
+
+
+def test_array_api_validation():
+    """Invalid coordinates raise ValueError like the scalar API."""
+    with pytest.raises(ValueError, match="latitude"):
+        from_geo_array([10, 91], [20, 20])
+    with pytest.raises(ValueError, match="longitude"):
+        from_geo_array([10, 10], [20, float("nan")])
+    with pytest.raises(ValueError, match="z coordinate"):
+        to_geo_array([0, 0], [0, 2e7])
+
+
+def test_errors_nan_masks_invalid_pairs():
+    """With errors='nan' invalid pairs become NaN and the others are converted as usual."""
+    lats = np.array([10, 91, float("nan"), -5])
+    lons = np.array([20, 0, 0, 80])
+    xs, zs = from_geo_array(lats, lons, errors="nan")
+    assert np.array_equal(np.isnan(xs), [False, True, True, False])
+    assert (xs[0], zs[0]) == from_geo(10, 20)
+    assert (xs[3], zs[3]) == from_geo(-5, 80)
+    
+    back_lats, _ = to_geo_array([xs[0], 3e7, 24000000], [zs[0], 0, 14000000], errors="nan")
+    assert np.array_equal(np.isnan(back_lats), [False, True, True])
+    
+    with pytest.raises(ValueError):
+        from_geo_array(lats, lons, errors="ignore")
+
+
+def test_validate_array_modes():
+    """validate_array returns a mask, a report with the scalar messages, or raises."""
+    xs, zs = [0, 3e7, float("nan"), 1e6], [0, 0, 0, -2e7]
+    assert np.array_equal(validate_array(xs, zs, "to_geo"), [True, False, False, False])
+    
+    report = validate_array(xs, zs, "to_geo", errors="report")
+    assert isinstance(report, ValidationReport)
+    assert report.invalid.tolist() == [1, 2, 3]
+    assert "x coordinate" in report.messages[0] and "nan" in report.messages[1]
+    assert "z coordinate" in report.messages[2]
+    
+    with pytest.raises(ValueError, match="latitude: 91"):
+        validate_array([10, 91, 92], 0, errors="raise")
+    assert validate_array([[10, 20]], 0, errors="raise").shape == (1, 2)
+    with pytest.raises(ValueError):
+        validate_array(0, 0, "sideways")
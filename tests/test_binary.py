@@ -0,0 +1,91 @@
+"""
+Test the memory-mapped binary file converter.
+"""
+import mmap
+
+import numpy as np
+import pytest
+from terrapyconvert import from_geo_array, to_geo_array
+from terrapyconvert.binary import convert_file
+
+
+def _points(count=50000, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.degrees(np.arcsin(rng.uniform(-1, 1, count))), rng.uniform(-180, 180, count)
+
+
+def test_interleaved_from_geo(tmp_path):
+    """Interleaved float64 pairs convert exactly like the batch path."""
+    lats, lons = _points()
+    np.column_stack((lats, lons)).astype("<f8").tofile(tmp_path / "in.bin")
+    
+    chunks = []
+    converted = convert_file(tmp_path / "in.bin", tmp_path / "out.bin", chunk_points=5000,
+                             progress=lambda chunk, done: chunks.append((chunk, done)))
+    assert converted == 50000
+    # Chunks are rounded up to whole pages
+    assert chunks[0][1] >= 5000 and chunks[0][1] * 8 % mmap.ALLOCATIONGRANULARITY == 0
+    assert chunks[-1] == (len(chunks) - 1, 50000)
+    
+    result = np.fromfile(tmp_path / "out.bin", "<f8").reshape(-1, 2)
+    xs, zs = from_geo_array(lats, lons)
+    assert np.array_equal(result[:, 0], xs)
+    assert np.array_equal(result[:, 1], zs)
+
+
+def test_planar_float32_to_geo(tmp_path):
+    """Planar float32 files keep their layout, with NaN off the map."""
+    xs, zs = from_geo_array(*_points(3000))
+    xs[5], zs[5] = 24000000, 14000000
+    np.concatenate((xs, zs)).astype("<f4").tofile(tmp_path / "in.bin")
+    
+    convert_file(tmp_path / "in.bin", tmp_path / "out.bin", "to_geo", dtype="<f4", layout="planar",
+                 chunk_points=1000)
+    result = np.fromfile(tmp_path / "out.bin", "<f4").reshape(2, -1)
+    lats, lons = to_geo_array(xs.astype("<f4"), zs.astype("<f4"))
+    assert np.array_equal(result[0], lats.astype("<f4"), equal_nan=True)
+    assert np.array_equal(result[1], lons.astype("<f4"), equal_nan=True)
+    assert np.isnan(result[0, 5])
+
+
+def test_resume_after_interruption(tmp_path):
+    """Resuming from the next chunk gives the same file as one uninterrupted run."""
+    lats, lons = _points(30000, seed=1)
+    np.column_stack((lats, lons)).tofile(tmp_path / "in.bin")
+    convert_file(tmp_path / "in.bin", tmp_path / "full.bin", chunk_points=4096)
+    
+    done = []
+    
+    def interrupt(chunk, points):
+        done.append((chunk, points))
+        if chunk == 2:
+            raise KeyboardInterrupt
+    
+    with pytest.raises(KeyboardInterrupt):
+        convert_file(tmp_path / "in.bin", tmp_path / "out.bin", chunk_points=4096, progress=interrupt)
+    chunk, points = done[-1]
+    converted = convert_file(tmp_path / "in.bin", tmp_path / "out.bin", chunk_points=4096, start_chunk=chunk + 1)
+    assert converted == 30000 - points
+    assert (tmp_path / "out.bin").read_bytes() == (tmp_path / "full.bin").read_bytes()
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"dtype": "<i4"},
+    {"layout": "columns"},
+    {"chunk_points": 0},
+    {"direction": "sideways"},
+    {"start_chunk": 1},
+])
+def test_invalid_input(tmp_path, kwargs):
+    """Bad options, and resuming into a missing or mismatched output, raise ValueError."""
+    np.zeros(8).tofile(tmp_path / "in.bin")
+    (tmp_path / "out.bin").write_bytes(b"")
+    with pytest.raises(ValueError):
+        convert_file(tmp_path / "in.bin", tmp_path / "out.bin", **kwargs)
+
+
+def test_partial_pair(tmp_path):
+    """A file that ends inside a pair is rejected."""
+    np.zeros(3).tofile(tmp_path / "in.bin")
+    with pytest.raises(ValueError, match="file size"):
+        convert_file(tmp_path / "in.bin", tmp_path / "out.bin")
@@ -0,0 +1,128 @@
+"""
+Test the LRU and chunk-local conversion caches.
+"""
+import math
+import threading
+
+import numpy as np
+import pytest
+import terrapyconvert
+from terrapyconvert import CachedConverter, CacheInfo
+from terrapyconvert.cache import CHUNK_CHECK_BLOCKS, CHUNK_SIZE, _fit_chunk
+
+
+def test_exact_results_and_counters():
+    """Cached results equal the uncached ones, and hits and misses are counted."""
+    cache = CachedConverter(maxsize=8)
+    assert cache.from_geo(10, 20) == terrapyconvert.from_geo(10, 20)
+    assert cache.from_geo(10, 20) == terrapyconvert.from_geo(10, 20)
+    assert cache.to_geo(3412228, -380303) == terrapyconvert.to_geo(3412228, -380303)
+    assert cache.to_geo(3412228.0, -380303.0) == terrapyconvert.to_geo(3412228, -380303)
+    assert cache.cache_info() == CacheInfo(hits=2, misses=2, evictions=0, maxsize=8, currsize=2)
+    
+    # Keys are exact, a nearby block is a separate entry
+    cache.to_geo(3412229, -380303)
+    assert cache.cache_info().misses == 3
+    
+    cache.clear()
+    assert cache.cache_info() == CacheInfo(0, 0, 0, 8, 0)
+
+
+def test_lru_eviction():
+    """The least recently used entry is evicted first."""
+    cache = CachedConverter(maxsize=2)
+    cache.to_geo(0, 0)
+    cache.to_geo(16, 0)
+    cache.to_geo(0, 0)
+    cache.to_geo(32, 0)
+    info = cache.cache_info()
+    assert info.evictions == 1
+    assert info.currsize == 2
+    
+    cache.to_geo(0, 0)
+    assert cache.cache_info().hits == 2
+    cache.to_geo(16, 0)
+    assert cache.cache_info().misses == 4
+
+
+def test_chunk_local_error_bound():
+    """On a random sample, chunk-local to_geo stays within CHUNK_CHECK_BLOCKS of the exact result."""
+    rng = np.random.default_rng(3)
+    cache = CachedConverter(chunk_local=True)
+    for _ in range(40):
+        lat, lon = rng.uniform(-60, 60), rng.uniform(-170, 170)
+        x0, z0 = terrapyconvert.from_geo(lat, lon)
+        if math.isnan(x0):
+            continue
+        for x, z in rng.uniform(0, 2 * CHUNK_SIZE, (20, 2)) + (x0, z0):
+            lat_c, lon_c = cache.to_geo(x, z)
+            x_back, z_back = terrapyconvert.from_geo(lat_c, lon_c)
+            x_exact, z_exact = terrapyconvert.from_geo(*terrapyconvert.to_geo(x, z))
+            assert math.hypot(x_back - x_exact, z_back - z_exact) <= CHUNK_CHECK_BLOCKS
+    
+    # One entry serves a whole chunk
+    info = cache.cache_info()
+    assert info.hits > info.misses
+
+
+def test_chunk_local_corners_and_off_map():
+    """Chunk corners are exact, and chunks off the map give NaN."""
+    cache = CachedConverter(chunk_local=True)
+    assert cache.to_geo(3412224, -380304) == terrapyconvert.to_geo(3412224, -380304)
+    assert all(math.isnan(value) for value in cache.to_geo(24000000, 14000000))
+
+
+def test_chunk_across_face_edge_is_converted_exactly():
+    """A chunk that straddles an edge between faces 7 and 8 fails its fit and falls back to to_geo."""
+    chunk_x, chunk_z = 414539, -438556
+    corners = [(chunk_x * CHUNK_SIZE + u, chunk_z * CHUNK_SIZE + v) for u in (1, 15) for v in (1, 15)]
+    assert set(terrapyconvert.face_ids(*zip(*corners), 'to_geo').tolist()) == {7, 8}
+    assert _fit_chunk(chunk_x, chunk_z) is None
+    
+    cache = CachedConverter(chunk_local=True)
+    for x, z in corners:
+        assert cache.to_geo(x, z) == terrapyconvert.to_geo(x, z)
+    assert cache.cache_info().currsize == len(corners) + 1
+
+
+def test_chunk_local_counts_each_call_once():
+    """A chunk that fails its fit counts one lookup per call, through its exact entry."""
+    cache = CachedConverter(chunk_local=True)
+    cache.to_geo(24000000, 14000000)
+    assert cache.cache_info() == CacheInfo(hits=0, misses=1, evictions=0, maxsize=65536, currsize=2)
+    cache.to_geo(24000000, 14000000)
+    cache.to_geo(24000001, 14000000)
+    assert cache.cache_info() == CacheInfo(hits=1, misses=2, evictions=0, maxsize=65536, currsize=3)
+    
+    cache.to_geo(3412228, -380303)
+    cache.to_geo(3412229, -380303)
+    assert cache.cache_info()[:2] == (2, 3)
+
+
+def test_thread_safety():
+    """Concurrent lookups keep the counters consistent."""
+    cache = CachedConverter(maxsize=64, chunk_local=True)
+    
+    def work(seed):
+        rng = np.random.default_rng(seed)
+        for x, z in rng.integers(0, 2000, (200, 2)):
+            cache.to_geo(3412228 + int(x), -380303 + int(z))
+    
+    threads = [threading.Thread(target=work, args=(seed,)) for seed in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    info = cache.cache_info()
+    assert info.hits + info.misses == 800
+    assert info.currsize <= 64
+
+
+def test_invalid_input():
+    """Bad sizes and coordinates raise ValueError."""
+    with pytest.raises(ValueError):
+        CachedConverter(maxsize=0)
+    with pytest.raises(ValueError):
+        CachedConverter().from_geo(95, 0)
+    with pytest.raises(ValueError):
+        CachedConverter(chunk_local=True).to_geo(30000000, 0)
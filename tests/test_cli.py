@@ -0,0 +1,98 @@
+"""
+Test the terrapyconvert command-line tool.
+"""
+import csv
+import json
+
+import pytest
+from terrapyconvert import from_geo
+from terrapyconvert.cli import main
+
+
+def test_csv_from_geo_appends_columns(tmp_path):
+    source = tmp_path / "in.csv"
+    target = tmp_path / "out.csv"
+    source.write_text("name,lat,lon\nparis,48.856667,2.350987\ntest,10,20\n")
+    
+    assert main(["from-geo", str(source), "-o", str(target), "--chunk-size", "1"]) == 0
+    
+    rows = list(csv.DictReader(target.open()))
+    assert [row["name"] for row in rows] == ["paris", "test"]
+    x, z = from_geo(10, 20)
+    assert float(rows[1]["x"]) == x
+    assert float(rows[1]["z"]) == z
+
+
+def test_tsv_custom_columns_and_precision(tmp_path, capsys):
+    source = tmp_path / "in.tsv"
+    source.write_text("mc_x\tmc_z\n3412228.818833647\t-380303.8789656482\n")
+    
+    assert main(["to-geo", str(source), "--in-columns", "mc_x", "mc_z",
+                 "--out-columns", "latitude", "longitude", "-p", "4"]) == 0
+    
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].split("\t") == ["mc_x", "mc_z", "latitude", "longitude"]
+    assert lines[1].split("\t")[2:] == ["10.0000", "20.0000"]
+
+
+@pytest.mark.parametrize("policy, expected", [("keep", [None, 10.0]), ("drop", [10.0])])
+def test_ndjson_out_of_bounds_policies(tmp_path, capsys, policy, expected):
+    source = tmp_path / "in.ndjson"
+    source.write_text('{"x": 24000000, "z": 14000000}\n{"x": 3412228.818833647, "z": -380303.8789656482}\n')
+    
+    assert main(["to-geo", str(source), "--on-out-of-bounds", policy, "-p", "6"]) == 0
+    
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [record["lat"] for record in records] == expected
+
+
+def test_errors_exit_with_status_one(tmp_path, capsys):
+    source = tmp_path / "in.ndjson"
+    source.write_text('{"x": 24000000, "z": 14000000}\n')
+    assert main(["to-geo", str(source), "--on-out-of-bounds", "error"]) == 1
+    assert "line 1" in capsys.readouterr().err
+    
+    source = tmp_path / "in.csv"
+    source.write_text("lat,lon\nnorth,0\n")
+    assert main(["from-geo", str(source)]) == 1
+    assert "line 2" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("policy, expected", [("keep", ["paris", "bad", "test"]), ("drop", ["paris", "test"])])
+def test_invalid_rows_policies(tmp_path, policy, expected):
+    source = tmp_path / "in.csv"
+    target = tmp_path / "out.csv"
+    source.write_text("name,lat,lon\nparis,48.856667,2.350987\nbad,95,north\ntest,10,20\n")
+    
+    assert main(["from-geo", str(source), "-o", str(target), "--on-invalid", policy]) == 0
+    
+    rows = list(csv.DictReader(target.open()))
+    assert [row["name"] for row in rows] == expected
+    assert rows[-1]["x"] == repr(from_geo(10, 20)[0])
+    if policy == "keep":
+        assert rows[1]["x"] == rows[1]["z"] == ""
+
+
+def test_invalid_row_error_names_line(tmp_path, capsys):
+    source = tmp_path / "in.ndjson"
+    source.write_text('{"lat": 10, "lon": 20}\n\n{"lat": 10, "lon": 200}\n')
+    assert main(["from-geo", str(source), "-f", "ndjson"]) == 1
+    assert "line 3: Invalid longitude" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("policy, expected", [("keep", 3), ("drop", 1)])
+def test_ndjson_non_object_lines(tmp_path, capsys, policy, expected):
+    """JSON values that are not objects follow the invalid-row policy."""
+    source = tmp_path / "in.ndjson"
+    source.write_text('[1, 2]\n"x"\n{"lat": 10, "lon": 20}\n')
+    
+    assert main(["from-geo", str(source), "--on-invalid", policy]) == 0
+    
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert len(records) == expected
+    assert records[-1]["x"] == from_geo(10, 20)[0]
+    if policy == "keep":
+        assert records[:2] == [[1, 2], "x"]
+    
+    assert main(["from-geo", str(source)]) == 1
+    assert "line 1: expected a JSON object" in capsys.readouterr().err
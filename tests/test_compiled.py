@@ -0,0 +1,90 @@
+"""
+Test compiling projection transform chains into a single affine step.
+"""
+import numpy as np
+import pytest
+import terrapyconvert
+from terrapyconvert.projection import (
+    CompiledProjection,
+    InvertedOrientation,
+    ModifiedAirocean,
+    ProjectionTransform,
+    ScaleProjection,
+    UprightOrientation,
+)
+
+
+class _Shift(ProjectionTransform):
+    """A transform compile cannot fold."""
+    
+    def to_geo(self, x, y):
+        return self.input.to_geo(x - 1, y)
+    
+    def from_geo(self, lon, lat):
+        x, y = self.input.from_geo(lon, lat)
+        return x + 1, y
+
+
+@pytest.fixture(scope="module")
+def projection():
+    return ModifiedAirocean()
+
+
+def _sample(count=500, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(-180, 180, count), np.degrees(np.arcsin(rng.uniform(-1, 1, count)))
+
+
+@pytest.mark.parametrize("build", [
+    lambda base: ScaleProjection(UprightOrientation(base), 7318261.522857145, 7318261.522857145),
+    lambda base: ScaleProjection(InvertedOrientation(UprightOrientation(base)), 2.0, -3.0),
+    lambda base: UprightOrientation(ScaleProjection(ScaleProjection(base, 5.0, 7.0), 0.5, 0.25)),
+])
+def test_compiled_chain_matches_nested(projection, build):
+    """A compiled chain gives the nested chain's results, scalar and batch."""
+    nested = build(projection)
+    compiled = nested.compile()
+    assert isinstance(compiled, CompiledProjection)
+    assert compiled.input is projection
+    
+    lons, lats = _sample()
+    for lon, lat in zip(lons.tolist(), lats.tolist()):
+        x, y = nested.from_geo(lon, lat)
+        assert compiled.from_geo(lon, lat) == pytest.approx((x, y), rel=1e-15, abs=1e-9, nan_ok=True)
+        assert compiled.to_geo(x, y) == pytest.approx(nested.to_geo(x, y), rel=1e-12, abs=1e-12, nan_ok=True)
+    
+    xs, ys = nested.from_geo_array(lons, lats)
+    np.testing.assert_allclose(compiled.from_geo_array(lons, lats), (xs, ys), rtol=1e-15)
+    np.testing.assert_allclose(compiled.to_geo_array(xs, ys), nested.to_geo_array(xs, ys), rtol=1e-12)
+    
+    assert compiled.upright() == nested.upright()
+    assert compiled.bounds() == nested.bounds()
+    assert compiled.meters_per_unit() == nested.meters_per_unit()
+    assert compiled.compile() is compiled
+
+
+def test_default_chain_is_bit_identical(projection):
+    """The default pipeline's single scale and flip fold without changing from_geo results."""
+    nested = ScaleProjection(UprightOrientation(projection), 7318261.522857145, 7318261.522857145)
+    compiled = nested.compile()
+    lons, lats = _sample(seed=1)
+    for lon, lat in zip(lons.tolist(), lats.tolist()):
+        assert compiled.from_geo(lon, lat) == nested.from_geo(lon, lat)
+
+
+def test_compile_stops_at_non_affine_transforms(projection):
+    """Transforms without an affine form are kept, and only the chain above them is folded."""
+    shift = _Shift(projection)
+    assert shift.compile() is shift
+    assert projection.compile() is projection
+    
+    nested = ScaleProjection(UprightOrientation(shift), 3.0, 3.0)
+    compiled = nested.compile()
+    assert compiled.input is shift
+    assert compiled.from_geo(20.0, 10.0) == pytest.approx(nested.from_geo(20.0, 10.0), rel=1e-15)
+
+
+def test_public_api_uses_compiled_chain():
+    """The shared pipeline is compiled and still reaches the ModifiedAirocean."""
+    assert isinstance(terrapyconvert._get_projection(), CompiledProjection)
+    assert isinstance(terrapyconvert._base_projection(), ModifiedAirocean)
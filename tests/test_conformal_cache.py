@@ -0,0 +1,41 @@
+"""
+Test the binary conformal grid cache.
+"""
+import os
+
+import numpy as np
+from terrapyconvert.projection.data import get_conformal_json, load_conformal_grid
+
+
+def test_cache_is_written_and_memory_mapped(tmp_path):
+    """The first load writes the cache, later loads memory-map it."""
+    scale = 0.5
+    expected = np.array(get_conformal_json(), dtype=np.float64) * scale
+    
+    first = load_conformal_grid(scale, cache_dir=str(tmp_path))
+    assert any(name.endswith(".npy") for name in os.listdir(tmp_path))
+    
+    second = load_conformal_grid(scale, cache_dir=str(tmp_path))
+    assert isinstance(second, np.memmap)
+    assert not second.flags.writeable
+    np.testing.assert_array_equal(first, expected)
+    np.testing.assert_array_equal(second, expected)
+
+
+def test_corrupt_cache_falls_back_to_json(tmp_path):
+    """A cache file that fails its checksum is ignored and rebuilt."""
+    load_conformal_grid(cache_dir=str(tmp_path))
+    cache_file = next(tmp_path.glob("*.npy"))
+    data = bytearray(cache_file.read_bytes())
+    data[-1] ^= 0xFF
+    cache_file.write_bytes(bytes(data))
+    
+    grid = load_conformal_grid(cache_dir=str(tmp_path))
+    np.testing.assert_array_equal(grid, np.array(get_conformal_json(), dtype=np.float64))
+
+
+def test_cache_can_be_disabled(tmp_path):
+    """use_cache=False parses the JSON and writes nothing."""
+    grid = load_conformal_grid(use_cache=False, cache_dir=str(tmp_path))
+    assert grid.shape == (33153, 2)
+    assert os.listdir(tmp_path) == []
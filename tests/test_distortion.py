@@ -0,0 +1,78 @@
+"""
+Test the analytic Jacobian of the projection chain and the distortion API.
+"""
+import numpy as np
+import pytest
+from terrapyconvert import distortion_array, from_geo, from_geo_array
+from terrapyconvert.distortion import EARTH_RADIUS
+from terrapyconvert.projection import ModifiedAirocean, ScaleProjection, UprightOrientation
+
+
+def _global_sample(count=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(-85, 85, count), rng.uniform(-179, 179, count)
+
+
+def _finite_difference(lats, lons, step=1e-7):
+    """Derivatives of from_geo_array per meter toward east and north."""
+    x, z = from_geo_array(lats, lons)
+    x_e, z_e = from_geo_array(lats, lons + np.degrees(step) / np.cos(np.radians(lats)))
+    x_n, z_n = from_geo_array(lats + np.degrees(step), lons)
+    meters = step * EARTH_RADIUS
+    return np.stack([
+        np.stack([(x_e - x) / meters, (x_n - x) / meters], axis=-1),
+        np.stack([(z_e - z) / meters, (z_n - z) / meters], axis=-1),
+    ], axis=-2)
+
+
+def test_jacobian_matches_finite_differences():
+    lats, lons = _global_sample()
+    jacobian = distortion_array(lats, lons).jacobian
+    expected = _finite_difference(lats, lons)
+    
+    error = np.abs(jacobian - expected).max(axis=(-2, -1)) / np.abs(jacobian).max(axis=(-2, -1))
+    # Points right on a face edge or a kink of the conformal field differ more
+    assert np.median(error) < 1e-6
+    assert np.mean(error < 1e-4) > 0.99
+
+
+def test_projection_chain_jacobian():
+    """Every layer keeps from_geo_array's values and passes the Jacobian through."""
+    lats, lons = _global_sample(500, seed=1)
+    base = ModifiedAirocean()
+    for projection in (base, UprightOrientation(base), ScaleProjection(UprightOrientation(base), 2.0, 3.0)):
+        x, y, jacobian = projection.from_geo_jacobian_array(lons, lats)
+        expected_x, expected_y = projection.from_geo_array(lons, lats)
+        np.testing.assert_array_equal(x, expected_x)
+        np.testing.assert_array_equal(y, expected_y)
+        assert jacobian.shape == (500, 2, 2)
+    
+    _, _, scaled = ScaleProjection(base, 2.0, 3.0).from_geo_jacobian_array(lons, lats)
+    _, _, unscaled = base.from_geo_jacobian_array(lons, lats)
+    np.testing.assert_allclose(scaled[:, 0], 2.0 * unscaled[:, 0])
+    np.testing.assert_allclose(scaled[:, 1], 3.0 * unscaled[:, 1])
+
+
+def test_distortion_fields():
+    d = distortion_array([[51.5, 40.7]], [[-0.12, -74.0]])
+    assert d.jacobian.shape == (1, 2, 2, 2)
+    assert d.max_scale.shape == (1, 2)
+    assert (d.max_scale >= d.min_scale).all()
+    np.testing.assert_allclose(d.meters_per_block, 1 / np.sqrt(d.max_scale * d.min_scale))
+    # The projection is close to conformal
+    assert (d.angular_distortion < 1).all()
+    
+    # Convergence is the direction a step north takes on the map
+    x0, z0 = from_geo(51.5, -0.12)
+    x1, z1 = from_geo(51.5001, -0.12)
+    assert d.convergence[0, 0] == pytest.approx(np.degrees(np.arctan2(x1 - x0, z0 - z1)), abs=1e-3)
+    assert np.linalg.svd(d.jacobian[0, 0], compute_uv=False) == pytest.approx([d.max_scale[0, 0],
+                                                                              d.min_scale[0, 0]])
+
+
+def test_distortion_errors():
+    with pytest.raises(ValueError, match="latitude"):
+        distortion_array([95], [0])
+    d = distortion_array([0, 95], [0, 0], errors='nan')
+    assert np.isfinite(d.meters_per_block[0]) and np.isnan(d.meters_per_block[1])
+    assert np.isnan(d.jacobian[1]).all()
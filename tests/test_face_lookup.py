@@ -0,0 +1,76 @@
+"""
+Test the bucket-indexed face lookup against the linear centroid scan.
+"""
+import itertools
+
+import numpy as np
+import pytest
+from terrapyconvert.projection import ModifiedAirocean
+
+
+@pytest.fixture(scope="module")
+def projection():
+    return ModifiedAirocean()
+
+
+def _unit_vectors(lats, lons):
+    phi = np.radians(90 - lats)
+    lam = np.radians(lons)
+    return np.sin(phi) * np.cos(lam), np.sin(phi) * np.sin(lam), np.cos(phi)
+
+
+def _boundary_points(projection):
+    """Points equidistant from two centroids, icosahedron vertices and cube edges and corners."""
+    centroid = projection._centroid_array
+    points = [centroid[a] + centroid[b] for a, b in itertools.combinations(range(20), 2)]
+    points += [centroid[a] + centroid[b] + centroid[c] for a, b, c in itertools.combinations(range(20), 3)]
+    points += [np.array(p, dtype=float) for p in itertools.product((-1, 0, 1), repeat=3) if any(p)]
+    points = np.array(points)
+    points /= np.linalg.norm(points, axis=1, keepdims=True)
+    
+    # Nudge every point a little in many directions to land on both sides of the boundaries
+    rng = np.random.default_rng(0)
+    nudged = points[:, np.newaxis, :] + rng.normal(scale=1e-6, size=(len(points), 20, 3))
+    points = np.concatenate([points, nudged.reshape(-1, 3)])
+    return points[:, 0], points[:, 1], points[:, 2]
+
+
+def test_dense_global_sample_matches_scan(projection):
+    """The indexed lookup picks the same face as the scan on a 0.25 degree global grid."""
+    lons = np.linspace(-180, 180, 1441)
+    for lats in np.array_split(np.linspace(-90, 90, 721), 8):
+        grid_lats, grid_lons = np.meshgrid(lats, lons, indexing="ij")
+        x, y, z = _unit_vectors(grid_lats.ravel(), grid_lons.ravel())
+        np.testing.assert_array_equal(projection._find_triangle_array(x, y, z),
+                                      projection._find_triangle_scan_array(x, y, z))
+
+
+def test_boundary_points_match_scan(projection):
+    """Points on and around face and cell boundaries resolve like the scan, in both paths."""
+    x, y, z = _boundary_points(projection)
+    faces = projection._find_triangle_array(x, y, z)
+    np.testing.assert_array_equal(faces, projection._find_triangle_scan_array(x, y, z))
+    
+    for i in range(len(x)):
+        point = (float(x[i]), float(y[i]), float(z[i]))
+        assert projection._find_triangle(*point) == projection._find_triangle_scan(*point) == faces[i]
+
+
+def test_scalar_lookup_matches_scan(projection):
+    """The scalar lookup agrees with the scalar scan on a 1 degree global grid."""
+    lats, lons = np.meshgrid(np.linspace(-90, 90, 181), np.linspace(-180, 180, 361), indexing="ij")
+    x, y, z = _unit_vectors(lats.ravel(), lons.ravel())
+    for point in zip(x.tolist(), y.tolist(), z.tolist()):
+        assert projection._find_triangle(*point) == projection._find_triangle_scan(*point)
+
+
+def test_degenerate_points_fall_back_to_scan(projection):
+    """Zero, infinite and NaN inputs behave exactly like the scan."""
+    points = [(0.0, 0.0, 0.0), (float("nan"), 0.5, 0.5), (0.5, float("nan"), 0.1),
+              (float("inf"), 0.0, 0.0), (float("inf"), float("inf"), 1.0), (3.0, -2.0, 0.5)]
+    for point in points:
+        assert projection._find_triangle(*point) == projection._find_triangle_scan(*point)
+    
+    x, y, z = (np.array(column) for column in zip(*points))
+    np.testing.assert_array_equal(projection._find_triangle_array(x, y, z),
+                                  projection._find_triangle_scan_array(x, y, z))
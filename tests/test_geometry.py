@@ -0,0 +1,141 @@
+"""
+Test geometry-aware conversion of GeoJSON-like shapes.
+"""
+import numpy as np
+import pytest
+import terrapyconvert
+from terrapyconvert import convert_geometry
+
+
+def _polyline_distance(points, line):
+    """Get the distance from each point to the nearest edge of a polyline."""
+    a, b = line[:-1], line[1:]
+    ab = b - a
+    ap = points[:, np.newaxis, :] - a[np.newaxis]
+    t = np.clip(np.einsum('ijk,jk->ij', ap, ab) / np.einsum('jk,jk->j', ab, ab), 0, 1)
+    return np.hypot(*(ap - t[..., np.newaxis] * ab).transpose(2, 0, 1)).min(axis=1)
+
+
+def test_point_matches_from_geo():
+    """A Point converts exactly like from_geo, in GeoJSON order."""
+    result = convert_geometry({'type': 'Point', 'coordinates': [20.0, 10.0, 123.0]})
+    assert result['type'] == 'Point'
+    assert result['coordinates'] == list(terrapyconvert.from_geo(10.0, 20.0))
+
+
+def test_line_follows_curve_within_tolerance():
+    """Densified lines stay within the tolerance of the true converted curve."""
+    rng = np.random.default_rng(5)
+    for _ in range(5):
+        start = np.array([rng.uniform(-170, 170), rng.uniform(-60, 60)])
+        end = start + rng.uniform(-4, 4, 2)
+        result = convert_geometry({'type': 'LineString', 'coordinates': [start.tolist(), end.tolist()]})
+        lines = result['coordinates'] if result['type'] == 'MultiLineString' else [result['coordinates']]
+        
+        fractions = np.linspace(0, 1, 1001)[:, np.newaxis]
+        lon, lat = (start + fractions * (end - start)).T
+        truth = np.column_stack(terrapyconvert.from_geo_array(lat, lon))
+        distance = np.min([_polyline_distance(truth, np.array(line)) for line in lines], axis=0)
+        assert distance.max() <= 0.5
+        
+        assert lines[0][0] == list(terrapyconvert.from_geo(start[1], start[0]))
+        assert lines[-1][-1] == list(terrapyconvert.from_geo(end[1], end[0]))
+
+
+def test_larger_tolerance_gives_fewer_vertices():
+    """Long edges are not split at a fixed length whatever the tolerance."""
+    start, end = np.array([-100.0, 40.0]), np.array([-90.0, 40.0])
+    coordinates = [start.tolist(), end.tolist(), [-80, 35]]
+    fine = convert_geometry({'type': 'LineString', 'coordinates': coordinates})
+    coarse = convert_geometry({'type': 'LineString', 'coordinates': coordinates}, tolerance=1000)
+    assert len(coarse['coordinates']) * 10 < len(fine['coordinates'])
+    
+    fractions = np.linspace(0, 1, 2001)[:, np.newaxis]
+    lon, lat = (start + fractions * (end - start)).T
+    truth = np.column_stack(terrapyconvert.from_geo_array(lat, lon))
+    assert _polyline_distance(truth, np.array(coarse['coordinates'])).max() <= 1000
+
+
+def test_line_across_map_cut_is_split():
+    """A line over the Bering Strait interruption becomes a MultiLineString."""
+    result = convert_geometry({'type': 'LineString', 'coordinates': [[170, 60], [-170, 62]]})
+    assert result['type'] == 'MultiLineString'
+    assert len(result['coordinates']) == 2
+    first, second = (np.array(line) for line in result['coordinates'])
+    assert np.hypot(*(second[0] - first[-1])) > 10000
+
+
+def test_polygon_across_map_cut_is_split_and_closed():
+    """A polygon over the interruption becomes closed pieces of a MultiPolygon."""
+    ring = [[170, 55], [-170, 55], [-170, 65], [170, 65], [170, 55]]
+    result = convert_geometry({'type': 'Polygon', 'coordinates': [ring]})
+    assert result['type'] == 'MultiPolygon'
+    assert len(result['coordinates']) == 2
+    for polygon in result['coordinates']:
+        assert len(polygon) == 1
+        assert polygon[0][0] == polygon[0][-1]
+        assert len(polygon[0]) >= 4
+
+
+def test_polygon_with_hole():
+    """A polygon keeps its hole, and the hole stays inside the exterior."""
+    exterior = [[0, 45], [10, 45], [10, 50], [0, 50], [0, 45]]
+    hole = [[2, 46], [3, 46], [3, 47], [2, 46]]
+    result = convert_geometry({'type': 'Polygon', 'coordinates': [exterior, hole]})
+    assert result['type'] == 'Polygon'
+    converted_exterior, converted_hole = (np.array(ring) for ring in result['coordinates'])
+    assert len(converted_exterior) > len(exterior)
+    assert np.array_equal(converted_exterior[0], converted_exterior[-1])
+    assert np.array_equal(converted_hole[0], converted_hole[-1])
+    
+    lo, hi = converted_exterior.min(axis=0), converted_exterior.max(axis=0)
+    assert np.all((converted_hole > lo) & (converted_hole < hi))
+
+
+def test_hole_outside_split_exterior_is_kept():
+    """A hole inside neither piece of a cut exterior goes to the nearest one."""
+    ring = [[170, 55], [-170, 55], [-170, 65], [170, 65], [170, 55]]
+    hole = [[-175, 66], [-174, 66], [-174, 67], [-175, 66]]
+    result = convert_geometry({'type': 'Polygon', 'coordinates': [ring, hole]})
+    assert result['type'] == 'MultiPolygon'
+    assert sorted(len(polygon) for polygon in result['coordinates']) == [1, 2]
+
+
+def test_to_geo_round_trip():
+    """A small polygon converted there and back keeps its vertices."""
+    ring = [[0, 45], [0.01, 45], [0.01, 45.01], [0, 45]]
+    blocks = convert_geometry({'type': 'Polygon', 'coordinates': [ring]})
+    back = convert_geometry(blocks, 'to_geo')
+    assert back['type'] == 'Polygon'
+    corners = [position for position in back['coordinates'][0] if
+               any(np.allclose(position, vertex, atol=1e-7) for vertex in ring)]
+    assert len(corners) >= len(ring)
+
+
+def test_collection_and_off_map_parts():
+    """Collections convert member by member, and parts off the map are dropped."""
+    result = convert_geometry({'type': 'GeometryCollection', 'geometries': [
+        {'type': 'MultiPoint', 'coordinates': [[3412228.818834, -380303.878966], [2.4e7, 1.4e7]]},
+        {'type': 'LineString', 'coordinates': [[2.4e7, 1.4e7], [2.45e7, 1.4e7]]},
+        {'type': 'Point', 'coordinates': [2.4e7, 1.4e7]},
+    ]}, 'to_geo')
+    assert result['type'] == 'GeometryCollection'
+    points, line = result['geometries']
+    assert points['type'] == 'MultiPoint'
+    assert np.allclose(points['coordinates'], [[20, 10]])
+    assert line == {'type': 'LineString', 'coordinates': []}
+    assert convert_geometry({'type': 'Point', 'coordinates': [2.4e7, 1.4e7]}, 'to_geo') is None
+
+
+@pytest.mark.parametrize("geometry,kwargs", [
+    ({'type': 'Curve', 'coordinates': []}, {}),
+    ({'type': 'LineString', 'coordinates': [[0, 95], [1, 1]]}, {}),
+    ({'type': 'LineString', 'coordinates': [[0, 1], [2]]}, {}),
+    ({'type': 'Polygon', 'coordinates': 5}, {}),
+    ({'type': 'Point', 'coordinates': [0, 0]}, {'direction': 'sideways'}),
+    ({'type': 'Point', 'coordinates': [0, 0]}, {'tolerance': 0}),
+])
+def test_invalid_input(geometry, kwargs):
+    """Bad geometries, coordinates and options raise ValueError."""
+    with pytest.raises(ValueError):
+        convert_geometry(geometry, **kwargs)
@@ -0,0 +1,115 @@
+"""
+Test the opt-in hot-path instrumentation.
+"""
+import numpy as np
+import pytest
+import terrapyconvert
+from terrapyconvert import Instrumentation, NewtonStats, configure_newton, instrument
+
+
+def _shadowed():
+    """Get the methods currently shadowed on the shared projection's instances."""
+    base = terrapyconvert._base_projection()
+    return (set(vars(terrapyconvert._get_projection())), set(vars(base)), set(vars(base.inverse)),
+            terrapyconvert._validate_geographic_coordinates)
+
+
+def test_scalar_stages_and_counters():
+    """Scalar conversions record every stage, the face and the Newton solves."""
+    with instrument() as stats:
+        terrapyconvert.from_geo(10, 20)
+        terrapyconvert.to_geo(3412228.818834, -380303.878966)
+        terrapyconvert.to_geo(0, -14000000)
+    snapshot = stats.snapshot()
+    
+    stages = snapshot['stages']
+    assert stages['validation']['calls'] == 3
+    assert stages['from_geo']['calls'] == 1
+    assert stages['to_geo']['calls'] == 2
+    for stage in ('face_lookup', 'triangle_transform', 'conformal_newton', 'inverse_triangle_transform',
+                  'inverse_triangle_newton'):
+        assert stages[stage]['calls'] >= 1
+        assert stages[stage]['seconds'] >= 0
+    assert stages['from_geo']['seconds'] >= stages['triangle_transform']['seconds']
+    
+    assert sum(snapshot['faces']['from_geo'].values()) == 1
+    assert snapshot['out_of_bounds'] == {'from_geo': 0, 'to_geo': 1}
+    assert snapshot['newton']['conformal']['calls'] == 1
+    assert snapshot['newton']['inverse_triangle']['calls'] == 1
+
+
+def test_batch_counts_points():
+    """The batch path counts points, faces and off-map results per element."""
+    lats = np.array([10.0, -5.0, 65.5345, 40.0])
+    lons = np.array([20.0, 80.0, 5.534643, -100.0])
+    with instrument() as stats:
+        xs, zs = terrapyconvert.from_geo_array(lats, lons)
+        terrapyconvert.to_geo_array(np.append(xs, 0.0), np.append(zs, -14000000.0))
+    snapshot = stats.snapshot()
+    
+    assert snapshot['stages']['from_geo'] == {'calls': 1, 'points': 4,
+                                              'seconds': snapshot['stages']['from_geo']['seconds']}
+    assert snapshot['stages']['to_geo']['points'] == 5
+    assert sum(snapshot['faces']['from_geo'].values()) == 4
+    assert snapshot['out_of_bounds']['to_geo'] == 1
+    assert snapshot['newton']['conformal']['calls'] == 4
+
+
+def test_face_counts_match_face_ids():
+    """to_geo lookups count the moved parts of faces 14 and 15 under those faces, like face_ids."""
+    rng = np.random.default_rng(0)
+    lats, lons = rng.uniform(-85, 85, 3000), rng.uniform(-180, 180, 3000)
+    xs, zs = terrapyconvert.from_geo_array(lats, lons)
+    with instrument() as stats:
+        terrapyconvert.to_geo_array(xs, zs)
+    counts = stats.snapshot()['faces']['to_geo']
+    
+    assert set(counts) <= set(range(20))
+    faces, totals = np.unique(terrapyconvert.face_ids(xs, zs, 'to_geo'), return_counts=True)
+    assert counts == dict(zip(faces.tolist(), totals.tolist()))
+
+
+def test_scan_fallback_is_counted():
+    """Lookups the bucket index hands to the full scan are still timed and counted."""
+    base = terrapyconvert._base_projection()
+    with instrument() as stats:
+        face = base._find_triangle(0.0, 0.0, 0.0)
+    snapshot = stats.snapshot()
+    assert snapshot['stages']['face_lookup']['calls'] == 1
+    assert snapshot['faces']['from_geo'] == {face: 1}
+
+
+def test_hooks_removed_on_exit():
+    """Leaving the block restores the projection, validators and configured NewtonStats."""
+    terrapyconvert.warmup()
+    before = _shadowed()
+    configured = NewtonStats()
+    configure_newton(stats=configured)
+    try:
+        with pytest.raises(ValueError):
+            with instrument():
+                terrapyconvert.from_geo(100, 0)
+        assert _shadowed() == before
+        assert terrapyconvert._base_projection().newton_stats is configured
+        
+        terrapyconvert.from_geo(10, 20)
+        assert configured.calls('conformal') == 1
+    finally:
+        configure_newton(stats=None)
+
+
+def test_reuse_reset_and_nesting():
+    """An Instrumentation can be resumed and reset, and blocks cannot be nested."""
+    stats = Instrumentation()
+    with instrument(stats):
+        terrapyconvert.from_geo(10, 20)
+        with pytest.raises(ValueError):
+            with instrument():
+                pass
+    with instrument(stats):
+        terrapyconvert.from_geo(10, 20)
+    assert stats.snapshot()['stages']['from_geo']['calls'] == 2
+    
+    stats.reset()
+    assert stats.snapshot() == {'stages': {}, 'faces': {'from_geo': {}, 'to_geo': {}},
+                                'out_of_bounds': {'from_geo': 0, 'to_geo': 0}, 'newton': {}}
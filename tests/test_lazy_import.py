@@ -0,0 +1,43 @@
+"""
+Test that importing the package is cheap and side-effect free.
+"""
+import subprocess
+import sys
+import threading
+
+import terrapyconvert
+
+
+def test_import_is_silent_and_lazy():
+    """Importing builds no projection and writes nothing to stdout."""
+    code = (
+        "import terrapyconvert\n"
+        "assert terrapyconvert._scale_proj is None\n"
+        "x, z = terrapyconvert.from_geo(10, 20)\n"
+        "assert terrapyconvert._scale_proj is not None\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout == ""
+
+
+def test_projection_is_a_singleton_across_threads():
+    """Concurrent first use builds the projection exactly once."""
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(terrapyconvert._get_projection()))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert len(results) == 8
+    assert all(projection is results[0] for projection in results)
+
+
+def test_warmup():
+    """warmup() builds the shared projection."""
+    terrapyconvert.warmup()
+    assert terrapyconvert._scale_proj is terrapyconvert._get_projection()
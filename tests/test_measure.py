@@ -0,0 +1,80 @@
+"""
+Test length and area measurement of block-space shapes.
+"""
+import numpy as np
+import pytest
+from terrapyconvert import from_geo, from_geo_array, line_lengths, polygon_areas
+from terrapyconvert.distortion import EARTH_RADIUS
+
+
+def _block_ring(lats, lons):
+    x, z = from_geo_array(lats, lons)
+    return np.column_stack([x, z])
+
+
+def _clustered_shapes(lat, lon, count=400, seed=0):
+    """Small squares and zigzag lines around a city, where the tiles are worth building."""
+    rng = np.random.default_rng(seed)
+    x0, z0 = from_geo(lat, lon)
+    corners = np.column_stack([x0 + rng.uniform(-20000, 20000, count), z0 + rng.uniform(-20000, 20000, count)])
+    squares = [corner + np.array([[0, 0], [120, 0], [120, 80], [0, 80]]) for corner in corners]
+    lines = [corner + np.cumsum(rng.uniform(-60, 60, (8, 2)), axis=0) for corner in corners]
+    return squares, lines
+
+
+def test_exact_length_on_the_equator():
+    """A converted stretch of the equator measures one degree of the projection's sphere."""
+    line = _block_ring(np.zeros(11), np.linspace(10, 11, 11))
+    assert line_lengths([line])[0] == pytest.approx(EARTH_RADIUS * np.radians(1), rel=1e-9)
+
+
+def test_exact_area_of_a_spherical_cap():
+    """A many-sided ring along a parallel encloses the cap above it."""
+    lons = np.linspace(-180, 180, 2000, endpoint=False)
+    ring = _block_ring(np.full(lons.size, 88.0), lons)
+    cap = 2 * np.pi * EARTH_RADIUS ** 2 * (1 - np.sin(np.radians(88)))
+    assert polygon_areas([ring])[0] == pytest.approx(cap, rel=1e-4)
+    # Orientation and an explicit closing vertex do not matter
+    assert polygon_areas([ring[::-1], np.vstack([ring, ring[:1]])]) == pytest.approx([cap, cap], rel=1e-4)
+
+
+@pytest.mark.parametrize("lat, lon", [(51.5, -0.12), (48.85, 2.35)])
+def test_approximate_matches_exact(lat, lon):
+    """Errors stay small, up to the scale step of the conformal correction next to a seam."""
+    squares, lines = _clustered_shapes(lat, lon)
+    exact = line_lengths(lines)
+    approximate = line_lengths(lines, method='approximate')
+    error = np.abs(approximate / exact - 1)
+    assert np.median(error) < 2e-5 and error.max() < 3e-3
+    
+    exact = polygon_areas(squares)
+    approximate = polygon_areas(squares, method='approximate')
+    error = np.abs(approximate / exact - 1)
+    assert np.median(error) < 3e-5 and error.max() < 5e-3
+
+
+def test_approximate_falls_back_to_exact():
+    """Long segments, and lone shapes where no tile is cached yet, are converted, so they match exactly."""
+    x, z = from_geo(-34.6, -58.4)
+    lines = [[[x, z], [x + 50000, z]], [[x, z], [x + 10, z + 10]]]
+    np.testing.assert_array_equal(line_lengths(lines, method='approximate', max_blocks=1000),
+                                  line_lengths(lines))
+
+
+def test_degenerate_and_invalid_shapes():
+    x, z = from_geo(0, 0)
+    assert line_lengths([[], [[x, z]]]).tolist() == [0.0, 0.0]
+    assert polygon_areas([[[x, z], [x + 10, z]]]).tolist() == [0.0]
+    assert line_lengths([]).shape == (0,)
+    
+    off_map = [[x, z], [2.4e7, 1.4e7]]
+    assert np.isnan(line_lengths([off_map])[0])
+    lengths = line_lengths([[[x, z], [x + 1, z]], [[x, z], [3e7, 0]]], errors='nan')
+    assert np.isfinite(lengths[0]) and np.isnan(lengths[1])
+    
+    with pytest.raises(ValueError, match="x coordinate"):
+        line_lengths([[[3e7, 0], [0, 0]]])
+    with pytest.raises(ValueError, match="shape"):
+        polygon_areas([[1, 2, 3]])
+    with pytest.raises(ValueError, match="method"):
+        line_lengths([], method='fast')
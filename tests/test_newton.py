@@ -0,0 +1,125 @@
+"""
+Test the adaptive Newton solvers and their iteration counters.
+"""
+import numpy as np
+import pytest
+import terrapyconvert
+from terrapyconvert import NewtonStats, configure_newton, from_geo, to_geo
+from terrapyconvert.projection import ModifiedAirocean
+
+
+@pytest.fixture(scope="module")
+def projection():
+    return ModifiedAirocean()
+
+
+def _sample(count=300, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(-180, 180, count), np.degrees(np.arcsin(rng.uniform(-1, 1, count)))
+
+
+def test_early_exit_matches_fixed_iterations(projection):
+    """Stopping at the default tolerance gives the same results as always running 5 steps."""
+    lons, lats = _sample()
+    xs, ys = projection.from_geo_array(lons, lats)
+    back_lats, back_lons = projection.to_geo_array(xs, ys)
+    
+    projection.newton_tolerance = projection.conformal_tolerance = 0.0
+    try:
+        fixed_xs, fixed_ys = projection.from_geo_array(lons, lats)
+        fixed_lats, fixed_lons = projection.to_geo_array(fixed_xs, fixed_ys)
+    finally:
+        projection.newton_tolerance = projection.conformal_tolerance = 1e-12
+    
+    np.testing.assert_allclose(xs, fixed_xs, rtol=0, atol=1e-12)
+    np.testing.assert_allclose(ys, fixed_ys, rtol=0, atol=1e-12)
+    np.testing.assert_allclose(back_lats, fixed_lats, rtol=0, atol=1e-9)
+    np.testing.assert_allclose(back_lons, fixed_lons, rtol=0, atol=1e-9)
+
+
+def test_scalar_and_batch_stats_agree(projection):
+    """The batch path takes the same number of iterations per point as the scalar path."""
+    lons, lats = _sample(200, seed=1)
+    scalar_stats = NewtonStats()
+    batch_stats = NewtonStats()
+    
+    projection.newton_stats = scalar_stats
+    for lon, lat in zip(lons.tolist(), lats.tolist()):
+        projection.to_geo(*projection.from_geo(lon, lat))
+    
+    projection.newton_stats = batch_stats
+    try:
+        projection.to_geo_array(*projection.from_geo_array(lons, lats))
+    finally:
+        projection.newton_stats = None
+    
+    assert scalar_stats.histograms == batch_stats.histograms
+    assert scalar_stats.capped == batch_stats.capped
+    assert scalar_stats.calls("conformal") == 200
+    assert scalar_stats.calls("inverse_triangle") == 200
+
+
+def test_iteration_cap_is_recorded(projection):
+    """Solves that stop at max_iterations without converging are counted."""
+    stats = NewtonStats()
+    projection.newton_stats = stats
+    projection.conformal_newton = 1
+    projection.inverse_guess = False
+    try:
+        projection.from_geo(20, 10)
+    finally:
+        projection.conformal_newton = 5
+        projection.inverse_guess = True
+        projection.newton_stats = None
+    
+    summary = stats.as_dict()["conformal"]
+    assert summary == {"calls": 1, "histogram": {1: 1}, "max_residual": summary["max_residual"], "capped": 1}
+    assert summary["max_residual"] > 1e-12
+
+
+def test_configure_newton():
+    """configure_newton applies to the shared projection used by the public API."""
+    stats = NewtonStats()
+    configure_newton(stats=stats)
+    try:
+        x, z = from_geo(10, 20)
+        to_geo(x, z)
+    finally:
+        configure_newton(stats=None)
+    
+    assert stats.calls("conformal") == 1
+    assert stats.calls("inverse_triangle") == 1
+    assert terrapyconvert._base_projection().newton_stats is None
+    
+    with pytest.raises(ValueError):
+        configure_newton(tolerance=-1)
+
+
+def test_inverse_grid_guess_matches_converged_solve(projection):
+    """Starting from the inverse grid guess converges to the fully iterated result in fewer steps."""
+    lons, lats = _sample(2000, seed=2)
+    guess_stats = NewtonStats()
+    naive_stats = NewtonStats()
+    
+    projection.newton_stats = guess_stats
+    try:
+        xs, ys = projection.from_geo_array(lons, lats)
+        projection.newton_stats = naive_stats
+        projection.inverse_guess = False
+        projection.conformal_tolerance = 0.0
+        projection.conformal_newton = 30
+        reference_xs, reference_ys = projection.from_geo_array(lons, lats)
+    finally:
+        projection.newton_stats = None
+        projection.inverse_guess = True
+        projection.conformal_tolerance = 1e-12
+        projection.conformal_newton = 5
+    
+    np.testing.assert_allclose(xs, reference_xs, rtol=0, atol=1e-12)
+    np.testing.assert_allclose(ys, reference_ys, rtol=0, atol=1e-12)
+    
+    guess_iterations = sum(k * v for k, v in guess_stats.histograms["conformal"].items())
+    naive_iterations = sum(k * v for k, v in naive_stats.histograms["conformal"].items())
+    assert guess_stats.histograms["conformal"].get(1, 0) > 0.95 * len(lons)
+    assert guess_iterations < naive_iterations
+    assert guess_stats.capped.get("conformal", 0) == 0
@@ -0,0 +1,63 @@
+"""
+Test the process-pool bulk conversion API.
+"""
+import numpy as np
+import pytest
+from terrapyconvert import configure_newton, convert_many, from_geo_array, to_geo_array
+
+
+def _points(count=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.column_stack([rng.uniform(-89, 89, count), rng.uniform(-180, 180, count)])
+
+
+def test_convert_many_keeps_input_order():
+    """Chunks converted in worker processes come back in input order."""
+    points = _points()
+    result = convert_many(points, 'from_geo', workers=3, chunksize=250)
+    
+    xs, zs = from_geo_array(points[:, 0], points[:, 1])
+    np.testing.assert_array_equal(result[:, 0], xs)
+    np.testing.assert_array_equal(result[:, 1], zs)
+
+
+def test_convert_many_to_geo():
+    """The to_geo direction matches the batch path."""
+    points = convert_many(_points(500), 'from_geo', workers=1)
+    result = convert_many(points, 'to_geo', workers=2, chunksize=100)
+    
+    lats, lons = to_geo_array(points[:, 0], points[:, 1])
+    np.testing.assert_array_equal(result[:, 0], lats)
+    np.testing.assert_array_equal(result[:, 1], lons)
+
+
+def test_convert_many_rejects_bad_input():
+    with pytest.raises(ValueError, match="direction"):
+        convert_many([[0, 0]], 'sideways')
+    with pytest.raises(ValueError, match="shape"):
+        convert_many([0, 0, 0])
+    with pytest.raises(ValueError, match="latitude"):
+        convert_many([[0, 0], [95, 0]], workers=2, chunksize=1)
+
+
+def test_errors_nan():
+    """Invalid pairs come back as NaN rows instead of failing the whole call."""
+    result = convert_many([[10, 20], [95, 0], [-5, 80]], 'from_geo', workers=2, chunksize=1, errors='nan')
+    assert np.array_equal(np.isnan(result[:, 0]), [False, True, False])
+    xs, zs = from_geo_array([10, -5], [20, 80])
+    assert np.array_equal(result[[0, 2]], np.column_stack((xs, zs)))
+
+
+def test_workers_use_configured_settings():
+    """Solver settings made in the parent reach the worker processes."""
+    points = _points(400)
+    configure_newton(tolerance=0.0, max_iterations=1)
+    try:
+        result = convert_many(points, 'from_geo', workers=2, chunksize=100)
+        xs, zs = from_geo_array(points[:, 0], points[:, 1])
+    finally:
+        configure_newton(tolerance=1e-12, max_iterations=5)
+    
+    np.testing.assert_array_equal(result[:, 0], xs)
+    np.testing.assert_array_equal(result[:, 1], zs)
+    assert not np.array_equal(xs, from_geo_array(points[:, 0], points[:, 1])[0])
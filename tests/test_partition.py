@@ -0,0 +1,99 @@
+"""
+Test the face-partitioned batch path and the face id array.
+"""
+import numpy as np
+import pytest
+from terrapyconvert import configure_batch, face_ids, from_geo, from_geo_array, to_geo_array
+from terrapyconvert.projection import ModifiedAirocean
+
+
+@pytest.fixture(scope="module")
+def projections():
+    gathering = ModifiedAirocean()
+    partitioned = ModifiedAirocean()
+    partitioned.partition_by_face = True
+    return gathering, partitioned
+
+
+def _global_sample(count=20000, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(-180, 180, count), rng.uniform(-89.9, 89.9, count)
+
+
+def test_from_geo_partitioned_matches_gathering(projections):
+    gathering, partitioned = projections
+    lon, lat = _global_sample()
+    expected = gathering.from_geo_array(lon, lat)
+    result = partitioned.from_geo_array(lon, lat)
+    np.testing.assert_array_equal(result[0], expected[0])
+    np.testing.assert_array_equal(result[1], expected[1])
+
+
+def test_to_geo_partitioned_matches_gathering(projections):
+    """Points on and off the map, including the moved parts of faces 14 and 15."""
+    gathering, partitioned = projections
+    x, y = gathering.from_geo_array(*_global_sample())
+    rng = np.random.default_rng(1)
+    x = np.concatenate([x, rng.uniform(-4, 4, 5000)]).reshape(-1, 50)
+    y = np.concatenate([y, rng.uniform(-4, 4, 5000)]).reshape(-1, 50)
+    
+    expected = gathering.to_geo_array(x, y)
+    result = partitioned.to_geo_array(x, y)
+    assert result[0].shape == x.shape
+    np.testing.assert_array_equal(result[0], expected[0])
+    np.testing.assert_array_equal(result[1], expected[1])
+
+
+def test_partitioned_empty_and_off_map(projections):
+    _, partitioned = projections
+    assert partitioned.from_geo_array(np.empty(0), np.empty(0))[0].shape == (0,)
+    lat, lon = partitioned.to_geo_array(np.array([100.0, 200.0]), np.array([100.0, 200.0]))
+    assert np.isnan(lat).all() and np.isnan(lon).all()
+
+
+def test_face_ids_agree_between_directions():
+    lon, lat = _global_sample(5000, seed=2)
+    faces = face_ids(lat, lon)
+    assert faces.dtype.kind == 'i'
+    assert set(np.unique(faces)) == set(range(20))
+    
+    xs, zs = from_geo_array(lat, lon)
+    np.testing.assert_array_equal(face_ids(xs, zs, 'to_geo'), faces)
+
+
+def test_face_ids_invalid_and_off_map():
+    assert face_ids([0, 95], [0, 0], errors='nan').tolist()[1] == -1
+    with pytest.raises(ValueError, match="latitude"):
+        face_ids([95], [0])
+    with pytest.raises(ValueError, match="direction"):
+        face_ids([0], [0], 'sideways')
+    
+    x, z = from_geo(0, 0)
+    assert face_ids([x, 2.4e7], [z, 1.4e7], 'to_geo').tolist()[1] == -1
+
+
+def test_configure_batch():
+    lon, lat = _global_sample(2000, seed=3)
+    expected = from_geo_array(lat, lon)
+    configure_batch(partition_by_face=True)
+    try:
+        result = from_geo_array(lat, lon)
+        back = to_geo_array(*result)
+    finally:
+        configure_batch(partition_by_face=False)
+    np.testing.assert_array_equal(result[0], expected[0])
+    np.testing.assert_array_equal(back[0], to_geo_array(*expected)[0])
+
+
+def test_partitioned_broadcasting(projections):
+    """Inputs of different shapes broadcast the same way on both paths."""
+    gathering, partitioned = projections
+    lon, lat = np.linspace(-170, 170, 7)[:, np.newaxis], np.linspace(-80, 80, 5)
+    expected = gathering.from_geo_array(lon, lat)
+    result = partitioned.from_geo_array(lon, lat)
+    assert result[0].shape == (7, 5)
+    np.testing.assert_array_equal(result[0], expected[0])
+    np.testing.assert_array_equal(result[1], expected[1])
+    
+    x, y = expected[0][:, :1], expected[1][0]
+    np.testing.assert_array_equal(partitioned.to_geo_array(x, y)[0], gathering.to_geo_array(x, y)[0])
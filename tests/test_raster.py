@@ -0,0 +1,99 @@
+"""
+Test resampling equirectangular rasters into block space.
+"""
+import numpy as np
+import pytest
+import terrapyconvert
+from terrapyconvert import resample_raster
+
+MIN_X, MIN_Z = 3412224, -380416
+
+
+def _field(lat, lon):
+    """A smooth test field, linear in latitude and periodic in longitude."""
+    return lat * 100 + np.sin(np.radians(lon)) * 10
+
+
+def _global_raster(resolution=0.05, bands=()):
+    rows, cols = int(180 / resolution), int(360 / resolution)
+    lat = 90 - (np.arange(rows) + 0.5) * resolution
+    lon = -180 + (np.arange(cols) + 0.5) * resolution
+    data = _field(lat[:, np.newaxis], lon[np.newaxis, :])
+    if bands:
+        data = np.stack([data * (band + 1) for band in range(bands[0])], axis=-1)
+    return data
+
+
+def _block_positions(min_x, min_z, width, height):
+    x, z = np.meshgrid(min_x + np.arange(width, dtype=np.float64),
+                       min_z + np.arange(height, dtype=np.float64))
+    return terrapyconvert.to_geo_array(x, z)
+
+
+def test_bilinear_matches_field():
+    """Bilinear sampling reproduces a smooth field at the block positions."""
+    data = _global_raster()
+    result = resample_raster(data, (-180, -90, 180, 90), MIN_X, MIN_Z, 200, 150)
+    lat, lon = _block_positions(MIN_X, MIN_Z, 200, 150)
+    assert result.shape == (150, 200)
+    assert result.dtype == np.float64
+    assert np.max(np.abs(result - _field(lat, lon))) < 0.01
+
+
+def test_nearest_picks_containing_pixel():
+    """Nearest sampling returns the value of the pixel containing each block."""
+    data = np.arange(180 * 360, dtype=np.int32).reshape(180, 360)
+    result = resample_raster(data, (-180, -90, 180, 90), MIN_X, MIN_Z, 64, 64, method='nearest')
+    assert result.dtype == np.int32
+    lat, lon = _block_positions(MIN_X, MIN_Z, 64, 64)
+    expected = data[np.floor(90 - lat).astype(int), np.floor(lon + 180).astype(int)]
+    assert np.array_equal(result, expected)
+
+
+def test_chunks_and_memmap(tmp_path):
+    """Chunked output into a memory-mapped file matches a single chunk."""
+    data = _global_raster(bands=(3,)).astype(np.float32)
+    source = np.lib.format.open_memmap(tmp_path / 'source.npy', mode='w+', dtype=data.dtype, shape=data.shape)
+    source[:] = data
+    source.flush()
+    source = np.load(tmp_path / 'source.npy', mmap_mode='r')
+    
+    out = np.lib.format.open_memmap(tmp_path / 'out.npy', mode='w+', dtype=np.float32, shape=(100, 130, 3))
+    result = resample_raster(source, (-180, -90, 180, 90), MIN_X, MIN_Z, 130, 100, chunk_size=48, out=out)
+    assert result is out
+    whole = resample_raster(data, (-180, -90, 180, 90), MIN_X, MIN_Z, 130, 100, chunk_size=512)
+    assert whole.dtype == np.float32
+    assert np.allclose(out, whole, atol=1e-3)
+    assert np.allclose(out[..., 2], 3 * out[..., 0], rtol=1e-5)
+
+
+def test_partial_raster_and_nodata():
+    """Blocks outside the raster get nodata, and nodata pixels are not blended in."""
+    lat, lon = _block_positions(MIN_X, MIN_Z, 40, 40)
+    west, north = float(lon.min()) - 0.001, float(lat.max()) + 0.001
+    east = float(lon.mean())
+    
+    # The raster's west column is nodata and the tile extends past its east edge
+    data = np.ones((100, 20))
+    data[:, 0] = -9999
+    result = resample_raster(data, (west, north - 1, east, north), MIN_X, MIN_Z, 40, 40, nodata=-9999)
+    assert np.any(result == -9999)
+    assert set(np.unique(result)) <= {1.0, -9999.0}
+    assert np.all(result[lon > east] == -9999)
+
+
+@pytest.mark.parametrize("kwargs", [
+    {'method': 'cubic'},
+    {'bounds': (10, 0, 5, 1)},
+    {'bounds': (0, 50, 1, 10)},
+    {'chunk_size': 0},
+    {'out': np.empty((3, 3))},
+    {'data': np.ones(5)},
+])
+def test_invalid_input(kwargs):
+    """Bad methods, bounds, shapes and options raise ValueError."""
+    arguments = {'data': np.ones((10, 10)), 'bounds': (0, 0, 1, 1), 'min_x': 0, 'min_z': 0,
+                 'width': 4, 'height': 4}
+    arguments.update(kwargs)
+    with pytest.raises(ValueError):
+        resample_raster(**arguments)
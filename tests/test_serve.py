@@ -0,0 +1,111 @@
+"""
+Test the local HTTP conversion server with a local asyncio client.
+"""
+import asyncio
+import json
+
+import numpy as np
+import pytest
+from terrapyconvert import from_geo_array, to_geo
+from terrapyconvert.serve import ConversionServer
+
+
+async def _request(port, method, path, payload=None, reader_writer=None):
+    """Send one request and return (status, JSON body)."""
+    reader, writer = reader_writer or await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps(payload).encode() if payload is not None else b""
+    connection = "keep-alive" if reader_writer else "close"
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nConnection: {connection}\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line == b"\r\n":
+            break
+        name, _, value = line.decode().partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    result = json.loads(await reader.readexactly(length))
+    if not reader_writer:
+        writer.close()
+    return status, result
+
+
+def _run(scenario, **options):
+    async def main():
+        async with ConversionServer(port=0, **options) as server:
+            return await scenario(server)
+    return asyncio.run(main())
+
+
+def test_concurrent_singles_are_batched():
+    """Concurrent GETs are coalesced into micro-batches and match the batch path."""
+    rng = np.random.default_rng(0)
+    lats, lons = rng.uniform(-60, 60, 40), rng.uniform(-180, 180, 40)
+    
+    async def scenario(server):
+        responses = await asyncio.gather(*[
+            _request(server.port, "GET", f"/from_geo?lat={lat!r}&lon={lon!r}")
+            for lat, lon in zip(lats.tolist(), lons.tolist())
+        ])
+        return responses, server.stats()
+    
+    responses, stats = _run(scenario, window=0.05)
+    xs, zs = from_geo_array(lats, lons)
+    for (status, result), x, z in zip(responses, xs.tolist(), zs.tolist()):
+        assert status == 200
+        assert result["x"] == pytest.approx(x, abs=1e-6)
+        assert result["z"] == pytest.approx(z, abs=1e-6)
+    
+    assert stats["points"] == 40
+    assert stats["micro_batches"] < 40
+    assert stats["mean_micro_batch"] > 1
+    assert stats["latency_ms"]["p50"] > 0
+
+
+def test_batch_endpoint_and_errors():
+    """POST converts batches, with null off the map and errors reported as 400."""
+    async def scenario(server):
+        port = server.port
+        connection = await asyncio.open_connection("127.0.0.1", port)
+        results = [
+            await _request(port, "POST", "/to_geo", {"points": [[3412228.818833647, -380303.8789656482],
+                                                                [24000000, 14000000]]}, connection),
+            await _request(port, "POST", "/from_geo", {"points": [[10, 20], [95, 0]]}, connection),
+            await _request(port, "POST", "/from_geo", {"points": [[10, 20], [95, 0]], "errors": "nan"}, connection),
+            await _request(port, "GET", "/to_geo?x=30000000&z=0", None, connection),
+            await _request(port, "GET", "/from_geo?lat=north&lon=0", None, connection),
+            await _request(port, "GET", "/elsewhere", None, connection),
+            await _request(port, "DELETE", "/stats", None, connection),
+            await _request(port, "GET", "/health", None, connection),
+        ]
+        connection[1].close()
+        return results
+    
+    results = _run(scenario)
+    status, result = results[0]
+    assert status == 200
+    assert result["points"][0] == pytest.approx(list(to_geo(3412228.818833647, -380303.8789656482)), abs=1e-9)
+    assert result["points"][1] == [None, None]
+    
+    assert results[1][0] == 400 and "Point 1" in results[1][1]["error"]
+    assert results[2][0] == 200 and results[2][1]["points"][1] == [None, None]
+    assert results[3][0] == 400 and "x coordinate" in results[3][1]["error"]
+    assert [status for status, _ in results[4:]] == [400, 404, 405, 200]
+
+
+def test_oversized_header_is_rejected():
+    """A header longer than the reader's buffer limit is answered with 431 instead of dropping the connection."""
+    async def scenario(server):
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        writer.write(b"GET /health HTTP/1.1\r\nX-Long: " + b"a" * 70000 + b"\r\n\r\n")
+        await writer.drain()
+        status = (await reader.readline()).split()[1]
+        writer.close()
+        return status, await _request(server.port, "GET", "/health")
+    
+    status, (health, _) = _run(scenario)
+    assert status == b"431" and health == 200
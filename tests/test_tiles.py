@@ -0,0 +1,72 @@
+"""
+Test tile reprojection against the exact batch conversion.
+"""
+import numpy as np
+import pytest
+import terrapyconvert
+from terrapyconvert import TileGrid, reproject_tile
+
+
+def _exact(min_x, min_z, width, height):
+    x, z = np.meshgrid(min_x + np.arange(width, dtype=np.float64),
+                       min_z + np.arange(height, dtype=np.float64))
+    return terrapyconvert._get_projection().to_geo_array(x, z)
+
+
+def _error_blocks(tile, lat, lon):
+    """Get the largest distance between tile and exact positions, in blocks."""
+    on_map = ~np.isnan(lat)
+    projection = terrapyconvert._get_projection()
+    x, z = projection.from_geo_array(tile.lon[on_map], tile.lat[on_map])
+    x_exact, z_exact = projection.from_geo_array(lon[on_map], lat[on_map])
+    return np.hypot(x - x_exact, z - z_exact).max()
+
+
+@pytest.mark.parametrize("min_x,min_z,width,height", [
+    (3412224, -380416, 512, 512),
+    (5204401, -5019303, 300, 200),
+    (-20934265, -404348, 100, 130),
+    (0, 0, 64, 64),
+])
+def test_tile_matches_exact(min_x, min_z, width, height):
+    """Interpolated tiles stay within the tolerance, across seams and the antimeridian."""
+    tile = reproject_tile(min_x, min_z, width, height)
+    assert isinstance(tile, TileGrid)
+    assert tile.lat.shape == tile.lon.shape == (height, width)
+    
+    lat, lon = _exact(min_x, min_z, width, height)
+    assert np.array_equal(np.isnan(tile.lat), np.isnan(lat))
+    assert _error_blocks(tile, lat, lon) <= 0.01
+    assert tile.max_error <= 0.01
+    assert tile.evaluations < width * height
+    assert np.all(np.abs(tile.lon[~np.isnan(lat)]) <= 180)
+
+
+def test_lattice_points_are_exact():
+    """Blocks on the coarse lattice get the exact conversion."""
+    tile = reproject_tile(3412224, -380416, 64, 64)
+    lat, lon = terrapyconvert.to_geo(3412224 + 32, -380416 + 48)
+    assert tile.lat[48, 32] == lat
+    assert tile.lon[48, 32] == lon
+
+
+def test_single_block_cells():
+    """With a cell of one block every position is converted exactly."""
+    tile = reproject_tile(11585536, 52000, 20, 10, cell=1)
+    lat, lon = _exact(11585536, 52000, 20, 10)
+    assert np.array_equal(tile.lat, lat)
+    assert np.array_equal(tile.lon, lon)
+    assert tile.evaluations == 21 * 11
+    assert tile.max_error == 0.0
+
+
+@pytest.mark.parametrize("args,kwargs", [
+    ((0, 0, 0, 16), {}),
+    ((0, 0, 16, 16), {'cell': 12}),
+    ((0, 0, 16, 16), {'tolerance': 0}),
+    ((30000000, 0, 16, 16), {}),
+])
+def test_invalid_input(args, kwargs):
+    """Bad rectangles and options raise ValueError."""
+    with pytest.raises(ValueError):
+        reproject_tile(*args, **kwargs)
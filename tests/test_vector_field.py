@@ -0,0 +1,93 @@
+"""
+Test the packed InvertableVectorField.
+"""
+import numpy as np
+import pytest
+from terrapyconvert.projection import InvertableVectorField
+
+
+def _random_field(side_length=8, seed=0):
+    rng = np.random.default_rng(seed)
+    count = InvertableVectorField.point_count(side_length)
+    return rng.normal(size=(count, 2)), side_length
+
+
+def test_nested_lists_pack_in_conformal_order():
+    """The list-of-lists constructor packs samples row by row along v."""
+    values, side_length = _random_field()
+    offsets = InvertableVectorField.row_offsets(side_length)
+    vector_x = [[0.0] * (side_length + 1 - u) for u in range(side_length + 1)]
+    vector_y = [[0.0] * (side_length + 1 - u) for u in range(side_length + 1)]
+    for v in range(side_length + 1):
+        for u in range(side_length + 1 - v):
+            vector_x[u][v], vector_y[u][v] = values[offsets[v] + u]
+    
+    field = InvertableVectorField(vector_x, vector_y)
+    np.testing.assert_array_equal(field.values, values)
+
+
+def test_packed_field_wraps_without_copying():
+    """from_packed keeps a reference to the caller's buffer."""
+    values, side_length = _random_field()
+    field = InvertableVectorField.from_packed(values, side_length)
+    assert np.shares_memory(field.values, values)
+    
+    with pytest.raises(ValueError):
+        InvertableVectorField.from_packed(values[:-1], side_length)
+
+
+def test_vectorized_interpolation_matches_scalar():
+    """The array variants agree with the scalar interpolation and Newton solve."""
+    values, side_length = _random_field(side_length=16, seed=1)
+    field = InvertableVectorField.from_packed(values, side_length)
+    rng = np.random.default_rng(2)
+    xs = rng.uniform(-0.1, 1.1, 2000)
+    ys = rng.uniform(-0.1, 1.0, 2000)
+    
+    result = field.get_interpolated_vector_array(xs, ys)
+    for i in range(len(xs)):
+        expected = field.get_interpolated_vector(xs[i], ys[i])
+        for array, value in zip(result, expected):
+            assert array[i] == pytest.approx(value, rel=1e-12, abs=1e-12)
+    
+    x_est, y_est = field.apply_newtons_method_array(result[0], result[1], xs + 0.01, ys, 3)
+    for i in range(0, len(xs), 50):
+        expected = field.apply_newtons_method(result[0][i], result[1][i], xs[i] + 0.01, ys[i], 3)
+        assert x_est[i] == pytest.approx(expected[0], rel=1e-9, abs=1e-9)
+        assert y_est[i] == pytest.approx(expected[1], rel=1e-9, abs=1e-9)
+
+
+def test_inverse_grid_guess():
+    """The lookup grid guess is close to the true inverse, and its array form matches the scalar one."""
+    side_length = 16
+    offsets = InvertableVectorField.row_offsets(side_length)
+    values = np.empty((InvertableVectorField.point_count(side_length), 2))
+    for v in range(side_length + 1):
+        for u in range(side_length + 1 - v):
+            # A smooth, invertible warp of the triangle
+            x = (u + 0.5 * v) / side_length
+            y = 0.5 * np.sqrt(3) * v / side_length
+            values[offsets[v] + u] = (1.1 * x + 0.05 * np.sin(3 * y), 0.9 * y + 0.04 * x * x)
+    field = InvertableVectorField.from_packed(values, side_length)
+    assert not field.has_inverse_grid
+    field.build_inverse_grid(32)
+    assert field.has_inverse_grid
+    
+    rng = np.random.default_rng(4)
+    xs = rng.uniform(0.2, 0.8, 500)
+    ys = rng.uniform(0.05, 0.4, 500)
+    fs, gs = field.get_interpolated_vector_array(xs, ys)[:2]
+    
+    guess_x, guess_y = field.get_initial_guess_array(fs, gs)
+    assert np.max(np.abs(guess_x - xs)) < 1 / side_length
+    assert np.max(np.abs(guess_y - ys)) < 1 / side_length
+    for i in range(0, len(xs), 25):
+        assert field.get_initial_guess(fs[i], gs[i]) == pytest.approx((guess_x[i], guess_y[i]), abs=1e-12)
+        assert field._piece(xs[i], ys[i]) == field._piece_array(xs[i:i + 1], ys[i:i + 1])[0]
+    
+    x_est, y_est = field.apply_newtons_method_array(fs, gs, guess_x, guess_y, 5)
+    np.testing.assert_allclose(x_est, xs, rtol=0, atol=1e-9)
+    np.testing.assert_allclose(y_est, ys, rtol=0, atol=1e-9)
+    
+    with pytest.raises(ValueError):
+        field.build_inverse_grid(1)